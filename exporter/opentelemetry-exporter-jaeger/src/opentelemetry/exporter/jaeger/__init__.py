@@ -69,7 +69,12 @@ from thrift.transport import THttpClient, TTransport
 from opentelemetry.configuration import Configuration
 from opentelemetry.exporter.jaeger.gen.agent import Agent as agent
 from opentelemetry.exporter.jaeger.gen.jaeger import Collector as jaeger
-from opentelemetry.sdk.trace.export import Span, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export import (
+    Span,
+    SpanExporter,
+    SpanExportResult,
+    group_spans_by_resource,
+)
 from opentelemetry.trace.status import StatusCode
 
 DEFAULT_AGENT_HOST_NAME = "localhost"
@@ -207,70 +212,82 @@ def _translate_to_jaeger(spans: Span):
 
     jaeger_spans = []
 
-    for span in spans:
-        ctx = span.get_span_context()
-        trace_id = ctx.trace_id
-        span_id = ctx.span_id
+    for resource, instrumentation_info, group in group_spans_by_resource(
+        spans
+    ):
+        # translated once and shared by all the spans of the group
+        resource_tags = _extract_tags(resource.attributes)
+        instrumentation_tags = []
+        if instrumentation_info is not None:
+            instrumentation_tags = [
+                _get_string_tag(
+                    "otel.instrumentation_library.name",
+                    instrumentation_info.name,
+                ),
+                _get_string_tag(
+                    "otel.instrumentation_library.version",
+                    instrumentation_info.version,
+                ),
+            ]
 
-        start_time_us = _nsec_to_usec_round(span.start_time)
-        duration_us = _nsec_to_usec_round(span.end_time - span.start_time)
+        jaeger_spans.extend(
+            _translate_span_to_jaeger(
+                span, resource_tags, instrumentation_tags
+            )
+            for span in group
+        )
 
-        status = span.status
+    return jaeger_spans
 
-        parent_id = span.parent.span_id if span.parent else 0
 
-        tags = _extract_tags(span.attributes)
-        tags.extend(_extract_tags(span.resource.attributes))
+def _translate_span_to_jaeger(span: Span, resource_tags, instrumentation_tags):
+    ctx = span.get_span_context()
+    trace_id = ctx.trace_id
+    span_id = ctx.span_id
 
-        tags.extend(
-            [
-                _get_long_tag("status.code", status.status_code.value),
-                _get_string_tag("status.message", status.description),
-                _get_string_tag("span.kind", span.kind.name),
-            ]
-        )
+    start_time_us = _nsec_to_usec_round(span.start_time)
+    duration_us = _nsec_to_usec_round(span.end_time - span.start_time)
 
-        if span.instrumentation_info is not None:
-            tags.extend(
-                [
-                    _get_string_tag(
-                        "otel.instrumentation_library.name",
-                        span.instrumentation_info.name,
-                    ),
-                    _get_string_tag(
-                        "otel.instrumentation_library.version",
-                        span.instrumentation_info.version,
-                    ),
-                ]
-            )
+    status = span.status
 
-        # Ensure that if Status.Code is not OK, that we set the "error" tag on the Jaeger span.
-        if not status.is_ok:
-            tags.append(_get_bool_tag("error", True))
-
-        refs = _extract_refs_from_span(span)
-        logs = _extract_logs_from_span(span)
-
-        flags = int(ctx.trace_flags)
-
-        jaeger_span = jaeger.Span(
-            traceIdHigh=_get_trace_id_high(trace_id),
-            traceIdLow=_get_trace_id_low(trace_id),
-            # generated code expects i64
-            spanId=_convert_int_to_i64(span_id),
-            operationName=span.name,
-            startTime=start_time_us,
-            duration=duration_us,
-            tags=tags,
-            logs=logs,
-            references=refs,
-            flags=flags,
-            parentSpanId=_convert_int_to_i64(parent_id),
-        )
+    parent_id = span.parent.span_id if span.parent else 0
 
-        jaeger_spans.append(jaeger_span)
+    tags = _extract_tags(span.attributes)
+    tags.extend(resource_tags)
 
-    return jaeger_spans
+    tags.extend(
+        [
+            _get_long_tag("status.code", status.status_code.value),
+            _get_string_tag("status.message", status.description),
+            _get_string_tag("span.kind", span.kind.name),
+        ]
+    )
+
+    tags.extend(instrumentation_tags)
+
+    # Ensure that if Status.Code is not OK, that we set the "error" tag on the Jaeger span.
+    if not status.is_ok:
+        tags.append(_get_bool_tag("error", True))
+
+    refs = _extract_refs_from_span(span)
+    logs = _extract_logs_from_span(span)
+
+    flags = int(ctx.trace_flags)
+
+    return jaeger.Span(
+        traceIdHigh=_get_trace_id_high(trace_id),
+        traceIdLow=_get_trace_id_low(trace_id),
+        # generated code expects i64
+        spanId=_convert_int_to_i64(span_id),
+        operationName=span.name,
+        startTime=start_time_us,
+        duration=duration_us,
+        tags=tags,
+        logs=logs,
+        references=refs,
+        flags=flags,
+        parentSpanId=_convert_int_to_i64(parent_id),
+    )
 
 
 def _extract_refs_from_span(span):
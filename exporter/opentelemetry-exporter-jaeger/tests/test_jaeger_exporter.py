@@ -119,6 +119,8 @@ class TestJaegerSpanExporter(unittest.TestCase):
         )
 
         environ_patcher.start()
+        # pylint: disable=protected-access
+        Configuration._reset()
 
         exporter = jaeger_exporter.JaegerSpanExporter(service_name=service)
 
@@ -14,12 +14,15 @@
 
 """OTLP Exporter"""
 
+import heapq
+import itertools
 import logging
 import os
+import threading
 from abc import ABC, abstractmethod
 from collections.abc import Mapping, Sequence
-from time import sleep
-from typing import Any, Callable, Dict, Generic, List, Optional
+from time import monotonic
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional
 from typing import Sequence as TypingSequence
 from typing import Text, Tuple, TypeVar
 
@@ -35,6 +38,8 @@ from grpc import (
 )
 
 from opentelemetry.configuration import Configuration
+from opentelemetry.context import attach, detach, set_value
+from opentelemetry.exporter.otlp.spill_queue import SpillQueue
 from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
 from opentelemetry.proto.resource.v1.resource_pb2 import Resource
 from opentelemetry.sdk.resources import Resource as SDKResource
@@ -75,6 +80,22 @@ def _translate_key_values(key: Text, value: Any) -> KeyValue:
     return KeyValue(key=key, value=any_value)
 
 
+def _translate_resource(sdk_resource: SDKResource) -> Resource:
+    collector_resource = Resource()
+
+    for key, value in sdk_resource.attributes.items():
+
+        try:
+            # pylint: disable=no-member
+            collector_resource.attributes.append(
+                _translate_key_values(key, value)
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            logger.exception(error)
+
+    return collector_resource
+
+
 def _get_resource_data(
     sdk_resource_instrumentation_library_data: Dict[
         SDKResource, ResourceDataT
@@ -90,22 +111,10 @@ def _get_resource_data(
         instrumentation_library_data,
     ) in sdk_resource_instrumentation_library_data.items():
 
-        collector_resource = Resource()
-
-        for key, value in sdk_resource.attributes.items():
-
-            try:
-                # pylint: disable=no-member
-                collector_resource.attributes.append(
-                    _translate_key_values(key, value)
-                )
-            except Exception as error:  # pylint: disable=broad-except
-                logger.exception(error)
-
         resource_data.append(
             resource_class(
                 **{
-                    "resource": collector_resource,
+                    "resource": _translate_resource(sdk_resource),
                     "instrumentation_library_{}".format(name): [
                         instrumentation_library_data
                     ],
@@ -126,6 +135,169 @@ def _load_credential_from_file(filepath) -> ChannelCredentials:
         return None
 
 
+_RETRYABLE_STATUS_CODES = frozenset(
+    [
+        StatusCode.CANCELLED,
+        StatusCode.DEADLINE_EXCEEDED,
+        StatusCode.PERMISSION_DENIED,
+        StatusCode.UNAUTHENTICATED,
+        StatusCode.RESOURCE_EXHAUSTED,
+        StatusCode.ABORTED,
+        StatusCode.OUT_OF_RANGE,
+        StatusCode.UNAVAILABLE,
+        StatusCode.DATA_LOSS,
+    ]
+)
+
+
+def _get_retry_delay(error: RpcError, delay: float) -> Optional[float]:
+    """Returns how long to wait before retrying an export that failed with
+    ``error``, or `None` if it should not be retried.
+
+    The delay is ``delay`` unless the server asked for another one.
+    """
+    if error.code() not in _RETRYABLE_STATUS_CODES:
+        return None
+
+    retry_info_bin = dict(error.trailing_metadata() or ()).get(
+        "google.rpc.retryinfo-bin"
+    )
+    if retry_info_bin is not None:
+        retry_info = RetryInfo()
+        retry_info.ParseFromString(retry_info_bin)
+        delay = (
+            retry_info.retry_delay.seconds
+            + retry_info.retry_delay.nanos / 1.0e9
+        )
+    return delay
+
+
+class _RetryScheduler:
+    """Retries export requests from a background thread, so that a failing
+    request does not delay the export of the following ones.
+
+    Args:
+        send: Sends a request, given the default delay before the next
+            attempt, and returns the delay before retrying it or `None` if
+            it must not be retried.
+        timeout_millis: The time after which a request is not retried
+            anymore, counted from its first attempt.
+        max_pending: The maximum number of requests waiting to be retried.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Any, float], Optional[float]],
+        timeout_millis: float,
+        max_pending: int = 64,
+    ):
+        self._send = send
+        self._timeout = timeout_millis / 1e3
+        self._max_pending = max_pending
+        self._condition = threading.Condition(threading.Lock())
+        # (due time, sequence, request, deadline, delays), earliest first
+        self._retries = (
+            []
+        )  # type: List[Tuple[float, int, Any, float, Iterator[float]]]
+        self._sequence = itertools.count()
+        self._thread = None  # type: Optional[threading.Thread]
+        self._pid = None  # type: Optional[int]
+        self._done = False
+
+    def __len__(self) -> int:
+        return len(self._retries)
+
+    def schedule(
+        self, request: Any, delay: float, delays: Iterator[float]
+    ) -> bool:
+        """Schedules a request that failed on its first attempt to be sent
+        again in ``delay`` seconds, taking the following default delays from
+        ``delays``. Returns whether it was scheduled.
+        """
+        now = monotonic()
+        deadline = now + self._timeout
+        with self._condition:
+            if self._done:
+                return False
+            if now + delay > deadline:
+                logger.warning(
+                    "Not retrying export, the retry delay of %ss exceeds "
+                    "the export timeout",
+                    delay,
+                )
+                return False
+            if self._pid != os.getpid():
+                # the thread and retries of the parent process were not
+                # inherited by this forked child
+                self._retries = []
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            if len(self._retries) >= self._max_pending:
+                logger.warning(
+                    "Too many exports waiting to be retried, dropping one"
+                )
+                return False
+            logger.debug("Waiting %ss before retrying export", delay)
+            heapq.heappush(
+                self._retries,
+                (now + delay, next(self._sequence), request, deadline, delays),
+            )
+            self._condition.notify()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._done:
+                    if not self._retries:
+                        self._condition.wait()
+                        continue
+                    timeout = self._retries[0][0] - monotonic()
+                    if timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                if self._done:
+                    return
+                _, _, request, deadline, delays = heapq.heappop(self._retries)
+
+            token = attach(set_value("suppress_instrumentation", True))
+            try:
+                delay = self._send(request, next(delays))
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Exception while retrying export")
+                delay = None
+            detach(token)
+            if delay is None:
+                continue
+
+            due = monotonic() + delay
+            if due > deadline:
+                logger.warning(
+                    "Dropping export after retrying until the export timeout"
+                )
+                continue
+            with self._condition:
+                heapq.heappush(
+                    self._retries,
+                    (due, next(self._sequence), request, deadline, delays),
+                )
+
+    def shutdown(self) -> None:
+        """Stops retrying, dropping the requests waiting to be retried."""
+        with self._condition:
+            self._done = True
+            pending = len(self._retries)
+            self._retries = []
+            self._condition.notify()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join()
+        if pending:
+            logger.warning(
+                "Dropping %s exports waiting to be retried", pending
+            )
+
+
 # pylint: disable=no-member
 class OTLPExporterMixin(
     ABC, Generic[SDKDataT, ExportServiceRequestT, ExportResultT]
@@ -138,6 +310,10 @@ class OTLPExporterMixin(
         credentials: ChannelCredentials object for server authentication
         metadata: Metadata to send when exporting
         timeout: Backend request timeout in seconds
+        spill_queue: Queue keeping the requests on disk while the backend is
+            unavailable instead of retrying them
+        retry_timeout_millis: The time after which a failed export is not
+            retried anymore, 30 seconds by default
     """
 
     def __init__(
@@ -147,8 +323,11 @@ class OTLPExporterMixin(
         credentials: Optional[ChannelCredentials] = None,
         headers: Optional[str] = None,
         timeout: Optional[int] = None,
+        spill_queue: Optional[SpillQueue] = None,
+        retry_timeout_millis: Optional[float] = None,
     ):
         super().__init__()
+        self._spill_queue = spill_queue
 
         endpoint = (
             endpoint
@@ -167,15 +346,26 @@ class OTLPExporterMixin(
             or Configuration().EXPORTER_OTLP_TIMEOUT
             or 10  # default: 10 seconds
         )
-        self._collector_span_kwargs = None
+        self._retry_timeout_millis = retry_timeout_millis or 30000
+        self._retry_scheduler = _RetryScheduler(
+            self._send, self._retry_timeout_millis
+        )
 
-        if insecure:
-            self._client = self._stub(insecure_channel(endpoint))
-        else:
+        if not insecure:
             credentials = credentials or _load_credential_from_file(
                 Configuration().EXPORTER_OTLP_CERTIFICATE
             )
-            self._client = self._stub(secure_channel(endpoint, credentials))
+        self._client = self._create_client(endpoint, insecure, credentials)
+
+    def _create_client(
+        self,
+        endpoint: str,
+        insecure: bool,
+        credentials: Optional[ChannelCredentials],
+    ):
+        if insecure:
+            return self._stub(insecure_channel(endpoint))
+        return self._stub(secure_channel(endpoint, credentials))
 
     @abstractmethod
     def _translate_data(
@@ -184,65 +374,94 @@ class OTLPExporterMixin(
         pass
 
     def _export(self, data: TypingSequence[SDKDataT]) -> ExportResultT:
+        if self._spill_queue is not None:
+            return self._export_or_spill(data)
+
+        request = self._translate_data(data)
         # expo returns a generator that yields delay values which grow
-        # exponentially. Once delay is greater than max_value, the yielded
-        # value will remain constant.
-        # max_value is set to 900 (900 seconds is 15 minutes) to use the same
-        # value as used in the Go implementation.
+        # exponentially, the retries stop at the export timeout.
+        delays = expo()
+        try:
+            self._client.Export(
+                request=request, metadata=self._headers, timeout=self._timeout,
+            )
+        except RpcError as error:
+            retry_delay = _get_retry_delay(error, next(delays))
+            if retry_delay is not None:
+                # retried in the background, newer exports are not delayed
+                if self._retry_scheduler.schedule(
+                    request, retry_delay, delays
+                ):
+                    return self._result.SUCCESS
+                return self._result.FAILURE
 
-        max_value = 900
+            if error.code() == StatusCode.OK:
+                return self._result.SUCCESS
+
+            return self._result.FAILURE
 
-        for delay in expo(max_value=max_value):
+        return self._result.SUCCESS
 
-            if delay == max_value:
+    def _send(self, request: ExportServiceRequestT, delay: float):
+        """Sends a request being retried and returns the delay before the
+        next attempt, or `None` if it must not be retried anymore.
+        """
+        try:
+            self._client.Export(
+                request=request, metadata=self._headers, timeout=self._timeout,
+            )
+        except RpcError as error:
+            return _get_retry_delay(error, delay)
+        return None
+
+    def _export_or_spill(
+        self, data: TypingSequence[SDKDataT]
+    ) -> ExportResultT:
+        """Exports without retrying, spilling the request to disk if the
+        backend is unavailable. Once it is available again, some of the
+        spilled requests are sent after each successful export, see
+        `SpillQueue.send`.
+        """
+        request = self._translate_data(data)
+        try:
+            self._client.Export(
+                request=request, metadata=self._headers, timeout=self._timeout,
+            )
+        except RpcError as error:
+            if _get_retry_delay(error, 0) is not None:
+                logger.debug("Spilling export request to disk")
+                if self._spill_queue.put(request.SerializeToString()):
+                    return self._result.SUCCESS
                 return self._result.FAILURE
 
+            if error.code() == StatusCode.OK:
+                return self._result.SUCCESS
+
+            return self._result.FAILURE
+
+        parse_request = type(request).FromString
+
+        def send(serialized_request: bytes) -> bool:
             try:
                 self._client.Export(
-                    request=self._translate_data(data),
+                    request=parse_request(serialized_request),
                     metadata=self._headers,
                     timeout=self._timeout,
                 )
-
-                return self._result.SUCCESS
-
             except RpcError as error:
+                if _get_retry_delay(error, 0) is not None:
+                    return False
+                # the backend rejected the request, sending it again would
+                # not help
+                logger.warning(
+                    "Dropping spilled export request: %s", error.code()
+                )
+            return True
 
-                if error.code() in [
-                    StatusCode.CANCELLED,
-                    StatusCode.DEADLINE_EXCEEDED,
-                    StatusCode.PERMISSION_DENIED,
-                    StatusCode.UNAUTHENTICATED,
-                    StatusCode.RESOURCE_EXHAUSTED,
-                    StatusCode.ABORTED,
-                    StatusCode.OUT_OF_RANGE,
-                    StatusCode.UNAVAILABLE,
-                    StatusCode.DATA_LOSS,
-                ]:
-
-                    retry_info_bin = dict(error.trailing_metadata()).get(
-                        "google.rpc.retryinfo-bin"
-                    )
-                    if retry_info_bin is not None:
-                        retry_info = RetryInfo()
-                        retry_info.ParseFromString(retry_info_bin)
-                        delay = (
-                            retry_info.retry_delay.seconds
-                            + retry_info.retry_delay.nanos / 1.0e9
-                        )
-
-                    logger.debug(
-                        "Waiting %ss before retrying export of span", delay
-                    )
-                    sleep(delay)
-                    continue
-
-                if error.code() == StatusCode.OK:
-                    return self._result.SUCCESS
-
-                return self._result.FAILURE
-
-        return self._result.FAILURE
+        self._spill_queue.send(send)
+        return self._result.SUCCESS
 
     def shutdown(self) -> None:
-        pass
+        self._retry_scheduler.shutdown()
+        if self._spill_queue is not None:
+            self._spill_queue.close()
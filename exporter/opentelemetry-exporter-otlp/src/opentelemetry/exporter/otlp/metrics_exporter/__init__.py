@@ -123,6 +123,8 @@ class OTLPMetricsExporter(
         credentials: Credentials object for server authentication
         metadata: Metadata to send when exporting
         timeout: Backend request timeout in seconds
+        retry_timeout_millis: The time after which a failed export is not
+            retried anymore, 30 seconds by default
     """
 
     _stub = MetricsServiceStub
@@ -135,6 +137,7 @@ class OTLPMetricsExporter(
         credentials: Optional[ChannelCredentials] = None,
         headers: Optional[str] = None,
         timeout: Optional[int] = None,
+        retry_timeout_millis: Optional[float] = None,
     ):
         if insecure is None:
             insecure = Configuration().EXPORTER_OTLP_METRIC_INSECURE
@@ -157,6 +160,7 @@ class OTLPMetricsExporter(
                 or Configuration().EXPORTER_OTLP_METRIC_HEADERS,
                 "timeout": timeout
                 or Configuration().EXPORTER_OTLP_METRIC_TIMEOUT,
+                "retry_timeout_millis": retry_timeout_millis,
             }
         )
 
@@ -0,0 +1,286 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A `SpillQueue` keeps the export requests that could not be sent because the
+collector is unavailable on the local disk, so that they are sent once it
+recovers instead of being dropped or blocking the export worker while
+retrying:
+
+.. code:: python
+
+    from opentelemetry.exporter.otlp.spill_queue import SpillQueue
+    from opentelemetry.exporter.otlp.trace_exporter import OTLPSpanExporter
+
+    exporter = OTLPSpanExporter(
+        spill_queue=SpillQueue("/var/lib/myservice/otlp-spans")
+    )
+
+The requests are appended to segment files in the given directory, which are
+read back with `mmap` and deleted once all their requests were sent. Requests
+spilled by a previous run of the process are sent as well, a few after each
+successful export so that a large backlog does not delay the new exports.
+Delivery is at least once: requests being sent when the process stops are
+sent again by the next one.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict
+
+from opentelemetry.util import time_ns
+
+logger = logging.getLogger(__name__)
+
+# timestamp in nanoseconds and length of each record
+_HEADER = struct.Struct("<QI")
+_SEGMENT_SUFFIX = ".spill"
+
+
+class SpillQueue:
+    """A persistent FIFO queue of serialized export requests.
+
+    Args:
+        directory: The directory holding the segment files, created if it
+            does not exist. It must not be shared between processes.
+        max_size_bytes: The maximum size of the segment files, the oldest
+            segments are deleted to make room for new requests.
+        ttl_millis: The age after which requests are deleted without being
+            sent.
+        segment_size_bytes: The size after which a new segment file is
+            started.
+        max_send_requests: The maximum number of requests passed to the
+            ``send`` callback by each call of `send`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size_bytes: int = 64 * 1024 * 1024,
+        ttl_millis: float = 24 * 60 * 60 * 1000,
+        segment_size_bytes: int = 1024 * 1024,
+        max_send_requests: int = 16,
+    ):
+        if max_size_bytes <= 0:
+            raise ValueError("max_size_bytes must be a positive integer.")
+
+        if ttl_millis <= 0:
+            raise ValueError("ttl_millis must be positive.")
+
+        if segment_size_bytes <= 0 or segment_size_bytes > max_size_bytes:
+            raise ValueError(
+                "segment_size_bytes must be positive and less than or equal "
+                "to max_size_bytes."
+            )
+
+        if max_send_requests <= 0:
+            raise ValueError("max_send_requests must be a positive integer.")
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+        self.ttl_millis = ttl_millis
+        self.segment_size_bytes = segment_size_bytes
+        self.max_send_requests = max_send_requests
+        # guards the segments and the writer
+        self._lock = threading.Lock()
+        # held while sending, so that requests are sent in order
+        self._send_lock = threading.Lock()
+        # segment paths and sizes, oldest first
+        self._segments = OrderedDict()  # type: Dict[str, int]
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(_SEGMENT_SUFFIX):
+                path = os.path.join(directory, name)
+                self._segments[path] = os.path.getsize(path)
+        self._size = sum(self._segments.values())
+        self._writer = None
+        self._writer_path = None
+        # offsets of the requests already sent from partially sent segments
+        self._offsets = {}  # type: Dict[str, int]
+        self._dropped = False
+
+    @property
+    def size_bytes(self) -> int:
+        """The size of the segment files."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def put(self, data: bytes) -> bool:
+        """Appends a serialized request to the queue.
+
+        Returns whether the request was written, which is not the case if it
+        is larger than ``max_size_bytes`` or if writing failed.
+        """
+        record = _HEADER.pack(time_ns(), len(data)) + data
+        if len(record) > self.max_size_bytes:
+            logger.warning(
+                "Request of %s bytes is too large to be spilled.", len(data)
+            )
+            return False
+
+        with self._lock:
+            try:
+                if (
+                    self._writer is None
+                    or self._segments[self._writer_path] + len(record)
+                    > self.segment_size_bytes
+                ):
+                    self._open_writer()
+                self._writer.write(record)
+                self._writer.flush()
+            except OSError:
+                logger.exception("Failed to spill request.")
+                return False
+            self._segments[self._writer_path] += len(record)
+            self._size += len(record)
+            while self._size > self.max_size_bytes:
+                if not self._dropped:
+                    logger.warning(
+                        "Spill queue is full, oldest requests will be dropped."
+                    )
+                    self._dropped = True
+                self._remove_segment(next(iter(self._segments)))
+        return True
+
+    def send(self, send: Callable[[bytes], bool]) -> None:
+        """Passes the queued requests, oldest first, to ``send`` until it
+        returns ``False`` or ``max_send_requests`` requests were passed.
+
+        The requests for which ``send`` returned ``True`` are removed from the
+        queue. Returns immediately if requests are already being sent from
+        another thread.
+        """
+        if not self._send_lock.acquire(blocking=False):
+            return
+        remaining = self.max_send_requests
+
+        def send_next(data: bytes) -> bool:
+            nonlocal remaining
+            if remaining <= 0:
+                # the request is kept for the next call
+                return False
+            remaining -= 1
+            return send(data)
+
+        try:
+            while True:
+                with self._lock:
+                    if not self._segments:
+                        self._dropped = False
+                        return
+                    path = next(iter(self._segments))
+                    if path == self._writer_path:
+                        # segments are only read once complete
+                        self._close_writer()
+                if not self._send_segment(path, send_next):
+                    return
+                with self._lock:
+                    self._remove_segment(path)
+        finally:
+            self._send_lock.release()
+
+    def _send_segment(self, path: str, send: Callable[[bytes], bool]) -> bool:
+        """Sends the requests of a segment and returns whether all were
+        sent or expired.
+        """
+        now = time_ns()
+        ttl = int(self.ttl_millis * 1e6)
+        try:
+            if now - os.stat(path).st_mtime_ns > ttl:
+                # even the most recent request of the segment expired
+                return True
+            with open(path, "rb") as segment:
+                if os.fstat(segment.fileno()).st_size == 0:
+                    return True
+                with mmap.mmap(
+                    segment.fileno(), 0, access=mmap.ACCESS_READ
+                ) as data:
+                    return self._send_records(path, data, now, ttl, send)
+        except FileNotFoundError:
+            # the segment was dropped to make room for new requests
+            return True
+        except OSError:
+            logger.exception("Failed to read spilled requests.")
+            return False
+
+    def _send_records(
+        self,
+        path: str,
+        data: mmap.mmap,
+        now: int,
+        ttl: int,
+        send: Callable[[bytes], bool],
+    ) -> bool:
+        with self._lock:
+            offset = self._offsets.get(path, 0)
+        while offset + _HEADER.size <= len(data):
+            timestamp, length = _HEADER.unpack_from(data, offset)
+            start = offset + _HEADER.size
+            end = start + length
+            if end > len(data):
+                # truncated by a crash while writing
+                logger.warning("Dropping truncated spilled request.")
+                break
+            if now - timestamp <= ttl and not send(data[start:end]):
+                with self._lock:
+                    # put may have dropped the segment meanwhile
+                    if path in self._segments:
+                        self._offsets[path] = offset
+                return False
+            offset = end
+        return True
+
+    def _open_writer(self) -> None:
+        self._close_writer()
+        timestamp = time_ns()
+        path = self._segment_path(timestamp)
+        while path in self._segments or os.path.exists(path):
+            timestamp += 1
+            path = self._segment_path(timestamp)
+        self._writer = open(path, "ab")
+        self._writer_path = path
+        self._segments[path] = 0
+
+    def _segment_path(self, timestamp: int) -> str:
+        # zero padded so that segments sort by creation time
+        return os.path.join(
+            self.directory, "{:020d}{}".format(timestamp, _SEGMENT_SUFFIX)
+        )
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._writer_path = None
+
+    def _remove_segment(self, path: str) -> None:
+        if path == self._writer_path:
+            self._close_writer()
+        self._size -= self._segments.pop(path, 0)
+        self._offsets.pop(path, None)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Closes the segment being written, the queued requests are kept."""
+        with self._lock:
+            self._close_writer()
@@ -15,17 +15,18 @@
 
 import logging
 import os
-from typing import Optional, Sequence
+from typing import Any, Dict, Optional, Sequence
 
 from grpc import ChannelCredentials
 
 from opentelemetry.configuration import Configuration
 from opentelemetry.exporter.otlp.exporter import (
     OTLPExporterMixin,
-    _get_resource_data,
     _load_credential_from_file,
     _translate_key_values,
+    _translate_resource,
 )
+from opentelemetry.exporter.otlp.spill_queue import SpillQueue
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest,
 )
@@ -33,14 +34,14 @@ from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
     TraceServiceStub,
 )
 from opentelemetry.proto.common.v1.common_pb2 import InstrumentationLibrary
-from opentelemetry.proto.trace.v1.trace_pb2 import (
-    InstrumentationLibrarySpans,
-    ResourceSpans,
-)
 from opentelemetry.proto.trace.v1.trace_pb2 import Span as CollectorSpan
 from opentelemetry.proto.trace.v1.trace_pb2 import Status
 from opentelemetry.sdk.trace import Span as SDKSpan
-from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export import (
+    SpanExporter,
+    SpanExportResult,
+    group_spans_by_resource,
+)
 from opentelemetry.trace.status import StatusCode
 
 logger = logging.getLogger(__name__)
@@ -51,7 +52,7 @@ class OTLPSpanExporter(
     SpanExporter,
     OTLPExporterMixin[SDKSpan, ExportTraceServiceRequest, SpanExportResult],
 ):
-    # pylint: disable=unsubscriptable-object
+    # pylint: disable=unsubscriptable-object,no-self-use
     """OTLP span exporter
 
     Args:
@@ -60,6 +61,12 @@ class OTLPSpanExporter(
         credentials: Credentials object for server authentication
         metadata: Metadata to send when exporting
         timeout: Backend request timeout in seconds
+        spill_queue: Queue keeping the spans on disk while the backend is
+            unavailable instead of retrying them, see
+            `opentelemetry.exporter.otlp.spill_queue`
+        retry_timeout_millis: The time after which a failed export is not
+            retried anymore, defaults to the export timeout of the
+            `BatchExportSpanProcessor` (``OTEL_BSP_EXPORT_TIMEOUT_MILLIS``)
     """
 
     _result = SpanExportResult
@@ -72,6 +79,8 @@ class OTLPSpanExporter(
         credentials: Optional[ChannelCredentials] = None,
         headers: Optional[str] = None,
         timeout: Optional[int] = None,
+        spill_queue: Optional[SpillQueue] = None,
+        retry_timeout_millis: Optional[float] = None,
     ):
         if insecure is None:
             insecure = Configuration().EXPORTER_OTLP_SPAN_INSECURE
@@ -94,62 +103,81 @@ class OTLPSpanExporter(
                 or Configuration().EXPORTER_OTLP_SPAN_HEADERS,
                 "timeout": timeout
                 or Configuration().EXPORTER_OTLP_SPAN_TIMEOUT,
+                "spill_queue": spill_queue,
+                "retry_timeout_millis": retry_timeout_millis
+                or Configuration().get("BSP_EXPORT_TIMEOUT_MILLIS", 30000),
             }
         )
 
-    def _translate_name(self, sdk_span: SDKSpan) -> None:
-        self._collector_span_kwargs["name"] = sdk_span.name
-
-    def _translate_start_time(self, sdk_span: SDKSpan) -> None:
-        self._collector_span_kwargs[
-            "start_time_unix_nano"
-        ] = sdk_span.start_time
-
-    def _translate_end_time(self, sdk_span: SDKSpan) -> None:
-        self._collector_span_kwargs["end_time_unix_nano"] = sdk_span.end_time
-
-    def _translate_span_id(self, sdk_span: SDKSpan) -> None:
-        self._collector_span_kwargs[
-            "span_id"
-        ] = sdk_span.context.span_id.to_bytes(8, "big")
+    def _translate_name(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
+        collector_span_kwargs["name"] = sdk_span.name
+
+    def _translate_start_time(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
+        collector_span_kwargs["start_time_unix_nano"] = sdk_span.start_time
+
+    def _translate_end_time(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
+        collector_span_kwargs["end_time_unix_nano"] = sdk_span.end_time
+
+    def _translate_span_id(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
+        collector_span_kwargs["span_id"] = sdk_span.context.span_id.to_bytes(
+            8, "big"
+        )
 
-    def _translate_trace_id(self, sdk_span: SDKSpan) -> None:
-        self._collector_span_kwargs[
-            "trace_id"
-        ] = sdk_span.context.trace_id.to_bytes(16, "big")
+    def _translate_trace_id(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
+        collector_span_kwargs["trace_id"] = sdk_span.context.trace_id.to_bytes(
+            16, "big"
+        )
 
-    def _translate_parent(self, sdk_span: SDKSpan) -> None:
+    def _translate_parent(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
         if sdk_span.parent is not None:
-            self._collector_span_kwargs[
+            collector_span_kwargs[
                 "parent_span_id"
             ] = sdk_span.parent.span_id.to_bytes(8, "big")
 
-    def _translate_context_trace_state(self, sdk_span: SDKSpan) -> None:
+    def _translate_context_trace_state(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
         if sdk_span.context.trace_state is not None:
-            self._collector_span_kwargs["trace_state"] = ",".join(
+            collector_span_kwargs["trace_state"] = ",".join(
                 [
                     "{}={}".format(key, value)
                     for key, value in (sdk_span.context.trace_state.items())
                 ]
             )
 
-    def _translate_attributes(self, sdk_span: SDKSpan) -> None:
+    def _translate_attributes(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
         if sdk_span.attributes:
 
-            self._collector_span_kwargs["attributes"] = []
+            collector_span_kwargs["attributes"] = []
 
             for key, value in sdk_span.attributes.items():
 
                 try:
-                    self._collector_span_kwargs["attributes"].append(
+                    collector_span_kwargs["attributes"].append(
                         _translate_key_values(key, value)
                     )
                 except Exception as error:  # pylint: disable=broad-except
                     logger.exception(error)
 
-    def _translate_events(self, sdk_span: SDKSpan) -> None:
+    def _translate_events(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
         if sdk_span.events:
-            self._collector_span_kwargs["events"] = []
+            collector_span_kwargs["events"] = []
 
             for sdk_span_event in sdk_span.events:
 
@@ -167,13 +195,13 @@ class OTLPSpanExporter(
                     except Exception as error:
                         logger.exception(error)
 
-                self._collector_span_kwargs["events"].append(
-                    collector_span_event
-                )
+                collector_span_kwargs["events"].append(collector_span_event)
 
-    def _translate_links(self, sdk_span: SDKSpan) -> None:
+    def _translate_links(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
         if sdk_span.links:
-            self._collector_span_kwargs["links"] = []
+            collector_span_kwargs["links"] = []
 
             for sdk_span_link in sdk_span.links:
 
@@ -193,79 +221,91 @@ class OTLPSpanExporter(
                     except Exception as error:
                         logger.exception(error)
 
-                self._collector_span_kwargs["links"].append(
-                    collector_span_link
-                )
+                collector_span_kwargs["links"].append(collector_span_link)
 
-    def _translate_status(self, sdk_span: SDKSpan) -> None:
+    def _translate_status(
+        self, sdk_span: SDKSpan, collector_span_kwargs: Dict[str, Any]
+    ) -> None:
         if sdk_span.status is not None:
             # TODO: Update this when the proto definitions are updated to include UNSET and ERROR
             proto_status_code = Status.STATUS_CODE_OK
             if sdk_span.status.status_code is StatusCode.ERROR:
                 proto_status_code = Status.STATUS_CODE_UNKNOWN_ERROR
-            self._collector_span_kwargs["status"] = Status(
+            collector_span_kwargs["status"] = Status(
                 code=proto_status_code, message=sdk_span.status.description,
             )
 
     def _translate_data(
         self, data: Sequence[SDKSpan]
     ) -> ExportTraceServiceRequest:
-        # pylint: disable=attribute-defined-outside-init
-
-        sdk_resource_instrumentation_library_spans = {}
-
-        for sdk_span in data:
-
-            if sdk_span.resource not in (
-                sdk_resource_instrumentation_library_spans.keys()
-            ):
-                if sdk_span.instrumentation_info is not None:
-                    instrumentation_library_spans = InstrumentationLibrarySpans(
-                        instrumentation_library=InstrumentationLibrary(
-                            name=sdk_span.instrumentation_info.name,
-                            version=sdk_span.instrumentation_info.version,
-                        )
-                    )
-
-                else:
-                    instrumentation_library_spans = (
-                        InstrumentationLibrarySpans()
+        request = ExportTraceServiceRequest()
+        # resource spans by resource identity, messages are added in place
+        # rather than appended as appending copies them
+        resource_spans = {}
+
+        for (
+            sdk_resource,
+            instrumentation_info,
+            sdk_spans,
+        ) in group_spans_by_resource(data):
+
+            if id(sdk_resource) not in resource_spans:
+                # the resource is translated once for the whole batch
+                resource_spans[id(sdk_resource)] = request.resource_spans.add(
+                    resource=_translate_resource(sdk_resource)
+                )
+            library_spans_list = resource_spans[
+                id(sdk_resource)
+            ].instrumentation_library_spans
+
+            if instrumentation_info is not None:
+                instrumentation_library_spans = library_spans_list.add(
+                    instrumentation_library=InstrumentationLibrary(
+                        name=instrumentation_info.name,
+                        version=instrumentation_info.version,
                     )
+                )
 
-                sdk_resource_instrumentation_library_spans[
-                    sdk_span.resource
-                ] = instrumentation_library_spans
-
-            self._collector_span_kwargs = {}
-
-            self._translate_name(sdk_span)
-            self._translate_start_time(sdk_span)
-            self._translate_end_time(sdk_span)
-            self._translate_span_id(sdk_span)
-            self._translate_trace_id(sdk_span)
-            self._translate_parent(sdk_span)
-            self._translate_context_trace_state(sdk_span)
-            self._translate_attributes(sdk_span)
-            self._translate_events(sdk_span)
-            self._translate_links(sdk_span)
-            self._translate_status(sdk_span)
-
-            self._collector_span_kwargs["kind"] = getattr(
-                CollectorSpan.SpanKind,
-                "SPAN_KIND_{}".format(sdk_span.kind.name),
-            )
+            else:
+                instrumentation_library_spans = library_spans_list.add()
+
+            for sdk_span in sdk_spans:
+                # local to each call, spans may be exported concurrently
+                collector_span_kwargs = {}  # type: Dict[str, Any]
+
+                self._translate_name(sdk_span, collector_span_kwargs)
+                self._translate_start_time(sdk_span, collector_span_kwargs)
+                self._translate_end_time(sdk_span, collector_span_kwargs)
+                self._translate_span_id(sdk_span, collector_span_kwargs)
+                self._translate_trace_id(sdk_span, collector_span_kwargs)
+                self._translate_parent(sdk_span, collector_span_kwargs)
+                self._translate_context_trace_state(
+                    sdk_span, collector_span_kwargs
+                )
+                self._translate_attributes(sdk_span, collector_span_kwargs)
+                self._translate_events(sdk_span, collector_span_kwargs)
+                self._translate_links(sdk_span, collector_span_kwargs)
+                self._translate_status(sdk_span, collector_span_kwargs)
+
+                collector_span_kwargs["kind"] = getattr(
+                    CollectorSpan.SpanKind,
+                    "SPAN_KIND_{}".format(sdk_span.kind.name),
+                )
 
-            sdk_resource_instrumentation_library_spans[
-                sdk_span.resource
-            ].spans.append(CollectorSpan(**self._collector_span_kwargs))
+                instrumentation_library_spans.spans.add(
+                    **collector_span_kwargs
+                )
 
-        return ExportTraceServiceRequest(
-            resource_spans=_get_resource_data(
-                sdk_resource_instrumentation_library_spans,
-                ResourceSpans,
-                "spans",
-            )
-        )
+        return request
 
     def export(self, spans: Sequence[SDKSpan]) -> SpanExportResult:
+        """Exports a batch of spans, see `SpanExporter.export`.
+
+        If the backend is unavailable, the export request is retried in the
+        background, or spilled to disk with a ``spill_queue``, and
+        `SpanExportResult.SUCCESS` is returned once it was accepted for
+        that. `SpanExportResult.FAILURE` is only returned if the request
+        could not be delivered, retried or spilled. A warning is logged if an
+        accepted request is later dropped without being delivered.
+        """
         return self._export(spans)
@@ -0,0 +1,147 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+OTLP span exporter for asyncio applications, sending the spans with the
+`grpc.aio`_ API from the event loop of the application. It requires
+``grpcio >= 1.32.0``.
+
+.. _grpc.aio: https://grpc.github.io/grpc/python/grpc_asyncio.html
+
+.. code:: python
+
+    import asyncio
+
+    from opentelemetry import trace
+    from opentelemetry.exporter.otlp.trace_exporter.aio import (
+        AsyncOTLPSpanExporter,
+    )
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import AsyncBatchExportSpanProcessor
+
+    async def main():
+        span_processor = AsyncBatchExportSpanProcessor(
+            AsyncOTLPSpanExporter(endpoint="localhost:55680", insecure=True)
+        )
+        trace.get_tracer_provider().add_span_processor(span_processor)
+
+        with trace.get_tracer(__name__).start_as_current_span("foo"):
+            print("Hello world!")
+
+        await span_processor.async_shutdown()
+
+    trace.set_tracer_provider(TracerProvider())
+    asyncio.get_event_loop().run_until_complete(main())
+"""
+
+import asyncio
+import logging
+from time import monotonic
+from typing import Optional, Sequence
+
+from backoff import expo
+from grpc import ChannelCredentials, RpcError, StatusCode
+from grpc.aio import insecure_channel, secure_channel
+
+from opentelemetry.exporter.otlp.exporter import _get_retry_delay
+from opentelemetry.exporter.otlp.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace import Span as SDKSpan
+from opentelemetry.sdk.trace.export import AsyncSpanExporter, SpanExportResult
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOTLPSpanExporter(AsyncSpanExporter, OTLPSpanExporter):
+    """OTLP span exporter for `AsyncBatchExportSpanProcessor`.
+
+    Takes the same arguments as `OTLPSpanExporter`, except ``spill_queue``
+    which is not supported. The channel is created on the first export so
+    that it belongs to the event loop the spans are exported from.
+
+    A failed export is retried within `export` until ``retry_timeout_millis``
+    elapsed, waiting without blocking the event loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self._spill_queue is not None:
+            raise ValueError(
+                "spill_queue is not supported by AsyncOTLPSpanExporter."
+            )
+
+    def _create_client(
+        self,
+        endpoint: str,
+        insecure: bool,
+        credentials: Optional[ChannelCredentials],
+    ):
+        self._channel_args = (endpoint, insecure, credentials)
+        self._channel = None
+        return None
+
+    def _get_client(self):
+        if self._client is None:
+            endpoint, insecure, credentials = self._channel_args
+            if insecure:
+                self._channel = insecure_channel(endpoint)
+            else:
+                self._channel = secure_channel(endpoint, credentials)
+            self._client = self._stub(self._channel)
+        return self._client
+
+    # pylint: disable=invalid-overridden-method
+    async def export(self, spans: Sequence[SDKSpan]) -> SpanExportResult:
+        request = self._translate_data(spans)
+        deadline = monotonic() + self._retry_timeout_millis / 1e3
+
+        for delay in expo():
+
+            try:
+                await self._get_client().Export(
+                    request=request,
+                    metadata=self._headers,
+                    timeout=self._timeout,
+                )
+
+                return SpanExportResult.SUCCESS
+
+            except RpcError as error:
+                retry_delay = _get_retry_delay(error, delay)
+                if retry_delay is not None:
+                    if monotonic() + retry_delay > deadline:
+                        logger.warning(
+                            "Dropping export after retrying until the retry "
+                            "timeout"
+                        )
+                        return SpanExportResult.FAILURE
+                    logger.debug(
+                        "Waiting %ss before retrying export of span",
+                        retry_delay,
+                    )
+                    await asyncio.sleep(retry_delay)
+                    continue
+
+                if error.code() == StatusCode.OK:
+                    return SpanExportResult.SUCCESS
+
+                return SpanExportResult.FAILURE
+
+        return SpanExportResult.FAILURE
+
+    # pylint: disable=invalid-overridden-method
+    async def shutdown(self) -> None:
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+            self._client = None
@@ -12,16 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+import sys
+import time
 from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
-from unittest.mock import Mock, PropertyMock, patch
+from unittest.mock import ANY, Mock, PropertyMock, patch
 
 from google.protobuf.duration_pb2 import Duration
 from google.rpc.error_details_pb2 import RetryInfo
 from grpc import ChannelCredentials, StatusCode, server
 
 from opentelemetry.configuration import Configuration
+from opentelemetry.exporter.otlp.exporter import _RetryScheduler
 from opentelemetry.exporter.otlp.trace_exporter import OTLPSpanExporter
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest,
@@ -48,6 +52,7 @@ from opentelemetry.proto.trace.v1.trace_pb2 import Status
 from opentelemetry.sdk.resources import Resource as SDKResource
 from opentelemetry.sdk.trace import TracerProvider, _Span
 from opentelemetry.sdk.trace.export import (
+    BatchExportSpanProcessor,
     SimpleExportSpanProcessor,
     SpanExportResult,
 )
@@ -84,6 +89,21 @@ class TraceServiceServicerUNAVAILABLE(TraceServiceServicer):
         return ExportTraceServiceResponse()
 
 
+class TraceServiceServicerUNAVAILABLEOnce(TraceServiceServicer):
+    def __init__(self):
+        self.requests = 0
+
+    # pylint: disable=invalid-name,unused-argument
+    def Export(self, request, context):
+        self.requests += 1
+        if self.requests == 1:
+            context.set_code(StatusCode.UNAVAILABLE)
+        else:
+            context.set_code(StatusCode.OK)
+
+        return ExportTraceServiceResponse()
+
+
 class TraceServiceServicerSUCCESS(TraceServiceServicer):
     # pylint: disable=invalid-name,unused-argument,no-self-use
     def Export(self, request, context):
@@ -92,6 +112,20 @@ class TraceServiceServicerSUCCESS(TraceServiceServicer):
         return ExportTraceServiceResponse()
 
 
+class TraceServiceServicerRecording(TraceServiceServicer):
+    def __init__(self):
+        self.spans = []
+
+    # pylint: disable=invalid-name,unused-argument
+    def Export(self, request, context):
+        for resource_spans in request.resource_spans:
+            for library_spans in resource_spans.instrumentation_library_spans:
+                self.spans.extend(library_spans.spans)
+        context.set_code(StatusCode.OK)
+
+        return ExportTraceServiceResponse()
+
+
 class TraceServiceServicerALREADY_EXISTS(TraceServiceServicer):
     # pylint: disable=invalid-name,unused-argument,no-self-use
     def Export(self, request, context):
@@ -158,6 +192,7 @@ class TestOTLPSpanExporter(TestCase):
         Configuration._reset()  # pylint: disable=protected-access
 
     def tearDown(self):
+        self.exporter.shutdown()
         self.server.stop(None)
         Configuration._reset()  # pylint: disable=protected-access
 
@@ -183,11 +218,38 @@ class TestOTLPSpanExporter(TestCase):
         self.assertIsNotNone(kwargs["credentials"])
         self.assertIsInstance(kwargs["credentials"], ChannelCredentials)
 
+    @patch.dict("os.environ", {"OTEL_BSP_EXPORT_TIMEOUT_MILLIS": "5000"})
+    def test_retry_timeout(self):
+        # pylint: disable=protected-access
+        exporter = OTLPSpanExporter(insecure=True)
+        self.addCleanup(exporter.shutdown)
+        self.assertEqual(exporter._retry_scheduler._timeout, 5)
+
+        exporter = OTLPSpanExporter(insecure=True, retry_timeout_millis=100)
+        self.addCleanup(exporter.shutdown)
+        self.assertEqual(exporter._retry_scheduler._timeout, 0.1)
+
     @patch("opentelemetry.exporter.otlp.exporter.expo")
-    @patch("opentelemetry.exporter.otlp.exporter.sleep")
-    def test_unavailable(self, mock_sleep, mock_expo):
+    @patch("opentelemetry.exporter.otlp.exporter._RetryScheduler.schedule")
+    def test_unavailable(self, mock_schedule, mock_expo):
 
-        mock_expo.configure_mock(**{"return_value": [1]})
+        mock_expo.configure_mock(**{"return_value": iter([1])})
+
+        add_TraceServiceServicer_to_server(
+            TraceServiceServicerUNAVAILABLE(), self.server
+        )
+        # the request is accepted to be retried in the background
+        self.assertEqual(
+            self.exporter.export([self.span]), SpanExportResult.SUCCESS
+        )
+        mock_schedule.assert_called_with(ANY, 1, ANY)
+
+    @patch("opentelemetry.exporter.otlp.exporter.expo")
+    @patch("opentelemetry.exporter.otlp.exporter._RetryScheduler.schedule")
+    def test_unavailable_not_scheduled(self, mock_schedule, mock_expo):
+
+        mock_expo.configure_mock(**{"return_value": iter([1])})
+        mock_schedule.configure_mock(**{"return_value": False})
 
         add_TraceServiceServicer_to_server(
             TraceServiceServicerUNAVAILABLE(), self.server
@@ -195,21 +257,67 @@ class TestOTLPSpanExporter(TestCase):
         self.assertEqual(
             self.exporter.export([self.span]), SpanExportResult.FAILURE
         )
-        mock_sleep.assert_called_with(1)
 
     @patch("opentelemetry.exporter.otlp.exporter.expo")
-    @patch("opentelemetry.exporter.otlp.exporter.sleep")
-    def test_unavailable_delay(self, mock_sleep, mock_expo):
+    @patch("opentelemetry.exporter.otlp.exporter._RetryScheduler.schedule")
+    def test_unavailable_delay(self, mock_schedule, mock_expo):
 
-        mock_expo.configure_mock(**{"return_value": [1]})
+        mock_expo.configure_mock(**{"return_value": iter([1])})
 
         add_TraceServiceServicer_to_server(
             TraceServiceServicerUNAVAILABLEDelay(), self.server
         )
         self.assertEqual(
-            self.exporter.export([self.span]), SpanExportResult.FAILURE
+            self.exporter.export([self.span]), SpanExportResult.SUCCESS
         )
-        mock_sleep.assert_called_with(4)
+        mock_schedule.assert_called_with(ANY, 4, ANY)
+
+    @patch("opentelemetry.exporter.otlp.exporter.expo")
+    def test_unavailable_retry(self, mock_expo):
+        mock_expo.configure_mock(**{"return_value": itertools.repeat(0.01)})
+        servicer = TraceServiceServicerUNAVAILABLEOnce()
+        add_TraceServiceServicer_to_server(servicer, self.server)
+
+        self.assertEqual(
+            self.exporter.export([self.span]), SpanExportResult.SUCCESS
+        )
+        # the request is retried in the background while newer ones are
+        # exported
+        self.assertEqual(
+            self.exporter.export([self.span]), SpanExportResult.SUCCESS
+        )
+        deadline = time.time() + 5
+        while servicer.requests < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(servicer.requests, 3)
+        # pylint: disable=protected-access
+        self.assertEqual(len(self.exporter._retry_scheduler), 0)
+
+    def test_concurrent_exports(self):
+        servicer = TraceServiceServicerRecording()
+        add_TraceServiceServicer_to_server(servicer, self.server)
+        tracer_provider = TracerProvider()
+        span_processor = BatchExportSpanProcessor(
+            self.exporter, max_export_batch_size=4, max_export_workers=4
+        )
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+        # switch threads often so that the translations interleave
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+
+        for idx in range(1000):
+            name = "span-{}".format(idx)
+            span = tracer.start_span(name, attributes={"name": name})
+            span.add_event(name)
+            span.end()
+        self.assertTrue(span_processor.force_flush())
+
+        # the spans translated concurrently did not mix their fields
+        self.assertEqual(len(servicer.spans), 1000)
+        for span in servicer.spans:
+            self.assertEqual(span.attributes[0].value.string_value, span.name)
+            self.assertEqual(span.events[0].name, span.name)
 
     def test_success(self):
         add_TraceServiceServicer_to_server(
@@ -329,3 +437,76 @@ class TestOTLPSpanExporter(TestCase):
 
         # pylint: disable=protected-access
         self.assertEqual(expected, self.exporter._translate_data([self.span]))
+
+    def test_translate_spans_grouped_by_instrumentation_library(self):
+        tracer_provider = TracerProvider(
+            resource=SDKResource(OrderedDict([("a", 1)]))
+        )
+        spans = []
+        for name in ("first", "second", "first"):
+            span = tracer_provider.get_tracer(name, "0.1").start_span(name)
+            span.end()
+            spans.append(span)
+
+        # pylint: disable=protected-access
+        request = self.exporter._translate_data(spans)
+
+        self.assertEqual(len(request.resource_spans), 1)
+        resource_spans = request.resource_spans[0]
+        self.assertEqual(
+            resource_spans.resource,
+            OTLPResource(
+                attributes=[KeyValue(key="a", value=AnyValue(int_value=1))]
+            ),
+        )
+        self.assertEqual(
+            [
+                (
+                    library_spans.instrumentation_library.name,
+                    [span.name for span in library_spans.spans],
+                )
+                for library_spans in resource_spans.instrumentation_library_spans
+            ],
+            [("first", ["first", "first"]), ("second", ["second"])],
+        )
+
+
+class TestRetryScheduler(TestCase):
+    def test_retry_until_timeout(self):
+        attempts = []
+
+        def send(request, delay):
+            attempts.append(request)
+            return delay
+
+        scheduler = _RetryScheduler(send, timeout_millis=100)
+        self.addCleanup(scheduler.shutdown)
+
+        with self.assertLogs(level="WARNING"):
+            self.assertTrue(
+                scheduler.schedule("request", 0.01, itertools.repeat(0.01))
+            )
+            deadline = time.time() + 5
+            while len(scheduler) and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(len(scheduler), 0)
+        self.assertGreater(len(attempts), 1)
+        self.assertLess(len(attempts), 11)
+
+    def test_delay_exceeding_timeout(self):
+        scheduler = _RetryScheduler(lambda request, delay: None, 1000)
+        with self.assertLogs(level="WARNING"):
+            self.assertFalse(
+                scheduler.schedule("request", 2, itertools.repeat(1))
+            )
+        self.assertEqual(len(scheduler), 0)
+
+    def test_shutdown(self):
+        scheduler = _RetryScheduler(lambda request, delay: None, 60000)
+        scheduler.schedule("request", 30, itertools.repeat(1))
+        self.assertEqual(len(scheduler), 1)
+
+        with self.assertLogs(level="WARNING"):
+            scheduler.shutdown()
+        self.assertEqual(len(scheduler), 0)
+        self.assertFalse(scheduler.schedule("request", 1, iter([])))
@@ -0,0 +1,139 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import itertools
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from grpc import StatusCode
+from grpc.aio import server
+
+from opentelemetry.exporter.otlp.trace_exporter.aio import (
+    AsyncOTLPSpanExporter,
+)
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceResponse,
+)
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
+    TraceServiceServicer,
+    add_TraceServiceServicer_to_server,
+)
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    AsyncBatchExportSpanProcessor,
+    SpanExportResult,
+)
+
+
+class AsyncTraceServiceServicer(TraceServiceServicer):
+    def __init__(self, status_codes):
+        self.status_codes = list(status_codes)
+        self.requests = []
+
+    # pylint: disable=invalid-name,invalid-overridden-method
+    async def Export(self, request, context):
+        self.requests.append(request)
+        context.set_code(self.status_codes.pop(0))
+
+        return ExportTraceServiceResponse()
+
+
+class TestAsyncOTLPSpanExporter(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.tracer_provider = TracerProvider()
+        self.tracer = self.tracer_provider.get_tracer(__name__)
+
+    def _start_server(self, *status_codes, **kwargs):
+        servicer = AsyncTraceServiceServicer(status_codes)
+
+        async def start():
+            grpc_server = server()
+            add_TraceServiceServicer_to_server(servicer, grpc_server)
+            port = grpc_server.add_insecure_port("localhost:0")
+            await grpc_server.start()
+            return grpc_server, port
+
+        grpc_server, port = self.loop.run_until_complete(start())
+        self.addCleanup(self.loop.run_until_complete, grpc_server.stop(None))
+        exporter = AsyncOTLPSpanExporter(
+            endpoint="localhost:{}".format(port), insecure=True, **kwargs
+        )
+        return servicer, exporter
+
+    def _export(self, exporter):
+        span = self.tracer.start_span("foo")
+        span.end()
+        try:
+            return self.loop.run_until_complete(exporter.export([span]))
+        finally:
+            self.loop.run_until_complete(exporter.shutdown())
+
+    def test_success(self):
+        servicer, exporter = self._start_server(StatusCode.OK)
+        self.assertEqual(self._export(exporter), SpanExportResult.SUCCESS)
+
+        (request,) = servicer.requests
+        self.assertEqual(
+            request.resource_spans[0]
+            .instrumentation_library_spans[0]
+            .spans[0]
+            .name,
+            "foo",
+        )
+
+    def test_failure(self):
+        servicer, exporter = self._start_server(StatusCode.ALREADY_EXISTS)
+        self.assertEqual(self._export(exporter), SpanExportResult.FAILURE)
+        self.assertEqual(len(servicer.requests), 1)
+
+    @patch("opentelemetry.exporter.otlp.trace_exporter.aio.expo")
+    def test_unavailable(self, mock_expo):
+        mock_expo.configure_mock(**{"return_value": [0, 0]})
+
+        servicer, exporter = self._start_server(
+            StatusCode.UNAVAILABLE, StatusCode.OK
+        )
+        self.assertEqual(self._export(exporter), SpanExportResult.SUCCESS)
+        self.assertEqual(len(servicer.requests), 2)
+
+    @patch("opentelemetry.exporter.otlp.trace_exporter.aio.expo")
+    def test_retry_timeout(self, mock_expo):
+        mock_expo.configure_mock(**{"return_value": itertools.repeat(0.05)})
+
+        servicer, exporter = self._start_server(
+            *[StatusCode.UNAVAILABLE] * 10, retry_timeout_millis=120
+        )
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(self._export(exporter), SpanExportResult.FAILURE)
+        # the retries stop before the delay would exceed the retry timeout
+        self.assertEqual(len(servicer.requests), 3)
+
+    def test_spill_queue_not_supported(self):
+        with self.assertRaises(ValueError):
+            AsyncOTLPSpanExporter(insecure=True, spill_queue=Mock())
+
+    def test_batch_export(self):
+        servicer, exporter = self._start_server(StatusCode.OK)
+        span_processor = AsyncBatchExportSpanProcessor(
+            exporter, loop=self.loop
+        )
+        self.tracer_provider.add_span_processor(span_processor)
+        with self.tracer.start_as_current_span("foo"):
+            pass
+
+        span_processor.shutdown()
+        self.assertEqual(len(servicer.requests), 1)
@@ -0,0 +1,288 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import struct
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+
+from grpc import StatusCode, server
+
+from opentelemetry.exporter.otlp.spill_queue import SpillQueue
+from opentelemetry.exporter.otlp.trace_exporter import OTLPSpanExporter
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceResponse,
+)
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
+    TraceServiceServicer,
+    add_TraceServiceServicer_to_server,
+)
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExportResult
+from opentelemetry.util import time_ns
+
+
+class TestSpillQueue(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _send_all(self, queue):
+        sent = []
+
+        def send(data):
+            sent.append(data)
+            return True
+
+        queue.send(send)
+        return sent
+
+    def test_send(self):
+        queue = SpillQueue(self.directory, segment_size_bytes=40)
+        for data in (b"first", b"second", b"third"):
+            self.assertTrue(queue.put(data))
+        self.assertEqual(len(queue), 2)
+
+        self.assertEqual(
+            self._send_all(queue), [b"first", b"second", b"third"]
+        )
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(queue.size_bytes, 0)
+        self.assertEqual(os.listdir(self.directory), [])
+        self.assertEqual(self._send_all(queue), [])
+
+    def test_send_failure(self):
+        queue = SpillQueue(self.directory)
+        for data in (b"first", b"second", b"third"):
+            queue.put(data)
+
+        sent = []
+
+        def send(data):
+            if data == b"second":
+                return False
+            sent.append(data)
+            return True
+
+        queue.send(send)
+        self.assertEqual(sent, [b"first"])
+        queue.put(b"fourth")
+
+        # sending resumes after the last sent request
+        self.assertEqual(
+            self._send_all(queue), [b"second", b"third", b"fourth"]
+        )
+
+    def test_max_send_requests(self):
+        queue = SpillQueue(
+            self.directory, segment_size_bytes=40, max_send_requests=2
+        )
+        for data in (b"first", b"second", b"third"):
+            queue.put(data)
+
+        # the remaining requests are sent by the next call
+        self.assertEqual(self._send_all(queue), [b"first", b"second"])
+        self.assertEqual(len(queue), 1)
+        self.assertEqual(self._send_all(queue), [b"third"])
+        self.assertEqual(len(queue), 0)
+
+    def test_max_size(self):
+        queue = SpillQueue(
+            self.directory, max_size_bytes=60, segment_size_bytes=30
+        )
+        for data in (b"first", b"second", b"third"):
+            self.assertTrue(queue.put(data))
+        with self.assertLogs(level="WARNING"):
+            self.assertTrue(queue.put(b"fourth"))
+        # the segment holding the oldest request was dropped
+        self.assertLessEqual(queue.size_bytes, 60)
+        self.assertEqual(
+            self._send_all(queue), [b"second", b"third", b"fourth"]
+        )
+
+        with self.assertLogs(level="WARNING"):
+            self.assertFalse(queue.put(b"x" * 60))
+
+    def test_put_while_sending(self):
+        queue = SpillQueue(
+            self.directory, max_size_bytes=60, segment_size_bytes=30
+        )
+        for data in (b"first", b"second", b"third"):
+            queue.put(data)
+
+        def send(data):
+            if data == b"second":
+                # drops the segment being sent
+                with self.assertLogs(level="WARNING"):
+                    queue.put(b"fourth")
+                    queue.put(b"fifth")
+                return False
+            return True
+
+        queue.send(send)
+        # pylint: disable=protected-access
+        self.assertEqual(queue._offsets, {})
+        self.assertEqual(
+            self._send_all(queue), [b"third", b"fourth", b"fifth"]
+        )
+
+    def test_ttl(self):
+        queue = SpillQueue(self.directory, ttl_millis=1000)
+        with patch(
+            "opentelemetry.exporter.otlp.spill_queue.time_ns",
+            return_value=time_ns() - int(2e9),
+        ):
+            queue.put(b"expired")
+        queue.put(b"recent")
+        self.assertEqual(self._send_all(queue), [b"recent"])
+
+        # segments last written before the ttl are not read
+        queue.put(b"expired")
+        queue.close()
+        (name,) = os.listdir(self.directory)
+        two_seconds_ago = time.time() - 2
+        os.utime(
+            os.path.join(self.directory, name),
+            (two_seconds_ago, two_seconds_ago),
+        )
+        self.assertEqual(self._send_all(queue), [])
+        self.assertEqual(len(queue), 0)
+
+    def test_recovery(self):
+        queue = SpillQueue(self.directory)
+        queue.put(b"first")
+        queue.put(b"second")
+        queue.close()
+        with open(
+            os.path.join(self.directory, os.listdir(self.directory)[0]), "ab"
+        ) as segment:
+            # a request being written when the process stopped
+            segment.write(struct.pack("<QI", time_ns(), 100) + b"x")
+
+        queue = SpillQueue(self.directory)
+        self.assertGreater(queue.size_bytes, 0)
+        queue.put(b"third")
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(
+                self._send_all(queue), [b"first", b"second", b"third"]
+            )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            SpillQueue(self.directory, max_size_bytes=0)
+        with self.assertRaises(ValueError):
+            SpillQueue(self.directory, ttl_millis=0)
+        with self.assertRaises(ValueError):
+            SpillQueue(
+                self.directory, max_size_bytes=10, segment_size_bytes=20
+            )
+        with self.assertRaises(ValueError):
+            SpillQueue(self.directory, max_send_requests=0)
+
+
+class RecordingTraceServiceServicer(TraceServiceServicer):
+    def __init__(self):
+        self.span_names = []
+
+    # pylint: disable=invalid-name,unused-argument
+    def Export(self, request, context):
+        for resource_spans in request.resource_spans:
+            for library_spans in resource_spans.instrumentation_library_spans:
+                self.span_names.extend(
+                    span.name for span in library_spans.spans
+                )
+        context.set_code(StatusCode.OK)
+
+        return ExportTraceServiceResponse()
+
+
+class TestOTLPSpanExporterSpillQueue(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.servicer = RecordingTraceServiceServicer()
+        self.server = None
+        self.port = self._start_server(0)
+        self.tracer = TracerProvider().get_tracer(__name__)
+
+    def tearDown(self):
+        if self.server is not None:
+            self.server.stop(None)
+
+    def _start_server(self, port):
+        self.server = server(ThreadPoolExecutor(max_workers=2))
+        add_TraceServiceServicer_to_server(self.servicer, self.server)
+        port = self.server.add_insecure_port("localhost:{}".format(port))
+        self.server.start()
+        return port
+
+    def _stop_server(self):
+        self.server.stop(None)
+        self.server = None
+
+    def _span(self, name):
+        span = self.tracer.start_span(name)
+        span.end()
+        return span
+
+    def test_collector_outage(self):
+        queue = SpillQueue(self.directory)
+        exporter = OTLPSpanExporter(
+            endpoint="localhost:{}".format(self.port),
+            insecure=True,
+            timeout=1,
+            spill_queue=queue,
+        )
+
+        self.assertEqual(
+            exporter.export([self._span("before")]), SpanExportResult.SUCCESS
+        )
+
+        self._stop_server()
+        start = time.time()
+        # spilled requests are reported as exported
+        self.assertEqual(
+            exporter.export([self._span("down_1")]), SpanExportResult.SUCCESS
+        )
+        self.assertEqual(
+            exporter.export([self._span("down_2")]), SpanExportResult.SUCCESS
+        )
+        # the export worker is not blocked while the collector is down
+        self.assertLess(time.time() - start, 5)
+        self.assertGreater(queue.size_bytes, 0)
+
+        self._start_server(self.port)
+        names = []
+        # the channel may wait before reconnecting, spilling more requests,
+        # then a few spilled requests are sent after each export
+        deadline = time.time() + 30
+        while queue.size_bytes > 0:
+            self.assertLess(time.time(), deadline)
+            names.append("after_{}".format(len(names)))
+            self.assertEqual(
+                exporter.export([self._span(names[-1])]),
+                SpanExportResult.SUCCESS,
+            )
+            time.sleep(0.1)
+
+        self.assertEqual(
+            sorted(self.servicer.span_names),
+            sorted(["before", "down_1", "down_2"] + names),
+        )
+        self.assertEqual(queue.size_bytes, 0)
+        exporter.shutdown()
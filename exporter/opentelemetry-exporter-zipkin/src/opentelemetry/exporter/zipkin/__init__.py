@@ -69,7 +69,11 @@ from urllib.parse import urlparse
 
 import requests
 
-from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export import (
+    SpanExporter,
+    SpanExportResult,
+    group_spans_by_resource,
+)
 from opentelemetry.trace import Span, SpanContext, SpanKind
 
 DEFAULT_RETRY = False
@@ -158,60 +162,74 @@ class ZipkinSpanExporter(SpanExporter):
             local_endpoint["ipv6"] = self.ipv6
 
         zipkin_spans = []
-        for span in spans:
-            context = span.get_span_context()
-            trace_id = context.trace_id
-            span_id = context.span_id
-
-            # Timestamp in zipkin spans is int of microseconds.
-            # see: https://zipkin.io/pages/instrumenting.html
-            start_timestamp_mus = _nsec_to_usec_round(span.start_time)
-            duration_mus = _nsec_to_usec_round(span.end_time - span.start_time)
-
-            zipkin_span = {
-                # Ensure left-zero-padding of traceId, spanId, parentId
-                "traceId": format(trace_id, "032x"),
-                "id": format(span_id, "016x"),
-                "name": span.name,
-                "timestamp": start_timestamp_mus,
-                "duration": duration_mus,
-                "localEndpoint": local_endpoint,
-                "kind": SPAN_KIND_MAP[span.kind],
-                "tags": self._extract_tags_from_span(span),
-                "annotations": self._extract_annotations_from_events(
-                    span.events
-                ),
-            }
-
-            if span.instrumentation_info is not None:
-                zipkin_span["tags"][
+        for resource, instrumentation_info, group in group_spans_by_resource(
+            spans
+        ):
+            # translated once and shared by all the spans of the group
+            resource_tags = {}
+            if resource:
+                resource_tags = self._extract_tags_from_dict(
+                    resource.attributes
+                )
+            if instrumentation_info is not None:
+                resource_tags[
                     "otel.instrumentation_library.name"
-                ] = span.instrumentation_info.name
-                zipkin_span["tags"][
+                ] = instrumentation_info.name
+                resource_tags[
                     "otel.instrumentation_library.version"
-                ] = span.instrumentation_info.version
+                ] = instrumentation_info.version
 
-            if span.status is not None:
-                zipkin_span["tags"]["otel.status_code"] = str(
-                    span.status.status_code.value
+            zipkin_spans.extend(
+                self._translate_span_to_zipkin(
+                    span, local_endpoint, resource_tags
                 )
-                if span.status.description is not None:
-                    zipkin_span["tags"][
-                        "otel.status_description"
-                    ] = span.status.description
+                for span in group
+            )
+        return zipkin_spans
 
-            if context.trace_flags.sampled:
-                zipkin_span["debug"] = True
+    def _translate_span_to_zipkin(self, span, local_endpoint, resource_tags):
+        context = span.get_span_context()
+        trace_id = context.trace_id
+        span_id = context.span_id
+
+        # Timestamp in zipkin spans is int of microseconds.
+        # see: https://zipkin.io/pages/instrumenting.html
+        start_timestamp_mus = _nsec_to_usec_round(span.start_time)
+        duration_mus = _nsec_to_usec_round(span.end_time - span.start_time)
+
+        zipkin_span = {
+            # Ensure left-zero-padding of traceId, spanId, parentId
+            "traceId": format(trace_id, "032x"),
+            "id": format(span_id, "016x"),
+            "name": span.name,
+            "timestamp": start_timestamp_mus,
+            "duration": duration_mus,
+            "localEndpoint": local_endpoint,
+            "kind": SPAN_KIND_MAP[span.kind],
+            "tags": self._extract_tags_from_span(span, resource_tags),
+            "annotations": self._extract_annotations_from_events(span.events),
+        }
+
+        if span.status is not None:
+            zipkin_span["tags"]["otel.status_code"] = str(
+                span.status.status_code.value
+            )
+            if span.status.description is not None:
+                zipkin_span["tags"][
+                    "otel.status_description"
+                ] = span.status.description
 
-            if isinstance(span.parent, Span):
-                zipkin_span["parentId"] = format(
-                    span.parent.get_span_context().span_id, "016x"
-                )
-            elif isinstance(span.parent, SpanContext):
-                zipkin_span["parentId"] = format(span.parent.span_id, "016x")
+        if context.trace_flags.sampled:
+            zipkin_span["debug"] = True
 
-            zipkin_spans.append(zipkin_span)
-        return zipkin_spans
+        if isinstance(span.parent, Span):
+            zipkin_span["parentId"] = format(
+                span.parent.get_span_context().span_id, "016x"
+            )
+        elif isinstance(span.parent, SpanContext):
+            zipkin_span["parentId"] = format(span.parent.span_id, "016x")
+
+        return zipkin_span
 
     def _extract_tags_from_dict(self, tags_dict):
         tags = {}
@@ -231,10 +249,9 @@ class ZipkinSpanExporter(SpanExporter):
             tags[attribute_key] = value
         return tags
 
-    def _extract_tags_from_span(self, span: Span):
+    def _extract_tags_from_span(self, span: Span, resource_tags):
         tags = self._extract_tags_from_dict(getattr(span, "attributes", None))
-        if span.resource:
-            tags.update(self._extract_tags_from_dict(span.resource.attributes))
+        tags.update(resource_tags)
         return tags
 
     def _extract_annotations_from_events(self, events):
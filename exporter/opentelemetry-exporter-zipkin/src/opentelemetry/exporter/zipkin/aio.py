@@ -0,0 +1,106 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Zipkin exporter for asyncio applications, sending the spans with `aiohttp`_
+from the event loop of the application. It requires the ``aio`` extra:
+``pip install opentelemetry-exporter-zipkin[aio]``.
+
+.. _aiohttp: https://docs.aiohttp.org/
+
+.. code:: python
+
+    import asyncio
+
+    from opentelemetry import trace
+    from opentelemetry.exporter.zipkin.aio import AsyncZipkinSpanExporter
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import AsyncBatchExportSpanProcessor
+
+    async def main():
+        span_processor = AsyncBatchExportSpanProcessor(
+            AsyncZipkinSpanExporter(service_name="my-helloworld-service")
+        )
+        trace.get_tracer_provider().add_span_processor(span_processor)
+
+        with trace.get_tracer(__name__).start_as_current_span("foo"):
+            print("Hello world!")
+
+        await span_processor.async_shutdown()
+
+    trace.set_tracer_provider(TracerProvider())
+    asyncio.get_event_loop().run_until_complete(main())
+"""
+
+import json
+import logging
+from typing import Optional, Sequence
+
+import aiohttp
+
+from opentelemetry.exporter.zipkin import (
+    SUCCESS_STATUS_CODES,
+    ZIPKIN_HEADERS,
+    ZipkinSpanExporter,
+)
+from opentelemetry.sdk.trace.export import (
+    AsyncSpanExporter,
+    Span,
+    SpanExportResult,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncZipkinSpanExporter(AsyncSpanExporter, ZipkinSpanExporter):
+    """Zipkin span exporter for `AsyncBatchExportSpanProcessor`.
+
+    Takes the same arguments as `ZipkinSpanExporter`, the spans are translated
+    the same way but sent with an `aiohttp.ClientSession`.
+
+    Args:
+        session: The session used to send the spans. One is created on the
+            first export and closed on shutdown if not given.
+    """
+
+    def __init__(
+        self, *args, session: Optional[aiohttp.ClientSession] = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self._session = session
+        self._owns_session = session is None
+
+    # pylint: disable=invalid-overridden-method
+    async def export(self, spans: Sequence[Span]) -> SpanExportResult:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+        zipkin_spans = self._translate_to_zipkin(spans)
+        async with self._session.post(
+            self.url, data=json.dumps(zipkin_spans), headers=ZIPKIN_HEADERS
+        ) as result:
+            if result.status not in SUCCESS_STATUS_CODES:
+                logger.error(
+                    "Traces cannot be uploaded; status code: %s, message %s",
+                    result.status,
+                    await result.text(),
+                )
+                return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    # pylint: disable=invalid-overridden-method
+    async def shutdown(self) -> None:
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
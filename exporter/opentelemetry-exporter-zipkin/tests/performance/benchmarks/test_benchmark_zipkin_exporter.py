@@ -0,0 +1,47 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from opentelemetry.exporter.zipkin import ZipkinSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+
+
+def _create_spans():
+    tracer_provider = TracerProvider(
+        resource=Resource(
+            {"service.name": "A123456789", "host.name": "host", "pid": 1234}
+        ),
+        shutdown_on_exit=False,
+    )
+    spans = []
+    for idx in range(512):
+        tracer = tracer_provider.get_tracer("tracer{}".format(idx % 4))
+        span = tracer.start_span(
+            "benchmarkedSpan",
+            attributes={
+                "http.method": "GET",
+                "http.url": "http://localhost/benchmark",
+                "http.status_code": 200,
+            },
+        )
+        span.end()
+        spans.append(span)
+    return spans
+
+
+def test_translate_to_zipkin(benchmark):
+    spans = _create_spans()
+    exporter = ZipkinSpanExporter("A123456789")
+    # pylint: disable=protected-access
+    benchmark(exporter._translate_to_zipkin, spans)
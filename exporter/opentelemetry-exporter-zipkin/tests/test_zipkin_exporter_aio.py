@@ -0,0 +1,98 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from opentelemetry.exporter.zipkin.aio import AsyncZipkinSpanExporter
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    AsyncBatchExportSpanProcessor,
+    SpanExportResult,
+)
+
+
+class TestAsyncZipkinSpanExporter(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.requests = []
+        self.status = 202
+
+        async def handle(request):
+            self.requests.append(await request.json())
+            return web.Response(status=self.status)
+
+        app = web.Application()
+        app.router.add_post("/api/v2/spans", handle)
+        self.server = TestServer(app)
+        self.loop.run_until_complete(self.server.start_server())
+        self.addCleanup(self.loop.run_until_complete, self.server.close())
+        self.url = str(self.server.make_url("/api/v2/spans"))
+
+    def test_export(self):
+        tracer = TracerProvider().get_tracer(__name__)
+        span = tracer.start_span("foo", attributes={"key": "value"})
+        span.end()
+        exporter = AsyncZipkinSpanExporter("my-service", url=self.url)
+
+        self.assertEqual(
+            self.loop.run_until_complete(exporter.export([span])),
+            SpanExportResult.SUCCESS,
+        )
+        self.loop.run_until_complete(exporter.shutdown())
+
+        # pylint: disable=protected-access
+        self.assertEqual(
+            self.requests,
+            [json.loads(json.dumps(exporter._translate_to_zipkin([span])))],
+        )
+        self.assertEqual(self.requests[0][0]["name"], "foo")
+        self.assertEqual(self.requests[0][0]["tags"]["key"], "value")
+
+    def test_export_failure(self):
+        self.status = 500
+        span = TracerProvider().get_tracer(__name__).start_span("foo")
+        span.end()
+        exporter = AsyncZipkinSpanExporter("my-service", url=self.url)
+
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(
+                self.loop.run_until_complete(exporter.export([span])),
+                SpanExportResult.FAILURE,
+            )
+        self.loop.run_until_complete(exporter.shutdown())
+
+    def test_batch_export(self):
+        span_processor = AsyncBatchExportSpanProcessor(
+            AsyncZipkinSpanExporter("my-service", url=self.url),
+            loop=self.loop,
+            max_export_batch_size=2,
+        )
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+        for name in ("foo", "bar", "baz"):
+            with tracer.start_as_current_span(name):
+                pass
+
+        span_processor.shutdown()
+        self.assertEqual(
+            sorted(span["name"] for spans in self.requests for span in spans),
+            ["bar", "baz", "foo"],
+        )
@@ -175,8 +175,7 @@ def create_trace_config(
                 if callable(trace_config_ctx.url_filter)
                 else str(params.url),
             }
-            for key, value in attributes.items():
-                trace_config_ctx.span.set_attribute(key, value)
+            trace_config_ctx.span.set_attributes(attributes)
 
         trace_config_ctx.token = context_api.attach(
             trace.set_span_in_context(trace_config_ctx.span)
@@ -157,6 +157,7 @@ class TestAioHttpIntegration(TestBase):
             self.assertFalse(mock_span.is_recording())
             self.assertTrue(mock_span.is_recording.called)
             self.assertFalse(mock_span.set_attribute.called)
+            self.assertFalse(mock_span.set_attributes.called)
             self.assertFalse(mock_span.set_status.called)
 
     def test_span_name_option(self):
@@ -261,6 +261,7 @@ class TestAiopgIntegration(TestBase):
         self.assertFalse(mock_span.is_recording())
         self.assertTrue(mock_span.is_recording.called)
         self.assertFalse(mock_span.set_attribute.called)
+        self.assertFalse(mock_span.set_attributes.called)
         self.assertFalse(mock_span.set_status.called)
 
     def test_span_failed(self):
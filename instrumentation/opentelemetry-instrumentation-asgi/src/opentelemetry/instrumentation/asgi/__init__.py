@@ -174,8 +174,7 @@ class OpenTelemetryMiddleware:
                 if span.is_recording():
                     attributes = collect_request_attributes(scope)
                     attributes.update(additional_attributes)
-                    for key, value in attributes.items():
-                        span.set_attribute(key, value)
+                    span.set_attributes(attributes)
 
                 @wraps(receive)
                 async def wrapped_receive():
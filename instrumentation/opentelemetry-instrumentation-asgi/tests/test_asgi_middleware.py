@@ -179,6 +179,7 @@ class TestAsgiApplication(AsgiTestBase):
             self.assertFalse(mock_span.is_recording())
             self.assertTrue(mock_span.is_recording.called)
             self.assertFalse(mock_span.set_attribute.called)
+            self.assertFalse(mock_span.set_attributes.called)
             self.assertFalse(mock_span.set_status.called)
 
     def test_asgi_exc_info(self):
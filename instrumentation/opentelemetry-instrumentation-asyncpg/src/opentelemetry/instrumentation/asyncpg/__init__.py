@@ -115,8 +115,7 @@ class AsyncPGInstrumentor(BaseInstrumentor):
                     args[0],
                     args[1:] if self.capture_parameters else None,
                 )
-                for attribute, value in span_attributes.items():
-                    span.set_attribute(attribute, value)
+                span.set_attributes(span_attributes)
 
             try:
                 result = await func(*args, **kwargs)
@@ -154,8 +154,7 @@ class BotoInstrumentor(BaseInstrumentor):
                 if region_name:
                     meta["aws.region"] = region_name
 
-                for key, value in meta.items():
-                    span.set_attribute(key, value)
+                span.set_attributes(meta)
 
                 span.set_attribute(
                     "http.status_code", getattr(result, "status")
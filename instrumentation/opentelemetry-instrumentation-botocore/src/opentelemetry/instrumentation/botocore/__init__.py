@@ -127,8 +127,7 @@ class BotocoreInstrumentor(BaseInstrumentor):
                     "aws.operation": operation,
                     "aws.region": region_name,
                 }
-                for key, value in meta.items():
-                    span.set_attribute(key, value)
+                span.set_attributes(meta)
 
             result = original_func(*args, **kwargs)
 
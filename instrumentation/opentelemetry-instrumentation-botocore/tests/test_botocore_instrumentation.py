@@ -92,6 +92,7 @@ class TestBotocoreInstrumentor(TestBase):
             self.assertFalse(mock_span.is_recording())
             self.assertTrue(mock_span.is_recording.called)
             self.assertFalse(mock_span.set_attribute.called)
+            self.assertFalse(mock_span.set_attributes.called)
             self.assertFalse(mock_span.set_status.called)
 
     @mock_ec2
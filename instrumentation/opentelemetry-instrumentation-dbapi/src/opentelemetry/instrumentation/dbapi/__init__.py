@@ -314,21 +314,17 @@ class TracedCursor:
         if not span.is_recording():
             return
         statement = args[0] if args else ""
-        span.set_attribute(
-            "component", self._db_api_integration.database_component
-        )
-        span.set_attribute("db.type", self._db_api_integration.database_type)
-        span.set_attribute("db.instance", self._db_api_integration.database)
-        span.set_attribute("db.statement", statement)
-
-        for (
-            attribute_key,
-            attribute_value,
-        ) in self._db_api_integration.span_attributes.items():
-            span.set_attribute(attribute_key, attribute_value)
+        attributes = {
+            "component": self._db_api_integration.database_component,
+            "db.type": self._db_api_integration.database_type,
+            "db.instance": self._db_api_integration.database,
+            "db.statement": statement,
+        }
+        attributes.update(self._db_api_integration.span_attributes)
 
         if len(args) > 1:
-            span.set_attribute("db.statement.parameters", str(args[1]))
+            attributes["db.statement.parameters"] = str(args[1])
+        span.set_attributes(attributes)
 
     def traced_execution(
         self,
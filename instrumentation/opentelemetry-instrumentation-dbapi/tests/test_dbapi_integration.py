@@ -98,6 +98,7 @@ class TestDBApiIntegration(TestBase):
         self.assertFalse(mock_span.is_recording())
         self.assertTrue(mock_span.is_recording.called)
         self.assertFalse(mock_span.set_attribute.called)
+        self.assertFalse(mock_span.set_attributes.called)
         self.assertFalse(mock_span.set_status.called)
 
     def test_span_failed(self):
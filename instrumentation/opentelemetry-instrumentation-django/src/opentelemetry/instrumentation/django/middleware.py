@@ -147,8 +147,7 @@ class _DjangoMiddleware(MiddlewareMixin):
             attributes = extract_attributes_from_object(
                 request, self._traced_request_attrs, attributes
             )
-            for key, value in attributes.items():
-                span.set_attribute(key, value)
+            span.set_attributes(attributes)
 
         activation = tracer.use_span(span, end_on_exit=True)
         activation.__enter__()
@@ -156,6 +156,7 @@ class TestMiddleware(TestBase, WsgiTestBase):
             self.assertFalse(mock_span.is_recording())
             self.assertTrue(mock_span.is_recording.called)
             self.assertFalse(mock_span.set_attribute.called)
+            self.assertFalse(mock_span.set_attributes.called)
             self.assertFalse(mock_span.set_status.called)
 
     def test_traced_post(self):
@@ -142,8 +142,7 @@ def _wrap_perform_request(tracer, span_name_prefix):
                     attributes["db.statement"] = str(body)
                 if params:
                     attributes["elasticsearch.params"] = str(params)
-                for key, value in attributes.items():
-                    span.set_attribute(key, value)
+                span.set_attributes(attributes)
             try:
                 rv = wrapped(*args, **kwargs)
                 if isinstance(rv, dict) and span.is_recording():
@@ -124,8 +124,7 @@ class _InstrumentedFalconAPI(falcon.API):
         )
         if span.is_recording():
             attributes = otel_wsgi.collect_request_attributes(env)
-            for key, value in attributes.items():
-                span.set_attribute(key, value)
+            span.set_attributes(attributes)
 
         activation = self._tracer.use_span(span, end_on_exit=True)
         activation.__enter__()
@@ -171,8 +170,7 @@ class _TraceMiddleware:
         attributes = extract_attributes_from_object(
             req, self._traced_request_attrs
         )
-        for key, value in attributes.items():
-            span.set_attribute(key, value)
+        span.set_attributes(attributes)
 
     def process_resource(self, req, resp, resource, params):
         span = req.env.get(_ENVIRON_SPAN_KEY)
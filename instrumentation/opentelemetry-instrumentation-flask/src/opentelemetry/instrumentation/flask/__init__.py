@@ -134,8 +134,7 @@ def _before_request():
             # For 404 that result from no route found, etc, we
             # don't have a url_rule.
             attributes["http.route"] = flask.request.url_rule.rule
-        for key, value in attributes.items():
-            span.set_attribute(key, value)
+        span.set_attributes(attributes)
 
     activation = tracer.use_span(span, end_on_exit=True)
     activation.__enter__()
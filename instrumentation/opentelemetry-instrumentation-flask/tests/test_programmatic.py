@@ -119,6 +119,7 @@ class TestProgrammatic(InstrumentationTest, TestBase, WsgiTestBase):
             self.assertFalse(mock_span.is_recording())
             self.assertTrue(mock_span.is_recording.called)
             self.assertFalse(mock_span.set_attribute.called)
+            self.assertFalse(mock_span.set_attributes.called)
             self.assertFalse(mock_span.set_status.called)
 
     def test_404(self):
@@ -89,13 +89,6 @@ COMMANDS = [
 ]
 
 
-def _set_connection_attributes(span, instance):
-    if not span.is_recording():
-        return
-    for key, value in _get_address_attributes(instance).items():
-        span.set_attribute(key, value)
-
-
 def _with_tracer_wrapper(func):
     """Helper for providing tracer for wrapper functions."""
 
@@ -125,9 +118,9 @@ def _wrap_cmd(tracer, cmd, wrapped, instance, args, kwargs):
                     vals = _get_query_string(args[0])
 
                 query = "{}{}{}".format(cmd, " " if vals else "", vals)
-                span.set_attribute(_RAWCMD, query)
-
-                _set_connection_attributes(span, instance)
+                attributes = _get_address_attributes(instance)
+                attributes[_RAWCMD] = query
+                span.set_attributes(attributes)
         except Exception as ex:  # pylint: disable=broad-except
             logger.warning(
                 "Failed to set attributes for pymemcache span %s", str(ex)
@@ -104,6 +104,7 @@ class TestPymongo(TestBase):
         self.assertFalse(mock_span.is_recording())
         self.assertTrue(mock_span.is_recording.called)
         self.assertFalse(mock_span.set_attribute.called)
+        self.assertFalse(mock_span.set_attributes.called)
         self.assertFalse(mock_span.set_status.called)
 
     def test_failed(self):
@@ -87,8 +87,7 @@ def _before_traversal(event):
         attributes = otel_wsgi.collect_request_attributes(environ)
         if request.matched_route:
             attributes["http.route"] = request.matched_route.pattern
-        for key, value in attributes.items():
-            span.set_attribute(key, value)
+        span.set_attributes(attributes)
 
     activation = tracer.use_span(span, end_on_exit=True)
     activation.__enter__()
@@ -138,9 +138,13 @@ def _instrument(tracer_provider=None, span_callback=None):
             exception = None
             with recorder.record_client_duration(labels):
                 if span.is_recording():
-                    span.set_attribute("component", "http")
-                    span.set_attribute("http.method", method)
-                    span.set_attribute("http.url", url)
+                    span.set_attributes(
+                        {
+                            "component": "http",
+                            "http.method": method,
+                            "http.url": url,
+                        }
+                    )
 
                 headers = get_or_create_headers()
                 propagators.inject(type(headers).__setitem__, headers)
@@ -163,10 +167,12 @@ def _instrument(tracer_provider=None, span_callback=None):
 
                 if result is not None:
                     if span.is_recording():
-                        span.set_attribute(
-                            "http.status_code", result.status_code
+                        span.set_attributes(
+                            {
+                                "http.status_code": result.status_code,
+                                "http.status_text": result.reason,
+                            }
                         )
-                        span.set_attribute("http.status_text", result.reason)
                         span.set_status(
                             Status(
                                 http_status_to_status_code(result.status_code)
@@ -224,8 +224,7 @@ def _start_span(tracer, handler, start_time) -> _TraceContext:
     )
     if span.is_recording():
         attributes = _get_attributes_from_request(handler.request)
-        for key, value in attributes.items():
-            span.set_attribute(key, value)
+        span.set_attributes(attributes)
 
     activation = tracer.use_span(span, end_on_exit=True)
     activation.__enter__()
@@ -47,8 +47,7 @@ def fetch_async(tracer, func, _, args, kwargs):
             "http.url": request.url,
             "http.method": request.method,
         }
-        for key, value in attributes.items():
-            span.set_attribute(key, value)
+        span.set_attributes(attributes)
 
     with tracer.use_span(span):
         propagators.inject(type(request.headers).__setitem__, request.headers)
@@ -34,7 +34,8 @@ def get_all(
     """
     baggage = get_value(_BAGGAGE_KEY, context=context)
     if isinstance(baggage, dict):
-        return MappingProxyType(baggage.copy())
+        # the baggage dicts are never modified once set in a context
+        return MappingProxyType(baggage)
     return MappingProxyType({})
 
 
@@ -68,8 +69,17 @@ def set_baggage(
     Returns:
         A Context with the value updated
     """
-    baggage = dict(get_all(context=context))
-    baggage[name] = value
+    return _set_entries({name: value}, context=context)
+
+
+def _set_entries(
+    entries: typing.Mapping[str, object],
+    context: typing.Optional[Context] = None,
+) -> Context:
+    """Sets several values in the Baggage, copying it only once."""
+    baggage = get_value(_BAGGAGE_KEY, context=context)
+    baggage = dict(baggage) if isinstance(baggage, dict) else {}
+    baggage.update(entries)
     return set_value(_BAGGAGE_KEY, baggage, context=context)
 
 
@@ -85,7 +95,8 @@ def remove_baggage(
     Returns:
         A Context with the name/value removed
     """
-    baggage = dict(get_all(context=context))
+    baggage = get_value(_BAGGAGE_KEY, context=context)
+    baggage = dict(baggage) if isinstance(baggage, dict) else {}
     baggage.pop(name, None)
 
     return set_value(_BAGGAGE_KEY, baggage, context=context)
@@ -16,6 +16,7 @@ import typing
 import urllib.parse
 
 from opentelemetry import baggage
+from opentelemetry.baggage import _set_entries
 from opentelemetry.context import get_current
 from opentelemetry.context.context import Context
 from opentelemetry.trace.propagation import textmap
@@ -50,24 +51,21 @@ class BaggagePropagator(textmap.TextMapPropagator):
             return context
 
         baggage_entries = header.split(",")
-        total_baggage_entries = self.MAX_PAIRS
-        for entry in baggage_entries:
-            if total_baggage_entries <= 0:
-                return context
-            total_baggage_entries -= 1
+        entries = {}  # type: typing.Dict[str, object]
+        for entry in baggage_entries[: self.MAX_PAIRS]:
             if len(entry) > self.MAX_PAIR_LENGTH:
                 continue
             try:
                 name, value = entry.split("=", 1)
             except Exception:  # pylint: disable=broad-except
                 continue
-            context = baggage.set_baggage(
-                urllib.parse.unquote(name).strip(),
-                urllib.parse.unquote(value).strip(),
-                context=context,
-            )
+            name = urllib.parse.unquote(name).strip()
+            entries[name] = urllib.parse.unquote(value).strip()
 
-        return context
+        if not entries:
+            return context
+        # the baggage and the context are copied once for all the entries
+        return _set_entries(entries, context=context)
 
     def inject(
         self,
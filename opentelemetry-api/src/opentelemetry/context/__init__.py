@@ -98,11 +98,29 @@ def set_value(
     Returns:
         A new `Context` containing the value set.
     """
+    return set_values({key: value}, context=context)
+
+
+def set_values(
+    values: typing.Mapping[str, "object"],
+    context: typing.Optional[Context] = None,
+) -> Context:
+    """Returns an updated context containing all the given values, like
+    successive calls to `set_value` but copying the context only once.
+
+    Args:
+        values: The keys and values of the entries to set.
+        context: The context to copy, if None, the current context is used.
+
+    Returns:
+        A new `Context` containing the values set.
+    """
     if context is None:
         context = get_current()
-    new_values = context.copy()
-    new_values[key] = value
-    return Context(new_values)
+    new_context = Context(context)
+    # Context forbids setting items, the new context is not shared yet
+    dict.update(new_context, values)
+    return new_context
 
 
 @_load_runtime_context  # type: ignore
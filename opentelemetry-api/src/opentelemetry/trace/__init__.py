@@ -81,7 +81,11 @@ from contextlib import contextmanager
 from logging import getLogger
 
 from opentelemetry.context.context import Context
-from opentelemetry.trace.ids_generator import IdsGenerator, RandomIdsGenerator
+from opentelemetry.trace.ids_generator import (
+    BufferedRandomIdsGenerator,
+    IdsGenerator,
+    RandomIdsGenerator,
+)
 from opentelemetry.trace.propagation import (
     get_current_span,
     set_span_in_context,
@@ -451,6 +455,7 @@ def get_tracer_provider() -> TracerProvider:
 
 
 __all__ = [
+    "BufferedRandomIdsGenerator",
     "DEFAULT_TRACE_OPTIONS",
     "DEFAULT_TRACE_STATE",
     "IdsGenerator",
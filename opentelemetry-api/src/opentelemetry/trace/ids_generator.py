@@ -13,7 +13,12 @@
 # limitations under the License.
 
 import abc
+import os
 import random
+import struct
+import threading
+import typing
+import weakref
 
 
 class IdsGenerator(abc.ABC):
@@ -50,3 +55,73 @@ class RandomIdsGenerator(IdsGenerator):
 
     def generate_trace_id(self) -> int:
         return random.getrandbits(128)
+
+
+class _IdsBuffer(threading.local):
+    def __init__(self) -> None:
+        super().__init__()
+        self.ids = iter(())  # type: typing.Iterator[int]
+        self.pid = os.getpid()
+
+
+class BufferedRandomIdsGenerator(IdsGenerator):
+    """IDs generator drawing IDs from random bytes read in bulk from
+    `os.urandom`.
+
+    Each thread takes IDs from its own buffer, which is refilled with a single
+    `os.urandom` call once exhausted. Buffers are discarded in child processes
+    after `os.fork`, so that a parent and its children never hand out the same
+    IDs. Unlike `RandomIdsGenerator`, the generated IDs do not depend on the
+    state of the `random` module, which applications may seed
+    deterministically.
+
+    Args:
+        buffer_size: The number of 64-bit IDs generated at once per thread.
+    """
+
+    def __init__(self, buffer_size: int = 1024):
+        if buffer_size <= 0:
+            raise ValueError("buffer_size must be a positive integer.")
+        self._format = "<{}Q".format(buffer_size)
+        self._num_bytes = 8 * buffer_size
+        self._buffer = _IdsBuffer()
+        _BUFFERED_GENERATORS.add(self)
+
+    def _next_id(self) -> int:
+        buffer = self._buffer
+        if _RESET_AFTER_FORK or buffer.pid == os.getpid():
+            id_ = next(buffer.ids, None)
+            if id_ is not None:
+                return id_
+        # the buffer is exhausted or was filled by the parent process
+        buffer.pid = os.getpid()
+        buffer.ids = iter(
+            struct.unpack(self._format, os.urandom(self._num_bytes))
+        )
+        return next(buffer.ids)
+
+    def generate_span_id(self) -> int:
+        return self._next_id()
+
+    def generate_trace_id(self) -> int:
+        return self._next_id() << 64 | self._next_id()
+
+
+_BUFFERED_GENERATORS = (
+    weakref.WeakSet()
+)  # type: weakref.WeakSet[BufferedRandomIdsGenerator]
+
+
+def _reset_after_fork() -> None:
+    for generator in _BUFFERED_GENERATORS:
+        # pylint: disable=protected-access
+        generator._buffer = _IdsBuffer()
+
+
+# os.register_at_fork is only available from Python 3.7 on, older versions
+# compare the process id whenever an ID is generated instead.
+_RESET_AFTER_FORK = hasattr(os, "register_at_fork")
+if _RESET_AFTER_FORK:
+    os.register_at_fork(  # pylint: disable=no-member
+        after_in_child=_reset_after_fork
+    )
@@ -12,6 +12,8 @@ _logger = logging.getLogger(__name__)
 class Span(abc.ABC):
     """A span represents a single operation within a trace."""
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def end(self, end_time: typing.Optional[int] = None) -> None:
         """Sets the current time as the span's end time.
@@ -40,6 +42,18 @@ class Span(abc.ABC):
         Sets a single Attribute with the key and value passed as arguments.
         """
 
+    def set_attributes(
+        self, attributes: typing.Mapping[str, types.AttributeValue]
+    ) -> None:
+        """Sets Attributes.
+
+        Sets all the Attributes in the given mapping, as if `set_attribute`
+        was called for each of them. Implementations should override this to
+        set them in one go.
+        """
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
     @abc.abstractmethod
     def add_event(
         self,
@@ -234,6 +248,8 @@ class DefaultSpan(Span):
     All operations are no-op except context propagation.
     """
 
+    __slots__ = ("_context",)
+
     def __init__(self, context: "SpanContext") -> None:
         self._context = context
 
@@ -249,6 +265,11 @@ class DefaultSpan(Span):
     def set_attribute(self, key: str, value: types.AttributeValue) -> None:
         pass
 
+    def set_attributes(
+        self, attributes: typing.Mapping[str, types.AttributeValue]
+    ) -> None:
+        pass
+
     def add_event(
         self,
         name: str,
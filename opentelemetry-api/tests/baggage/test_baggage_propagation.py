@@ -109,6 +109,21 @@ class TestBaggagePropagation(unittest.TestCase):
         expected = {"key1": "value1", "key3": "value3"}
         self.assertEqual(self._extract(header), expected)
 
+    def test_extract_merges_baggage(self):
+        ctx = baggage.set_baggage("key1", "val0")
+        ctx = baggage.set_baggage("key3", "val3", context=ctx)
+        header = {"baggage": ["key1=val1,key2=val2,key2=val4"]}
+        extracted = self.propagator.extract(
+            carrier_getter, header, context=ctx
+        )
+        self.assertEqual(
+            baggage.get_all(context=extracted),
+            {"key1": "val1", "key2": "val4", "key3": "val3"},
+        )
+        self.assertEqual(
+            baggage.get_all(context=ctx), {"key1": "val0", "key3": "val3"}
+        )
+
     def test_inject_no_baggage_entries(self):
         values = {}
         output = self._inject(values)
@@ -49,6 +49,16 @@ class TestContext(unittest.TestCase):
         self.assertEqual("---", context.get_value("a", context=third))
         self.assertEqual(None, context.get_value("a"))
 
+    def test_set_values(self):
+        first = context.set_value("a", "yyy")
+        second = context.set_values({"a": "zzz", "b": "---"}, first)
+        self.assertEqual(second, {"a": "zzz", "b": "---"})
+        self.assertIsInstance(second, Context)
+        self.assertEqual(first, {"a": "yyy"})
+        self.assertEqual(context.set_values({}, first), first)
+        self.assertIsNot(context.set_values({}, first), first)
+        self.assertEqual(context.set_values({"c": 1}), {"c": 1})
+
     def test_context_is_immutable(self):
         with self.assertRaises(ValueError):
             # ensure a context
@@ -0,0 +1,56 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from opentelemetry import baggage, context
+from opentelemetry.baggage.propagation import BaggagePropagator
+from opentelemetry.trace.propagation.textmap import DictGetter
+
+
+@pytest.mark.parametrize("depth", [10, 100])
+def test_nested_set_value(benchmark, depth):
+    def attach_nested_contexts():
+        tokens = []
+        for level in range(depth):
+            tokens.append(context.attach(context.set_value("level", level)))
+            context.get_value("level")
+        for token in reversed(tokens):
+            context.detach(token)
+
+    benchmark(attach_nested_contexts)
+
+
+def test_set_values(benchmark):
+    values = {"key{}".format(idx): idx for idx in range(10)}
+    benchmark(context.set_values, values)
+
+
+@pytest.mark.parametrize("num_entries", [5, 50])
+def test_baggage_extract(benchmark, num_entries):
+    propagator = BaggagePropagator()
+    carrier = {
+        "baggage": [
+            ",".join(
+                "key{0}=value{0}".format(idx) for idx in range(num_entries)
+            )
+        ]
+    }
+    getter = DictGetter()
+
+    def extract():
+        return propagator.extract(getter, carrier)
+
+    result = benchmark(extract)
+    assert len(baggage.get_all(context=result)) == num_entries
@@ -0,0 +1,88 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+import unittest
+
+from opentelemetry.trace.ids_generator import BufferedRandomIdsGenerator
+
+
+class TestBufferedRandomIdsGenerator(unittest.TestCase):
+    def test_ids(self):
+        ids_generator = BufferedRandomIdsGenerator(buffer_size=4)
+        span_ids = {ids_generator.generate_span_id() for _ in range(100)}
+        trace_ids = {ids_generator.generate_trace_id() for _ in range(100)}
+
+        self.assertEqual(len(span_ids), 100)
+        self.assertEqual(len(trace_ids), 100)
+        for span_id in span_ids:
+            self.assertLess(span_id, 1 << 64)
+        for trace_id in trace_ids:
+            self.assertLess(trace_id, 1 << 128)
+        # the upper half of trace IDs is random as well
+        self.assertGreater(max(trace_ids), 1 << 64)
+
+    def test_invalid_buffer_size(self):
+        with self.assertRaises(ValueError):
+            BufferedRandomIdsGenerator(buffer_size=0)
+
+    def test_threads(self):
+        ids_generator = BufferedRandomIdsGenerator(buffer_size=16)
+        thread_ids = []
+
+        def generate_ids():
+            thread_ids.append(
+                [ids_generator.generate_span_id() for _ in range(100)]
+            )
+
+        threads = [threading.Thread(target=generate_ids) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        span_ids = {span_id for ids in thread_ids for span_id in ids}
+        self.assertEqual(len(span_ids), 400)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_fork(self):
+        ids_generator = BufferedRandomIdsGenerator()
+        # fill the buffer of this thread before forking
+        ids_generator.generate_span_id()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(read_fd)
+                span_ids = [
+                    ids_generator.generate_span_id() for _ in range(10)
+                ]
+                os.write(write_fd, " ".join(map(str, span_ids)).encode())
+                os.close(write_fd)
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+
+        os.close(write_fd)
+        with os.fdopen(read_fd) as read_file:
+            child_span_ids = [
+                int(span_id) for span_id in read_file.read().split()
+            ]
+        os.waitpid(pid, 0)
+        span_ids = [ids_generator.generate_span_id() for _ in range(10)]
+
+        # without discarding the buffer the child would repeat the parent's IDs
+        self.assertEqual(len(child_span_ids), 10)
+        self.assertFalse(set(child_span_ids) & set(span_ids))
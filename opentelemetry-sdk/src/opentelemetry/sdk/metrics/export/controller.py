@@ -13,10 +13,12 @@
 # limitations under the License.
 
 import threading
+from typing import Optional
 
 from opentelemetry.context import attach, detach, set_value
 from opentelemetry.metrics import Meter
 from opentelemetry.sdk.metrics.export import MetricsExporter
+from opentelemetry.sdk.util import _register_at_fork_reinit
 
 
 class PushController(threading.Thread):
@@ -36,12 +38,38 @@ class PushController(threading.Thread):
     def __init__(
         self, meter: Meter, exporter: MetricsExporter, interval: float
     ):
+        # the thread running the controller in a forked child process
+        self._child_thread = None  # type: Optional[threading.Thread]
         super().__init__()
         self.meter = meter
         self.exporter = exporter
         self.interval = interval
         self.finished = threading.Event()
         self.start()
+        _register_at_fork_reinit(self)
+
+    def _at_fork_reinit(self):
+        """Restarts the controller in a child process after a fork."""
+        if self.finished.is_set():
+            return
+        self.finished = threading.Event()
+        # the thread of the parent does not exist in the child and this one
+        # cannot be started again
+        self._child_thread = threading.Thread(
+            target=self.run, name=self.name, daemon=True
+        )
+        self._child_thread.start()
+
+    def is_alive(self):
+        if self._child_thread is not None:
+            return self._child_thread.is_alive()
+        return super().is_alive()
+
+    def join(self, timeout=None):
+        if self._child_thread is not None:
+            self._child_thread.join(timeout)
+            return
+        super().join(timeout)
 
     def run(self):
         while not self.finished.wait(self.interval):
@@ -18,7 +18,10 @@ import atexit
 import concurrent.futures
 import json
 import logging
+import os
+import sys
 import threading
+import time
 import traceback
 from collections import OrderedDict
 from contextlib import contextmanager
@@ -26,7 +29,11 @@ from types import MappingProxyType, TracebackType
 from typing import (
     Any,
     Callable,
+    Dict,
+    Iterable,
     Iterator,
+    List,
+    Mapping,
     MutableSequence,
     Optional,
     Sequence,
@@ -35,8 +42,11 @@ from typing import (
     Union,
 )
 
+from pkg_resources import iter_entry_points
+
 from opentelemetry import context as context_api
 from opentelemetry import trace as trace_api
+from opentelemetry.configuration import Configuration
 from opentelemetry.sdk import util
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import sampling
@@ -56,8 +66,54 @@ logger = logging.getLogger(__name__)
 MAX_NUM_ATTRIBUTES = 1000
 MAX_NUM_EVENTS = 1000
 MAX_NUM_LINKS = 1000
+# The number of tracers cached by each TracerProvider
+MAX_NUM_TRACERS = 1024
 VALID_ATTR_VALUE_TYPES = (bool, str, int, float)
 
+# Spans share a fixed pool of locks, picked by object address, instead of
+# allocating one each. A span's lock is only held for short, non-reentrant
+# sections, so collisions between spans mapped to the same lock are cheap.
+_SPAN_LOCK_POOL_SIZE = 64
+_SPAN_LOCKS = tuple(threading.Lock() for _ in range(_SPAN_LOCK_POOL_SIZE))
+
+
+def _reinit_span_locks() -> None:
+    # A lock held by another thread when forking stays locked forever in the
+    # child, replace them all for the spans the child creates.
+    global _SPAN_LOCKS  # pylint: disable=global-statement
+    _SPAN_LOCKS = tuple(threading.Lock() for _ in range(_SPAN_LOCK_POOL_SIZE))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_span_locks)
+
+# Placeholders used until the first attribute, event or link is written, so
+# that spans which never record any of them don't allocate containers.
+_EMPTY_ATTRIBUTES = MappingProxyType({})  # type: types.Attributes
+_EMPTY_SEQUENCE = ()  # type: Sequence
+
+
+def _unreferenced_refcount() -> Optional[int]:
+    """Returns the reference count of an object only referenced by a local
+    variable, as counted by `sys.getrefcount` in `SpanPool.acquire`, or
+    `None` if the interpreter does not count references.
+    """
+    if not hasattr(sys, "getrefcount"):
+        return None
+    objects = [object()]
+    obj = objects.pop()
+    return sys.getrefcount(obj)
+
+
+_UNREFERENCED_REFCOUNT = _unreferenced_refcount()
+
+# json.dumps creates a new encoder whenever it is passed any options.
+_JSON_LINE_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# TraceFlags are immutable, so every span context shares these.
+_DEFAULT_TRACE_FLAGS = trace_api.TraceFlags(trace_api.TraceFlags.DEFAULT)
+_SAMPLED_TRACE_FLAGS = trace_api.TraceFlags(trace_api.TraceFlags.SAMPLED)
+
 
 class SpanProcessor:
     """Interface which allows hooks for SDK's `Span` start and end method
@@ -260,6 +316,8 @@ class ConcurrentMultiSpanProcessor(SpanProcessor):
 
 
 class EventBase(abc.ABC):
+    __slots__ = ("_name", "_timestamp")
+
     def __init__(self, name: str, timestamp: Optional[int] = None) -> None:
         self._name = name
         if timestamp is None:
@@ -291,6 +349,8 @@ class Event(EventBase):
             automatically.
     """
 
+    __slots__ = ("_attributes",)
+
     def __init__(
         self,
         name: str,
@@ -305,6 +365,48 @@ class Event(EventBase):
         return self._attributes
 
 
+class _ExceptionEvent(EventBase):
+    """An exception event whose stacktrace is formatted only once its
+    attributes are read.
+
+    Args:
+        exception: The recorded exception.
+        stacktrace_limit: The maximum number of stack frames to include, or
+            `None` to include all of them.
+    """
+
+    __slots__ = ("_type", "_message", "_traceback", "_attributes")
+
+    def __init__(
+        self, exception: BaseException, stacktrace_limit: Optional[int]
+    ) -> None:
+        super().__init__("exception")
+        self._type = exception.__class__.__name__
+        self._message = str(exception)
+        # Only captures file names, line numbers and function names; frames
+        # are not kept alive and source lines are looked up when formatting.
+        self._traceback = traceback.TracebackException(
+            type(exception),
+            exception,
+            exception.__traceback__,
+            limit=stacktrace_limit,
+            lookup_lines=False,
+        )
+        self._attributes = None  # type: Optional[types.Attributes]
+
+    @property
+    def attributes(self) -> types.Attributes:
+        if self._attributes is None:
+            self._attributes = MappingProxyType(
+                {
+                    "exception.type": self._type,
+                    "exception.message": self._message,
+                    "exception.stacktrace": "".join(self._traceback.format()),
+                }
+            )
+        return self._attributes
+
+
 def _is_valid_attribute_value(value: types.AttributeValue) -> bool:
     """Checks if attribute value is valid.
 
@@ -314,6 +416,11 @@ def _is_valid_attribute_value(value: types.AttributeValue) -> bool:
       - are not a sequence
     """
 
+    # Most values are plain scalars, check those first. This also avoids
+    # walking str values character by character as sequences below.
+    if type(value) in VALID_ATTR_VALUE_TYPES:
+        return True
+
     if isinstance(value, Sequence):
         if len(value) == 0:
             return True
@@ -357,9 +464,38 @@ def _is_valid_attribute_value(value: types.AttributeValue) -> bool:
     return True
 
 
+def _clean_attribute(
+    key: str, value: types.AttributeValue
+) -> Optional[types.AttributeValue]:
+    """Validates an attribute and returns the value to store for it, or `None`
+    if the attribute must be dropped."""
+    is_scalar = type(value) in VALID_ATTR_VALUE_TYPES
+    if not is_scalar and not _is_valid_attribute_value(value):
+        return None
+
+    if not key:
+        logger.warning("invalid key (empty or null)")
+        return None
+
+    if is_scalar:
+        return value
+    # Freeze mutable sequences defensively
+    if isinstance(value, MutableSequence):
+        return tuple(value)
+    if isinstance(value, bytes):
+        try:
+            return value.decode()
+        except ValueError:
+            logger.warning("Byte attribute could not be decoded.")
+            return None
+    return value
+
+
 def _filter_attribute_values(attributes: types.Attributes):
     if attributes:
         for attr_key, attr_value in list(attributes.items()):
+            if type(attr_value) in VALID_ATTR_VALUE_TYPES:
+                continue
             if _is_valid_attribute_value(attr_value):
                 if isinstance(attr_value, MutableSequence):
                     attributes[attr_key] = tuple(attr_value)
@@ -371,14 +507,37 @@ def _create_immutable_attributes(attributes):
     return MappingProxyType(attributes.copy() if attributes else {})
 
 
+def _synchronized(func):
+    """Runs the decorated span method under the span's lock, unless the span
+    is owned by the calling thread (see `Span._owned_by_current_thread`)."""
+
+    def wrapper(self, *args, **kwargs):
+        # pylint: disable=protected-access
+        if self._owner is not None and self._owned_by_current_thread():
+            # another thread taking over the span waits for this write to
+            # complete, unless it took over before the write was announced
+            self._writing = True
+            try:
+                if self._owner is not None:
+                    return func(self, *args, **kwargs)
+            finally:
+                self._writing = False
+        with self._lock:
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
 def _check_span_ended(func):
+    @_synchronized
+    def call_if_not_ended(self, *args, **kwargs):
+        if self.end_time is None:
+            func(self, *args, **kwargs)
+            return False
+        return True
+
     def wrapper(self, *args, **kwargs):
-        already_ended = False
-        with self._lock:  # pylint: disable=protected-access
-            if self.end_time is None:
-                func(self, *args, **kwargs)
-            else:
-                already_ended = True
+        already_ended = call_if_not_ended(self, *args, **kwargs)
 
         if already_ended:
             logger.warning("Tried calling %s on an ended span.", func.__name__)
@@ -405,8 +564,41 @@ class Span(trace_api.Span):
         links: Links to other spans to be exported
         span_processor: `SpanProcessor` to invoke when starting and ending
             this `Span`.
+        single_writer: Whether this span is owned by the thread creating it,
+            see `TracerProvider`.
+        span_pool: The `SpanPool` this span is returned to once exported.
+        lazy_exception_stacktraces: Whether `record_exception` formats
+            stacktraces only when they are read, see `TracerProvider`.
+        exception_stacktrace_limit: The maximum number of stack frames
+            recorded by `record_exception`, or `None` for no limit.
     """
 
+    __slots__ = (
+        "name",
+        "context",
+        "parent",
+        "sampler",
+        "trace_config",
+        "resource",
+        "kind",
+        "_set_status_on_exception",
+        "span_processor",
+        "status",
+        "_lock",
+        "_owner",
+        "_writing",
+        "attributes",
+        "events",
+        "links",
+        "_end_time",
+        "_start_time",
+        "instrumentation_info",
+        "_pool",
+        "_pending_releases",
+        "_lazy_exception_stacktraces",
+        "_exception_stacktrace_limit",
+    )
+
     def __new__(cls, *args, **kwargs):
         if cls is Span:
             raise TypeError("Span must be instantiated via a tracer.")
@@ -427,6 +619,10 @@ class Span(trace_api.Span):
         span_processor: SpanProcessor = SpanProcessor(),
         instrumentation_info: InstrumentationInfo = None,
         set_status_on_exception: bool = True,
+        single_writer: bool = False,
+        span_pool: Optional["SpanPool"] = None,
+        lazy_exception_stacktraces: bool = False,
+        exception_stacktrace_limit: Optional[int] = None,
     ) -> None:
 
         self.name = name
@@ -440,18 +636,23 @@ class Span(trace_api.Span):
 
         self.span_processor = span_processor
         self.status = Status(StatusCode.UNSET)
-        self._lock = threading.Lock()
+        self._lock = _SPAN_LOCKS[(id(self) >> 4) % _SPAN_LOCK_POOL_SIZE]
+        self._owner = threading.get_ident() if single_writer else None
+        # whether the owner is mutating the span without locking
+        self._writing = False
+        thread_safe = not single_writer
 
         _filter_attribute_values(attributes)
         if not attributes:
-            self.attributes = self._new_attributes()
+            self.attributes = _EMPTY_ATTRIBUTES
         else:
             self.attributes = BoundedDict.from_map(
-                MAX_NUM_ATTRIBUTES, attributes
+                MAX_NUM_ATTRIBUTES, attributes, thread_safe=thread_safe
             )
 
-        self.events = self._new_events()
+        self.events = _EMPTY_SEQUENCE
         if events:
+            self.events = self._new_events(thread_safe)
             for event in events:
                 _filter_attribute_values(event.attributes)
                 # pylint: disable=protected-access
@@ -460,14 +661,21 @@ class Span(trace_api.Span):
                 )
                 self.events.append(event)
 
-        if links is None:
-            self.links = self._new_links()
+        if links:
+            self.links = BoundedList.from_seq(
+                MAX_NUM_LINKS, links, thread_safe=thread_safe
+            )
         else:
-            self.links = BoundedList.from_seq(MAX_NUM_LINKS, links)
+            self.links = _EMPTY_SEQUENCE
 
         self._end_time = None  # type: Optional[int]
         self._start_time = None  # type: Optional[int]
         self.instrumentation_info = instrumentation_info
+        self._pool = span_pool
+        # the number of span processors yet to release the ended span
+        self._pending_releases = 0
+        self._lazy_exception_stacktraces = lazy_exception_stacktraces
+        self._exception_stacktrace_limit = exception_stacktrace_limit
 
     @property
     def start_time(self):
@@ -483,16 +691,37 @@ class Span(trace_api.Span):
         )
 
     @staticmethod
-    def _new_attributes():
-        return BoundedDict(MAX_NUM_ATTRIBUTES)
+    def _new_attributes(thread_safe: bool = True):
+        return BoundedDict(MAX_NUM_ATTRIBUTES, thread_safe=thread_safe)
 
     @staticmethod
-    def _new_events():
-        return BoundedList(MAX_NUM_EVENTS)
+    def _new_events(thread_safe: bool = True):
+        return BoundedList(MAX_NUM_EVENTS, thread_safe=thread_safe)
 
     @staticmethod
-    def _new_links():
-        return BoundedList(MAX_NUM_LINKS)
+    def _new_links(thread_safe: bool = True):
+        return BoundedList(MAX_NUM_LINKS, thread_safe=thread_safe)
+
+    def _owned_by_current_thread(self) -> bool:
+        """Returns whether this span may be mutated without locking.
+
+        A single-writer span is mutated without locking as long as it is only
+        touched by the thread that created it. The first mutation from any
+        other thread makes the span fall back to locking for the rest of its
+        lifetime, once the mutation of the owner that may be in progress at
+        that moment completed.
+        """
+        owner = self._owner
+        if owner is None:
+            return False
+        if owner == threading.get_ident():
+            return True
+        self._owner = None
+        # the owner announces its writes before checking that it still owns
+        # the span, so either it sees that it does not or it is seen here
+        while self._writing:
+            time.sleep(0)
+        return False
 
     @staticmethod
     def _format_context(context):
@@ -571,35 +800,105 @@ class Span(trace_api.Span):
 
         return json.dumps(f_span, indent=indent)
 
+    @staticmethod
+    def _compact_context(context):
+        return {
+            "trace_id": trace_api.format_trace_id(context.trace_id),
+            "span_id": trace_api.format_span_id(context.span_id),
+            "trace_state": repr(context.trace_state),
+        }
+
+    def to_json_line(self) -> str:
+        """Returns a compact, single-line JSON representation of this span.
+
+        It has the same fields as `to_json`, but timestamps are integers in
+        nanoseconds since the epoch instead of ISO 8601 strings.
+        """
+        parent_id = None
+        if self.parent is not None:
+            if isinstance(self.parent, Span):
+                parent_id = trace_api.format_span_id(
+                    self.parent.context.span_id
+                )
+            elif isinstance(self.parent, SpanContext):
+                parent_id = trace_api.format_span_id(self.parent.span_id)
+
+        f_span = {
+            "name": self.name,
+            "context": self._compact_context(self.context),
+            "kind": str(self.kind),
+            "parent_id": parent_id,
+            "start_time": self._start_time,
+            "end_time": self._end_time,
+        }
+        if self.status is not None:
+            status = {"status_code": self.status.status_code.name}
+            if self.status.description:
+                status["description"] = self.status.description
+            f_span["status"] = status
+        f_span["attributes"] = self._format_attributes(self.attributes)
+        f_span["events"] = [
+            {
+                "name": event.name,
+                "timestamp": event.timestamp,
+                "attributes": self._format_attributes(event.attributes),
+            }
+            for event in self.events
+        ]
+        f_span["links"] = [
+            {
+                "context": self._compact_context(link.context),
+                "attributes": self._format_attributes(link.attributes),
+            }
+            for link in self.links
+        ]
+        f_span["resource"] = self.resource.attributes
+
+        return _JSON_LINE_ENCODER.encode(f_span)
+
     def get_span_context(self):
         return self.context
 
     def set_attribute(self, key: str, value: types.AttributeValue) -> None:
-        if not _is_valid_attribute_value(value):
+        value = _clean_attribute(key, value)
+        if value is not None:
+            self._set_attribute(key, value)
+
+    @_synchronized
+    def _set_attribute(self, key: str, value: types.AttributeValue) -> None:
+        if self.end_time is not None:
+            logger.warning("Setting attribute on ended span.")
             return
+        if self.attributes is _EMPTY_ATTRIBUTES:
+            self.attributes = self._new_attributes(self._owner is None)
+        self.attributes[key] = value
 
-        if not key:
-            logger.warning("invalid key (empty or null)")
+    def set_attributes(
+        self, attributes: Mapping[str, types.AttributeValue]
+    ) -> None:
+        valid_attributes = []
+        for key, value in attributes.items():
+            value = _clean_attribute(key, value)
+            if value is not None:
+                valid_attributes.append((key, value))
+        if valid_attributes:
+            self._set_attributes(valid_attributes)
+
+    @_synchronized
+    def _set_attributes(
+        self, attributes: Sequence[Tuple[str, types.AttributeValue]]
+    ) -> None:
+        if self.end_time is not None:
+            logger.warning("Setting attribute on ended span.")
             return
-
-        with self._lock:
-            if self.end_time is not None:
-                logger.warning("Setting attribute on ended span.")
-                return
-
-            # Freeze mutable sequences defensively
-            if isinstance(value, MutableSequence):
-                value = tuple(value)
-            if isinstance(value, bytes):
-                try:
-                    value = value.decode()
-                except ValueError:
-                    logger.warning("Byte attribute could not be decoded.")
-                    return
-            self.attributes[key] = value
+        if self.attributes is _EMPTY_ATTRIBUTES:
+            self.attributes = self._new_attributes(self._owner is None)
+        self.attributes.update(attributes)
 
     @_check_span_ended
     def _add_event(self, event: EventBase) -> None:
+        if self.events is _EMPTY_SEQUENCE:
+            self.events = self._new_events(self._owner is None)
         self.events.append(event)
 
     def add_event(
@@ -623,27 +922,40 @@ class Span(trace_api.Span):
         start_time: Optional[int] = None,
         parent_context: Optional[context_api.Context] = None,
     ) -> None:
-        with self._lock:
-            if self.start_time is not None:
-                logger.warning("Calling start() on a started span.")
-                return
-            self._start_time = (
-                start_time if start_time is not None else time_ns()
-            )
+        if self._set_start_time(start_time):
+            self.span_processor.on_start(self, parent_context=parent_context)
 
-        self.span_processor.on_start(self, parent_context=parent_context)
+    @_synchronized
+    def _set_start_time(self, start_time: Optional[int]) -> bool:
+        if self.start_time is not None:
+            logger.warning("Calling start() on a started span.")
+            return False
+        self._start_time = start_time if start_time is not None else time_ns()
+        return True
 
     def end(self, end_time: Optional[int] = None) -> None:
-        with self._lock:
-            if self.start_time is None:
-                raise RuntimeError("Calling end() on a not started span.")
-            if self.end_time is not None:
-                logger.warning("Calling end() on an ended span.")
-                return
-
-            self._end_time = end_time if end_time is not None else time_ns()
-
-        self.span_processor.on_end(self)
+        if self._set_end_time(end_time):
+            if self._pool is not None:
+                # each span processor hands the span back to the pool with
+                # SpanPool.release once it is done with it
+                self._pending_releases = len(
+                    getattr(
+                        self.span_processor,
+                        "_span_processors",
+                        (self.span_processor,),
+                    )
+                )
+            self.span_processor.on_end(self)
+
+    @_synchronized
+    def _set_end_time(self, end_time: Optional[int]) -> bool:
+        if self.start_time is None:
+            raise RuntimeError("Calling end() on a not started span.")
+        if self.end_time is not None:
+            logger.warning("Calling end() on an ended span.")
+            return False
+        self._end_time = end_time if end_time is not None else time_ns()
+        return True
 
     @_check_span_ended
     def update_name(self, name: str) -> None:
@@ -682,8 +994,15 @@ class Span(trace_api.Span):
 
     def record_exception(self, exception: Exception) -> None:
         """Records an exception as a span event."""
+        if self._lazy_exception_stacktraces:
+            self._add_event(
+                _ExceptionEvent(exception, self._exception_stacktrace_limit)
+            )
+            return
         try:
-            stacktrace = traceback.format_exc()
+            stacktrace = traceback.format_exc(
+                limit=self._exception_stacktrace_limit
+            )
         except Exception:  # pylint: disable=broad-except
             # workaround for python 3.4, format_exc can raise
             # an AttributeError if the __context__ on
@@ -706,6 +1025,79 @@ class _Span(Span):
     This constructor should only be used internally.
     """
 
+    __slots__ = ()
+
+
+class SpanPool:
+    """A pool of ended spans that are reused for new spans.
+
+    Pass a `SpanPool` as ``span_pool`` to `TracerProvider` to enable it.
+    Ending a span hands it over to the span processors of the provider, each
+    of which hands it back with `SpanPool.release` once done with it, as
+    `opentelemetry.sdk.trace.export.BatchExportSpanProcessor` does after
+    exporting every batch. The span is recycled once all the span processors
+    released it, so it is never recycled if a span processor does not
+    release spans.
+
+    A released span is only reused if nothing else references it anymore,
+    spans kept by the application or by an exporter after they were released
+    are dropped from the pool instead, so that they are never changed by the
+    span they would be reused for. Spans are never reused on interpreters
+    without `sys.getrefcount`.
+
+    Args:
+        max_size: The maximum number of idle spans kept in the pool.
+    """
+
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        self._spans = []  # type: List[_Span]
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def acquire(self) -> Optional[_Span]:
+        """Returns an idle span from the pool, or `None` if it is empty.
+
+        The span must be reinitialized before being used.
+        """
+        while True:
+            try:
+                span = self._spans.pop()
+            except IndexError:
+                return None
+            # a span still referenced elsewhere is left to the garbage
+            # collector, reusing it would expose the new span through the
+            # stale reference
+            if sys.getrefcount(span) <= _UNREFERENCED_REFCOUNT:
+                return span
+
+    def _put(self, span: _Span) -> None:
+        if _UNREFERENCED_REFCOUNT is None or len(self._spans) >= self.max_size:
+            return
+        self._spans.append(span)
+
+    @staticmethod
+    def release(spans: Iterable[Span]) -> None:
+        """Hands spans that a span processor is done with back to the pools
+        they were created from.
+
+        Spans that did not come from a pool are ignored, ``spans`` is not
+        modified.
+        """
+        # pylint: disable=protected-access
+        for span in spans:
+            pool = span._pool
+            if pool is None:
+                continue
+            with span._lock:
+                pending = span._pending_releases
+                if pending <= 0:
+                    continue
+                span._pending_releases = pending - 1
+            if pending == 1:
+                pool._put(span)
+
 
 class Tracer(trace_api.Tracer):
     """See `opentelemetry.trace.Tracer`.
@@ -720,12 +1112,20 @@ class Tracer(trace_api.Tracer):
         ],
         ids_generator: trace_api.IdsGenerator,
         instrumentation_info: InstrumentationInfo,
+        single_writer_spans: bool = False,
+        span_pool: Optional["SpanPool"] = None,
+        lazy_exception_stacktraces: bool = False,
+        exception_stacktrace_limit: Optional[int] = None,
     ) -> None:
         self.sampler = sampler
         self.resource = resource
         self.span_processor = span_processor
         self.ids_generator = ids_generator
         self.instrumentation_info = instrumentation_info
+        self.single_writer_spans = single_writer_spans
+        self.span_pool = span_pool
+        self.lazy_exception_stacktraces = lazy_exception_stacktraces
+        self.exception_stacktrace_limit = exception_stacktrace_limit
 
     def start_as_current_span(
         self,
@@ -782,39 +1182,53 @@ class Tracer(trace_api.Tracer):
         sampling_result = self.sampler.should_sample(
             context, trace_id, name, attributes, links,
         )
+        decision = sampling_result.decision
+
+        # Non-recording spans only propagate their context, keep their path as
+        # short as possible.
+        if not decision.is_recording():
+            return trace_api.DefaultSpan(
+                context=trace_api.SpanContext(
+                    trace_id,
+                    self.ids_generator.generate_span_id(),
+                    is_remote=False,
+                    trace_flags=_DEFAULT_TRACE_FLAGS,
+                    trace_state=trace_state,
+                )
+            )
 
-        trace_flags = (
-            trace_api.TraceFlags(trace_api.TraceFlags.SAMPLED)
-            if sampling_result.decision.is_sampled()
-            else trace_api.TraceFlags(trace_api.TraceFlags.DEFAULT)
-        )
         span_context = trace_api.SpanContext(
             trace_id,
             self.ids_generator.generate_span_id(),
             is_remote=False,
-            trace_flags=trace_flags,
+            trace_flags=_SAMPLED_TRACE_FLAGS
+            if decision.is_sampled()
+            else _DEFAULT_TRACE_FLAGS,
             trace_state=trace_state,
         )
-
-        # Only record if is_recording() is true
-        if sampling_result.decision.is_recording():
-            # pylint:disable=protected-access
-            span = _Span(
-                name=name,
-                context=span_context,
-                parent=parent_span_context,
-                sampler=self.sampler,
-                resource=self.resource,
-                attributes=sampling_result.attributes.copy(),
-                span_processor=self.span_processor,
-                kind=kind,
-                links=links,
-                instrumentation_info=self.instrumentation_info,
-                set_status_on_exception=set_status_on_exception,
-            )
-            span.start(start_time=start_time, parent_context=context)
-        else:
-            span = trace_api.DefaultSpan(context=span_context)
+        span = None
+        if self.span_pool is not None:
+            span = self.span_pool.acquire()
+        if span is None:
+            span = _Span.__new__(_Span)
+        span.__init__(
+            name=name,
+            context=span_context,
+            parent=parent_span_context,
+            sampler=self.sampler,
+            resource=self.resource,
+            attributes=sampling_result.attributes.copy(),
+            span_processor=self.span_processor,
+            kind=kind,
+            links=links,
+            instrumentation_info=self.instrumentation_info,
+            set_status_on_exception=set_status_on_exception,
+            single_writer=self.single_writer_spans,
+            span_pool=self.span_pool,
+            lazy_exception_stacktraces=self.lazy_exception_stacktraces,
+            exception_stacktrace_limit=self.exception_stacktrace_limit,
+        )
+        span.start(start_time=start_time, parent_context=context)
         return span
 
     @contextmanager
@@ -862,7 +1276,48 @@ class Tracer(trace_api.Tracer):
                 span.end()
 
 
+def _load_ids_generator() -> trace_api.IdsGenerator:
+    name = Configuration().get("IDS_GENERATOR", None)
+    if name is None:
+        return trace_api.RandomIdsGenerator()
+    try:
+        return next(
+            iter_entry_points("opentelemetry_ids_generator", name)
+        ).load()()
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Failed to load configured IDs generator %s", name)
+        raise
+
+
 class TracerProvider(trace_api.TracerProvider):
+    """See `opentelemetry.trace.TracerProvider`.
+
+    Args:
+        sampler: The sampler deciding which spans are recorded and sampled.
+        resource: Entity producing telemetry, shared by all spans.
+        shutdown_on_exit: Whether to shut down the provider when the
+            interpreter exits.
+        active_span_processor: The span processor all span processors added
+            with `add_span_processor` are registered with.
+        ids_generator: Generator of trace and span IDs. Defaults to the
+            ``opentelemetry_ids_generator`` entry point named by the
+            ``OTEL_PYTHON_IDS_GENERATOR`` environment variable, or to
+            `opentelemetry.trace.RandomIdsGenerator` if it is not set.
+        single_writer_spans: If `True`, spans are owned by the thread that
+            starts them and are mutated without locking by that thread. A span
+            touched from another thread falls back to locking from then on.
+            Enable this if spans are mostly mutated by the thread (or asyncio
+            task) that created them.
+        span_pool: If set, spans are taken from and recycled into this
+            `SpanPool`, see its documentation.
+        lazy_exception_stacktraces: If `True`, `Span.record_exception` only
+            captures the frames of the exception and formats the
+            ``exception.stacktrace`` attribute once it is read, e.g. by an
+            exporter.
+        exception_stacktrace_limit: The maximum number of stack frames
+            recorded by `Span.record_exception`, or `None` for no limit.
+    """
+
     def __init__(
         self,
         sampler: sampling.Sampler = sampling.DEFAULT_ON,
@@ -872,16 +1327,29 @@ class TracerProvider(trace_api.TracerProvider):
             SynchronousMultiSpanProcessor, ConcurrentMultiSpanProcessor
         ] = None,
         ids_generator: trace_api.IdsGenerator = None,
+        single_writer_spans: bool = False,
+        span_pool: Optional["SpanPool"] = None,
+        lazy_exception_stacktraces: bool = False,
+        exception_stacktrace_limit: Optional[int] = None,
     ):
         self._active_span_processor = (
             active_span_processor or SynchronousMultiSpanProcessor()
         )
         if ids_generator is None:
-            self.ids_generator = trace_api.RandomIdsGenerator()
+            self.ids_generator = _load_ids_generator()
         else:
             self.ids_generator = ids_generator
         self.resource = resource
         self.sampler = sampler
+        self.single_writer_spans = single_writer_spans
+        self.span_pool = span_pool
+        self.lazy_exception_stacktraces = lazy_exception_stacktraces
+        self.exception_stacktrace_limit = exception_stacktrace_limit
+        # Tracers are cached by name and version, so that instrumentations
+        # calling get_tracer per request share them and their
+        # InstrumentationInfo.
+        self._tracers = {}  # type: Dict[Tuple[str, str], Tracer]
+        self._tracers_lock = threading.Lock()
         self._atexit_handler = None
         if shutdown_on_exit:
             self._atexit_handler = atexit.register(self.shutdown)
@@ -894,15 +1362,32 @@ class TracerProvider(trace_api.TracerProvider):
         if not instrumenting_module_name:  # Reject empty strings too.
             instrumenting_module_name = "ERROR:MISSING MODULE NAME"
             logger.error("get_tracer called with missing module name.")
-        return Tracer(
-            self.sampler,
-            self.resource,
-            self._active_span_processor,
-            self.ids_generator,
-            InstrumentationInfo(
-                instrumenting_module_name, instrumenting_library_version
-            ),
-        )
+
+        key = (instrumenting_module_name, instrumenting_library_version)
+        tracer = self._tracers.get(key)
+        if tracer is not None:
+            return tracer
+        with self._tracers_lock:
+            tracer = self._tracers.get(key)
+            if tracer is None:
+                tracer = Tracer(
+                    self.sampler,
+                    self.resource,
+                    self._active_span_processor,
+                    self.ids_generator,
+                    InstrumentationInfo(
+                        instrumenting_module_name,
+                        instrumenting_library_version,
+                    ),
+                    single_writer_spans=self.single_writer_spans,
+                    span_pool=self.span_pool,
+                    lazy_exception_stacktraces=self.lazy_exception_stacktraces,
+                    exception_stacktrace_limit=self.exception_stacktrace_limit,
+                )
+                if len(self._tracers) >= MAX_NUM_TRACERS:
+                    del self._tracers[next(iter(self._tracers))]
+                self._tracers[key] = tracer
+        return tracer
 
     def add_span_processor(self, span_processor: SpanProcessor) -> None:
         """Registers a new :class:`SpanProcessor` for this `TracerProvider`.
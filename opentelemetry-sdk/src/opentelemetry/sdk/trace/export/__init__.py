@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import collections
+import concurrent.futures
 import logging
 import os
 import sys
@@ -22,7 +24,10 @@ from enum import Enum
 
 from opentelemetry.configuration import Configuration
 from opentelemetry.context import Context, attach, detach, set_value
-from opentelemetry.sdk.trace import Span, SpanProcessor
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import Span, SpanPool, SpanProcessor
+from opentelemetry.sdk.util import _register_at_fork_reinit
+from opentelemetry.sdk.util.instrumentation import InstrumentationInfo
 from opentelemetry.util import time_ns
 
 logger = logging.getLogger(__name__)
@@ -33,6 +38,19 @@ class SpanExportResult(Enum):
     FAILURE = 1
 
 
+class QueueOverflowPolicy(Enum):
+    """What `BatchExportSpanProcessor` does with spans ending while its queue
+    is full."""
+
+    #: Drop the oldest queued span to make room for the new one.
+    DROP_OLDEST = 0
+    #: Drop the span that just ended.
+    DROP_NEWEST = 1
+    #: Block the thread ending the span until there is room in the queue,
+    #: dropping the span if that takes longer than the configured timeout.
+    BLOCK = 2
+
+
 class SpanExporter:
     """Interface for exporting spans.
 
@@ -60,6 +78,88 @@ class SpanExporter:
         """
 
 
+class AsyncSpanExporter:
+    """Interface for exporting spans from an asyncio event loop.
+
+    Like `SpanExporter`, but `export` and `shutdown` are coroutines so that
+    exporting does not block the event loop. To export data this MUST be
+    registered to the :class`opentelemetry.sdk.trace.Tracer` using an
+    `AsyncBatchExportSpanProcessor`.
+    """
+
+    async def export(self, spans: typing.Sequence[Span]) -> "SpanExportResult":
+        """Exports a batch of telemetry data.
+
+        Args:
+            spans: The list of `opentelemetry.trace.Span` objects to be exported
+
+        Returns:
+            The result of the export
+        """
+
+    async def shutdown(self) -> None:
+        """Shuts down the exporter.
+
+        Called when the SDK is shut down.
+        """
+
+
+class _SpanCounts:
+    """The spans ended by one thread that a `BatchExportSpanProcessor`
+    enqueued or dropped, only written by that thread."""
+
+    __slots__ = ("enqueued", "rejected", "evicted")
+
+    def __init__(self):
+        self.enqueued = 0
+        # spans not enqueued because of the overflow policy or a shutdown
+        self.rejected = 0
+        # spans evicted from the queue by QueueOverflowPolicy.DROP_OLDEST
+        self.evicted = 0
+
+    def add(self, other: "_SpanCounts") -> None:
+        self.enqueued += other.enqueued
+        self.rejected += other.rejected
+        self.evicted += other.evicted
+
+
+SpanGroup = typing.Tuple[
+    Resource, typing.Optional[InstrumentationInfo], typing.List[Span]
+]
+
+
+def group_spans_by_resource(
+    spans: typing.Sequence[Span],
+) -> typing.List[SpanGroup]:
+    """Groups spans by resource and instrumentation info.
+
+    Exporters use it to translate the resource and instrumentation info of a
+    batch once per group rather than once per span. Spans of the tracers of a
+    `opentelemetry.sdk.trace.TracerProvider` share the same resource and
+    spans of a tracer the same instrumentation info, so they are grouped by
+    identity, which does not require hashing the resource attributes.
+
+    Args:
+        spans: The spans to group.
+
+    Returns:
+        ``(resource, instrumentation_info, spans)`` tuples, in the order each
+        group first appears in ``spans``.
+    """
+    groups = {}  # type: typing.Dict[typing.Tuple[int, int], SpanGroup]
+    for span in spans:
+        key = (id(span.resource), id(span.instrumentation_info))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = (
+                span.resource,
+                span.instrumentation_info,
+                [],
+            )
+        group[2].append(span)
+    return list(groups.values())
+
+
 class SimpleExportSpanProcessor(SpanProcessor):
     """Simple SpanProcessor implementation.
 
@@ -109,6 +209,19 @@ class BatchExportSpanProcessor(SpanProcessor):
 
     BatchExportSpanProcessor is an implementation of `SpanProcessor` that
     batches ended spans and pushes them to the configured `SpanExporter`.
+
+    Batches are exported one after the other by default. With
+    ``max_export_workers`` greater than 1, up to that many batches are
+    exported concurrently on a pool of export threads, which raises the
+    throughput for exporters with a high latency per call. Only raise it for
+    exporters supporting concurrent calls to `SpanExporter.export`, such as
+    the OTLP span exporter; most exporters, e.g. the Jaeger one, keep state
+    shared between calls.
+
+    What happens to spans ending while the queue is full is decided by
+    ``overflow_policy``, see `QueueOverflowPolicy`. The number of spans
+    enqueued, dropped, exported and failed to export are available as
+    `spans_enqueued`, `spans_dropped`, `spans_exported` and `spans_failed`.
     """
 
     def __init__(
@@ -118,6 +231,9 @@ class BatchExportSpanProcessor(SpanProcessor):
         schedule_delay_millis: float = None,
         max_export_batch_size: int = None,
         export_timeout_millis: float = None,
+        max_export_workers: int = None,
+        overflow_policy: QueueOverflowPolicy = QueueOverflowPolicy.DROP_OLDEST,
+        block_timeout_millis: float = None,
     ):
 
         if max_queue_size is None:
@@ -138,6 +254,11 @@ class BatchExportSpanProcessor(SpanProcessor):
                 "BSP_EXPORT_TIMEOUT_MILLIS", 30000
             )
 
+        if max_export_workers is None:
+            max_export_workers = Configuration().get(
+                "BSP_MAX_EXPORT_WORKERS", 1
+            )
+
         if max_queue_size <= 0:
             raise ValueError("max_queue_size must be a positive integer.")
 
@@ -154,47 +275,206 @@ class BatchExportSpanProcessor(SpanProcessor):
                 "max_export_batch_size must be less than or equal to max_queue_size."
             )
 
+        if max_export_workers <= 0:
+            raise ValueError("max_export_workers must be a positive integer.")
+
+        if block_timeout_millis is None:
+            block_timeout_millis = export_timeout_millis
+
         self.span_exporter = span_exporter
-        self.queue = collections.deque(
-            [], max_queue_size
-        )  # type: typing.Deque[Span]
+        # not bounded by maxlen, so that every dropped span is counted, the
+        # overflow policy keeps its size around max_queue_size
+        self.queue = collections.deque()  # type: typing.Deque[Span]
         self.worker_thread = threading.Thread(target=self.worker, daemon=True)
-        self.condition = threading.Condition(threading.Lock())
+        condition_lock = threading.Lock()
+        self.condition = threading.Condition(condition_lock)
+        # notified when spans are taken from the queue
+        self._queue_not_full = threading.Condition(condition_lock)
         self._flush_request = None  # type: typing.Optional[_FlushRequest]
+        # whether the worker is waiting for a batch, guarded by condition
+        self._worker_waiting = False
         self.schedule_delay_millis = schedule_delay_millis
         self.max_export_batch_size = max_export_batch_size
         self.max_queue_size = max_queue_size
         self.export_timeout_millis = export_timeout_millis
+        self.max_export_workers = max_export_workers
+        self.overflow_policy = overflow_policy
+        self.block_timeout_millis = block_timeout_millis
+        self._export_executor = None
+        if max_export_workers > 1:
+            self._export_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_export_workers
+            )
+        # one slot per export worker, held while a batch is being exported
+        self._export_slots = threading.BoundedSemaphore(max_export_workers)
         self.done = False
         # flag that indicates that spans are being dropped
         self._spans_dropped = False
+        self._init_span_counts()
+        self._export_stats_lock = threading.Lock()
+        self._spans_exported = 0
+        self._spans_failed = 0
         # precallocated list to send spans to exporter
         self.spans_list = [
             None
         ] * self.max_export_batch_size  # type: typing.List[typing.Optional[Span]]
         self.worker_thread.start()
+        _register_at_fork_reinit(self)
+
+    def _at_fork_reinit(self) -> None:
+        """Resets the state inherited from the parent process after a fork
+        and starts a new worker thread in the child.
+
+        The spans queued in the parent are left for the parent to export.
+        """
+        if self.done:
+            return
+        condition_lock = threading.Lock()
+        self.condition = threading.Condition(condition_lock)
+        self._queue_not_full = threading.Condition(condition_lock)
+        self.queue.clear()
+        self._flush_request = None
+        self._worker_waiting = False
+        if self._export_executor is not None:
+            # the threads of the parent's executor do not exist in the child
+            self._export_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_export_workers
+            )
+        self._export_slots = threading.BoundedSemaphore(
+            self.max_export_workers
+        )
+        self._spans_dropped = False
+        self._init_span_counts()
+        self._export_stats_lock = threading.Lock()
+        self._spans_exported = 0
+        self._spans_failed = 0
+        self.spans_list = [None] * self.max_export_batch_size
+        self.worker_thread = threading.Thread(target=self.worker, daemon=True)
+        self.worker_thread.start()
 
     def on_start(
         self, span: Span, parent_context: typing.Optional[Context] = None
     ) -> None:
         pass
 
+    def _init_span_counts(self) -> None:
+        # each thread ending spans counts them in its own _SpanCounts, so
+        # that on_end does not need a lock
+        self._local_counts = threading.local()
+        self._span_counts_lock = threading.Lock()
+        self._thread_span_counts = (
+            []
+        )  # type: typing.List[typing.Tuple[threading.Thread, _SpanCounts]]
+        # the counts of the threads that exited
+        self._exited_span_counts = _SpanCounts()
+
+    def _get_span_counts(self) -> _SpanCounts:
+        try:
+            return self._local_counts.counts
+        except AttributeError:
+            pass
+        counts = _SpanCounts()
+        with self._span_counts_lock:
+            # fold the counts of the threads that exited, so that short lived
+            # threads do not pile up
+            thread_span_counts = []
+            for thread, thread_counts in self._thread_span_counts:
+                if thread.is_alive():
+                    thread_span_counts.append((thread, thread_counts))
+                else:
+                    self._exited_span_counts.add(thread_counts)
+            thread_span_counts.append((threading.current_thread(), counts))
+            self._thread_span_counts = thread_span_counts
+        self._local_counts.counts = counts
+        return counts
+
+    def _sum_span_counts(self) -> _SpanCounts:
+        total = _SpanCounts()
+        with self._span_counts_lock:
+            total.add(self._exited_span_counts)
+            for _, counts in self._thread_span_counts:
+                total.add(counts)
+        return total
+
+    @property
+    def spans_enqueued(self) -> int:
+        """The number of spans added to the export queue."""
+        return self._sum_span_counts().enqueued
+
+    @property
+    def spans_dropped(self) -> int:
+        """The number of sampled spans that ended but were never exported
+        because the queue was full or the processor was shut down.
+        """
+        counts = self._sum_span_counts()
+        return counts.rejected + counts.evicted
+
+    @property
+    def spans_exported(self) -> int:
+        """The number of spans successfully handed to the exporter."""
+        return self._spans_exported
+
+    @property
+    def spans_failed(self) -> int:
+        """The number of spans in batches the exporter failed to export."""
+        return self._spans_failed
+
     def on_end(self, span: Span) -> None:
         if self.done:
             logger.warning("Already shutdown, dropping span.")
+            self._get_span_counts().rejected += 1
             return
         if not span.context.trace_flags.sampled:
             return
-        if len(self.queue) == self.max_queue_size:
-            if not self._spans_dropped:
-                logger.warning("Queue is full, likely spans will be dropped.")
-                self._spans_dropped = True
+        counts = self._get_span_counts()
+        if len(self.queue) >= self.max_queue_size and not self._make_room(
+            counts
+        ):
+            counts.rejected += 1
+            return
 
+        counts.enqueued += 1
         self.queue.appendleft(span)
 
-        if len(self.queue) >= self.max_queue_size // 2:
+        # Only wake the worker when it is idle and the queue crosses the
+        # threshold, so producers skip the lock on every other call.
+        if (
+            self._worker_waiting
+            and len(self.queue) >= self.max_queue_size // 2
+        ):
+            with self.condition:
+                if self._worker_waiting:
+                    self._worker_waiting = False
+                    self.condition.notify()
+
+    def _make_room(self, counts: _SpanCounts) -> bool:
+        """Applies the overflow policy when a span ends while the queue is
+        full and returns whether the span should be enqueued.
+        """
+        if not self._spans_dropped:
+            logger.warning("Queue is full, likely spans will be dropped.")
+            self._spans_dropped = True
+
+        if self.overflow_policy is QueueOverflowPolicy.DROP_OLDEST:
+            try:
+                self.queue.pop()
+                counts.evicted += 1
+            except IndexError:
+                # the worker emptied the queue meanwhile
+                pass
+            return True
+        if self.overflow_policy is QueueOverflowPolicy.BLOCK:
             with self.condition:
                 self.condition.notify()
+                return (
+                    self._queue_not_full.wait_for(
+                        lambda: len(self.queue) < self.max_queue_size
+                        or self.done,
+                        self.block_timeout_millis / 1e3,
+                    )
+                    and not self.done
+                )
+        return False
 
     def worker(self):
         timeout = self.schedule_delay_millis / 1e3
@@ -205,12 +485,16 @@ class BatchExportSpanProcessor(SpanProcessor):
                     # done flag may have changed, avoid waiting
                     break
                 flush_request = self._get_and_unset_flush_request()
+                # set before checking the queue so that a producer crossing
+                # the batch threshold after the check always notifies
+                self._worker_waiting = True
                 if (
                     len(self.queue) < self.max_export_batch_size
                     and flush_request is None
                 ):
 
                     self.condition.wait(timeout)
+                    self._worker_waiting = False
                     flush_request = self._get_and_unset_flush_request()
                     if not self.queue:
                         # spurious notification, let's wait again, reset timeout
@@ -221,6 +505,8 @@ class BatchExportSpanProcessor(SpanProcessor):
                     if self.done:
                         # missing spans will be sent when calling flush
                         break
+                else:
+                    self._worker_waiting = False
 
             # subtract the duration of this export call to the next timeout
             start = time_ns()
@@ -297,6 +583,7 @@ class BatchExportSpanProcessor(SpanProcessor):
 
             if num_spans <= 0:
                 break
+        self._wait_for_exports()
 
     def _export_batch(self) -> int:
         """Exports at most max_export_batch_size spans and returns the number of
@@ -308,20 +595,58 @@ class BatchExportSpanProcessor(SpanProcessor):
         while idx < self.max_export_batch_size and self.queue:
             self.spans_list[idx] = self.queue.pop()
             idx += 1
-        token = attach(set_value("suppress_instrumentation", True))
-        try:
-            # Ignore type b/c the Optional[None]+slicing is too "clever"
-            # for mypy
-            self.span_exporter.export(self.spans_list[:idx])  # type: ignore
-        except Exception:  # pylint: disable=broad-except
-            logger.exception("Exception while exporting Span batch.")
-        detach(token)
+        if self.overflow_policy is QueueOverflowPolicy.BLOCK:
+            with self.condition:
+                self._queue_not_full.notify_all()
+        # Ignore type b/c the Optional[None]+slicing is too "clever" for mypy
+        batch = self.spans_list[:idx]  # type: ignore
 
         # clean up list
         for index in range(idx):
             self.spans_list[index] = None
+
+        # waits for a free export worker, if all are busy
+        self._export_slots.acquire()
+        if self._export_executor is None:
+            self._export_spans(batch)
+        else:
+            self._export_executor.submit(self._export_spans, batch)
         return idx
 
+    def _export_spans(self, batch: typing.List[Span]) -> None:
+        token = attach(set_value("suppress_instrumentation", True))
+        try:
+            try:
+                result = self.span_exporter.export(batch)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Exception while exporting Span batch.")
+                result = SpanExportResult.FAILURE
+            with self._export_stats_lock:
+                if result is SpanExportResult.FAILURE:
+                    self._spans_failed += len(batch)
+                else:
+                    self._spans_exported += len(batch)
+        finally:
+            self._export_slots.release()
+        detach(token)
+
+        # this processor is done with the spans, the batch is left untouched
+        # as the exporter may still hold it
+        SpanPool.release(batch)
+
+    def _wait_for_exports(self) -> None:
+        """Waits until all batches handed to export workers are exported.
+
+        Can only be called from the worker thread context, which is the only
+        one starting exports.
+        """
+        if self._export_executor is None:
+            return
+        for _ in range(self.max_export_workers):
+            self._export_slots.acquire()
+        for _ in range(self.max_export_workers):
+            self._export_slots.release()
+
     def _drain_queue(self):
         """"Export all elements until queue is empty.
 
@@ -330,6 +655,7 @@ class BatchExportSpanProcessor(SpanProcessor):
         """
         while self.queue:
             self._export_batch()
+        self._wait_for_exports()
 
     def force_flush(self, timeout_millis: int = None) -> bool:
 
@@ -356,16 +682,587 @@ class BatchExportSpanProcessor(SpanProcessor):
         self.done = True
         with self.condition:
             self.condition.notify_all()
+            self._queue_not_full.notify_all()
         self.worker_thread.join()
+        if self._export_executor is not None:
+            self._export_executor.shutdown()
         self.span_exporter.shutdown()
 
 
+class AsyncBatchExportSpanProcessor(SpanProcessor):
+    """Batch span processor exporting from an asyncio event loop.
+
+    AsyncBatchExportSpanProcessor is an implementation of `SpanProcessor`
+    that batches ended spans like `BatchExportSpanProcessor`, but exports
+    them with an `AsyncSpanExporter` from a task running on ``loop`` instead
+    of a dedicated thread. Up to ``max_concurrent_exports`` batches are
+    exported concurrently.
+
+    ``loop`` defaults to the running event loop, so it must be given unless
+    the processor is created from a coroutine.
+
+    Spans may end in any thread. `force_flush` and `shutdown` block until
+    done and cannot be used from the event loop thread, coroutines there
+    should await `async_force_flush` and `async_shutdown` instead, before the
+    loop is closed.
+    """
+
+    def __init__(
+        self,
+        span_exporter: AsyncSpanExporter,
+        loop: typing.Optional[asyncio.AbstractEventLoop] = None,
+        max_queue_size: int = None,
+        schedule_delay_millis: float = None,
+        max_export_batch_size: int = None,
+        export_timeout_millis: float = None,
+        max_concurrent_exports: int = 4,
+    ):
+
+        if max_queue_size is None:
+            max_queue_size = Configuration().get("BSP_MAX_QUEUE_SIZE", 2048)
+
+        if schedule_delay_millis is None:
+            schedule_delay_millis = Configuration().get(
+                "BSP_SCHEDULE_DELAY_MILLIS", 5000
+            )
+
+        if max_export_batch_size is None:
+            max_export_batch_size = Configuration().get(
+                "BSP_MAX_EXPORT_BATCH_SIZE", 512
+            )
+
+        if export_timeout_millis is None:
+            export_timeout_millis = Configuration().get(
+                "BSP_EXPORT_TIMEOUT_MILLIS", 30000
+            )
+
+        if max_queue_size <= 0:
+            raise ValueError("max_queue_size must be a positive integer.")
+
+        if schedule_delay_millis <= 0:
+            raise ValueError("schedule_delay_millis must be positive.")
+
+        if max_export_batch_size <= 0:
+            raise ValueError(
+                "max_export_batch_size must be a positive integer."
+            )
+
+        if max_export_batch_size > max_queue_size:
+            raise ValueError(
+                "max_export_batch_size must be less than or equal to max_queue_size."
+            )
+
+        if max_concurrent_exports <= 0:
+            raise ValueError(
+                "max_concurrent_exports must be a positive integer."
+            )
+
+        if loop is None:
+            # asyncio.get_running_loop is only available since Python 3.7
+            # pylint: disable=protected-access
+            loop = asyncio._get_running_loop()
+        if loop is None:
+            raise ValueError(
+                "loop must be given when not called from a coroutine."
+            )
+
+        self.span_exporter = span_exporter
+        self.loop = loop
+        self.queue = collections.deque(
+            [], max_queue_size
+        )  # type: typing.Deque[Span]
+        self.schedule_delay_millis = schedule_delay_millis
+        self.max_export_batch_size = max_export_batch_size
+        self.max_queue_size = max_queue_size
+        self.export_timeout_millis = export_timeout_millis
+        self.max_concurrent_exports = max_concurrent_exports
+        self.done = False
+        # flag that indicates that spans are being dropped
+        self._spans_dropped = False
+        # asyncio primitives, created on the event loop by _init_on_loop
+        self._wakeup = None  # type: typing.Optional[asyncio.Event]
+        self._export_slots = None  # type: typing.Optional[asyncio.Semaphore]
+        self._loop_thread_id = None  # type: typing.Optional[int]
+        # whether the worker was woken up and did not run yet
+        self._wakeup_pending = False
+        self._export_tasks = set()  # type: typing.Set[asyncio.Future]
+        # the worker coroutine is only created once the loop runs, so that it
+        # is not left unawaited if the loop is closed first
+        self._worker_task = None  # type: typing.Optional[asyncio.Task]
+        self.loop.call_soon_threadsafe(self._start_worker)
+        _register_at_fork_reinit(self)
+
+    def _at_fork_reinit(self) -> None:
+        """Drops the spans queued in the parent process after a fork.
+
+        The worker task only runs in the child if ``loop`` was not running
+        when forking, as is the case for servers creating the application
+        before forking and running the loop in each worker process.
+        """
+        self.queue.clear()
+        self._spans_dropped = False
+        self._wakeup_pending = False
+
+    def _start_worker(self) -> None:
+        if self._worker_task is None:
+            self._worker_task = self.loop.create_task(self._worker())
+
+    def _init_on_loop(self) -> None:
+        if self._wakeup is None:
+            self._loop_thread_id = threading.get_ident()
+            self._wakeup = asyncio.Event()
+            self._export_slots = asyncio.Semaphore(self.max_concurrent_exports)
+
+    def on_start(
+        self, span: Span, parent_context: typing.Optional[Context] = None
+    ) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        if self.done:
+            logger.warning("Already shutdown, dropping span.")
+            return
+        if not span.context.trace_flags.sampled:
+            return
+        if len(self.queue) == self.max_queue_size:
+            if not self._spans_dropped:
+                logger.warning("Queue is full, likely spans will be dropped.")
+                self._spans_dropped = True
+
+        self.queue.appendleft(span)
+
+        # wake the worker once per full batch, the wakeup is scheduled on
+        # the loop so that spans can end in any thread
+        if (
+            len(self.queue) >= self.max_export_batch_size
+            and self._wakeup is not None
+            and not self._wakeup_pending
+        ):
+            self._wakeup_pending = True
+            try:
+                self.loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # the event loop is closed
+                pass
+
+    async def _worker(self) -> None:
+        self._init_on_loop()
+        timeout = self.schedule_delay_millis / 1e3
+        while not self.done:
+            full_batches_only = True
+            if len(self.queue) < self.max_export_batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    full_batches_only = False
+                self._wakeup.clear()
+                self._wakeup_pending = False
+                if self.done:
+                    break
+            await self._export_queue(full_batches_only)
+
+        # be sure that all spans are sent
+        await self._export_queue(False)
+        if self._export_tasks:
+            await asyncio.wait(set(self._export_tasks))
+
+    async def _export_queue(self, full_batches_only: bool) -> None:
+        """Exports the queued spans in batches, only the full ones if
+        ``full_batches_only`` is set.
+
+        Waits for a free export slot before taking each batch from the queue,
+        so that at most ``max_concurrent_exports`` are in progress and every
+        batch taken from the queue is in ``_export_tasks``.
+        """
+        while True:
+            await self._export_slots.acquire()
+            if not self.queue or (
+                full_batches_only
+                and len(self.queue) < self.max_export_batch_size
+            ):
+                self._export_slots.release()
+                return
+            batch = [
+                self.queue.pop()
+                for _ in range(
+                    min(len(self.queue), self.max_export_batch_size)
+                )
+            ]
+            task = self.loop.create_task(self._export_batch(batch))
+            self._export_tasks.add(task)
+            task.add_done_callback(self._export_tasks.discard)
+
+    async def _export_batch(self, batch: typing.List[Span]) -> None:
+        token = attach(set_value("suppress_instrumentation", True))
+        try:
+            await asyncio.wait_for(
+                self.span_exporter.export(batch),
+                self.export_timeout_millis / 1e3,
+            )
+        # pylint: disable=broad-except
+        except Exception:
+            logger.exception("Exception while exporting Span batch.")
+        finally:
+            detach(token)
+            self._export_slots.release()
+
+    async def async_force_flush(self, timeout_millis: int = None) -> bool:
+        """Exports all the queued spans and waits for the exports in progress,
+        must be awaited on the event loop of the processor."""
+        if timeout_millis is None:
+            timeout_millis = self.export_timeout_millis
+
+        self._init_on_loop()
+        try:
+            await asyncio.wait_for(
+                self._export_queue(False), timeout_millis / 1e3
+            )
+            if self._export_tasks:
+                await asyncio.wait_for(
+                    asyncio.wait(set(self._export_tasks)),
+                    timeout_millis / 1e3,
+                )
+        except asyncio.TimeoutError:
+            logger.warning("Timeout was exceeded in force_flush().")
+            return False
+        return True
+
+    async def async_shutdown(self) -> None:
+        """Exports the remaining spans and shuts down the exporter, must be
+        awaited on the event loop of the processor."""
+        self.done = True
+        self._init_on_loop()
+        self._wakeup.set()
+        self._start_worker()
+        await self._worker_task
+        await self.span_exporter.shutdown()
+
+    def _run_on_loop(self, coro, method: str) -> typing.Any:
+        """Runs ``coro`` on the event loop and returns its result, or returns
+        `None` if that would require blocking the running event loop."""
+        if self.loop.is_closed():
+            coro.close()
+            logger.warning(
+                "The event loop is closed, cannot run %s(), spans may be lost.",
+                method,
+            )
+            return None
+        if not self.loop.is_running():
+            return self.loop.run_until_complete(coro)
+        if threading.get_ident() == self._loop_thread_id:
+            coro.close()
+            logger.warning(
+                "%s() would block the event loop, await async_%s() instead.",
+                method,
+                method,
+            )
+            return None
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def force_flush(self, timeout_millis: int = None) -> bool:
+        if self.done:
+            logger.warning("Already shutdown, ignoring call to force_flush().")
+            return True
+        return bool(
+            self._run_on_loop(
+                self.async_force_flush(timeout_millis), "force_flush"
+            )
+        )
+
+    def shutdown(self) -> None:
+        if self.done:
+            return
+        self._run_on_loop(self.async_shutdown(), "shutdown")
+
+
+class _BufferedTrace:
+    """Spans of a trace buffered by `TraceBufferingSpanProcessor`."""
+
+    __slots__ = ("spans", "pending", "deadline")
+
+    def __init__(self, deadline: int):
+        self.spans = []  # type: typing.List[Span]
+        # number of spans started but not ended yet
+        self.pending = 0
+        self.deadline = deadline
+
+
+def _keep_trace(spans: typing.Sequence[Span]) -> bool:
+    # pylint: disable=unused-argument
+    return True
+
+
+class TraceBufferingSpanProcessor(SpanProcessor):
+    """Span processor buffering ended spans per trace.
+
+    TraceBufferingSpanProcessor is an implementation of `SpanProcessor` that
+    buffers ended spans by trace until all the spans of the trace started in
+    this process have ended, or until ``trace_timeout_millis`` elapsed since
+    the first of them started. The spans of the trace are then passed to
+    ``decision`` and, if it returns ``True``, to the ``on_end`` method of
+    ``span_processor``. This allows tail based sampling decisions, such as
+    keeping only the traces with errors, before paying the export cost.
+
+    When more than ``max_traces`` traces or ``max_spans`` ended spans are
+    buffered, the oldest traces are decided early. Spans of these traces,
+    or of traces decided by timeout, that start or end afterwards follow the
+    decision taken for the trace instead of being buffered again.
+
+    Args:
+        span_processor: The processor receiving the spans of kept traces,
+            usually a `BatchExportSpanProcessor`.
+        decision: Called with the spans of a trace, returns whether they are
+            kept. All traces are kept by default.
+        trace_timeout_millis: The time after which a trace is decided even if
+            some of its spans have not ended yet.
+        max_traces: The maximum number of traces buffered.
+        max_spans: The maximum number of ended spans buffered.
+    """
+
+    def __init__(
+        self,
+        span_processor: SpanProcessor,
+        decision: typing.Optional[
+            typing.Callable[[typing.Sequence[Span]], bool]
+        ] = None,
+        trace_timeout_millis: float = 30000,
+        max_traces: int = 1024,
+        max_spans: int = 65536,
+    ):
+        if trace_timeout_millis <= 0:
+            raise ValueError("trace_timeout_millis must be positive.")
+
+        if max_traces <= 0:
+            raise ValueError("max_traces must be a positive integer.")
+
+        if max_spans <= 0:
+            raise ValueError("max_spans must be a positive integer.")
+
+        self.span_processor = span_processor
+        self.decision = decision if decision is not None else _keep_trace
+        self.trace_timeout_millis = trace_timeout_millis
+        self.max_traces = max_traces
+        self.max_spans = max_spans
+        # traces by trace id, oldest first
+        self._traces = (
+            collections.OrderedDict()
+        )  # type: typing.OrderedDict[int, _BufferedTrace]
+        # decisions taken for traces that had not ended yet, oldest first,
+        # None while the decision is being taken
+        self._decisions = (
+            collections.OrderedDict()
+        )  # type: typing.OrderedDict[int, typing.Optional[bool]]
+        self._buffered_spans = 0
+        self.condition = threading.Condition(threading.Lock())
+        self.done = False
+        self.worker_thread = threading.Thread(target=self.worker, daemon=True)
+        self.worker_thread.start()
+        _register_at_fork_reinit(self)
+
+    def _at_fork_reinit(self) -> None:
+        """Drops the traces buffered in the parent process after a fork and
+        starts a new worker thread in the child.
+        """
+        if self.done:
+            return
+        self.condition = threading.Condition(threading.Lock())
+        self._traces.clear()
+        self._decisions.clear()
+        self._buffered_spans = 0
+        self.worker_thread = threading.Thread(target=self.worker, daemon=True)
+        self.worker_thread.start()
+
+    def on_start(
+        self, span: Span, parent_context: typing.Optional[Context] = None
+    ) -> None:
+        if self.done:
+            return
+        trace_id = span.context.trace_id
+        with self.condition:
+            if trace_id in self._decisions:
+                # the trace was decided already, on_end handles the span
+                return
+            trace = self._traces.get(trace_id)
+            if trace is None:
+                trace = self._traces[trace_id] = _BufferedTrace(
+                    time_ns() + int(self.trace_timeout_millis * 1e6)
+                )
+            trace.pending += 1
+            evicted = self._pop_over_limits()
+        self._release(evicted, True)
+
+    def on_end(self, span: Span) -> None:
+        if self.done:
+            logger.warning("Already shutdown, dropping span.")
+            return
+        trace_id = span.context.trace_id
+        completed = []
+        evicted = []
+        with self.condition:
+            trace = self._traces.get(trace_id)
+            if trace is None:
+                # the trace was decided already, or the span started before
+                # this processor was added
+                keep = self._decisions.get(trace_id)
+            else:
+                trace.spans.append(span)
+                trace.pending -= 1
+                self._buffered_spans += 1
+                if trace.pending <= 0:
+                    completed.append((trace_id, self._pop_trace(trace_id)))
+                evicted = self._pop_over_limits()
+
+        if trace is None:
+            if keep is None:
+                # the span started before this processor was added, or ended
+                # while the decision on its trace is being taken
+                keep = self._should_keep((span,))
+            if keep:
+                self.span_processor.on_end(span)
+            return
+
+        self._release(completed, False)
+        self._release(evicted, True)
+
+    def _pop_trace(self, trace_id: int) -> typing.List[Span]:
+        """Removes a trace from the buffer, must be called with the condition
+        held."""
+        spans = self._traces.pop(trace_id).spans
+        self._buffered_spans -= len(spans)
+        return spans
+
+    def _pop_undecided_trace(self, trace_id: int) -> typing.List[Span]:
+        """Removes a trace that may still have spans starting or ending from
+        the buffer, must be called with the condition held.
+
+        The trace is marked as being decided, so that these spans are not
+        buffered again.
+        """
+        self._decisions[trace_id] = None
+        return self._pop_trace(trace_id)
+
+    def _pop_over_limits(
+        self,
+    ) -> typing.List[typing.Tuple[int, typing.List[Span]]]:
+        """Removes the oldest traces until the buffer is within its limits,
+        must be called with the condition held."""
+        evicted = []
+        while self._traces and (
+            len(self._traces) > self.max_traces
+            or self._buffered_spans > self.max_spans
+        ):
+            trace_id = next(iter(self._traces))
+            evicted.append((trace_id, self._pop_undecided_trace(trace_id)))
+        return evicted
+
+    def _pop_expired(
+        self,
+    ) -> typing.List[typing.Tuple[int, typing.List[Span]]]:
+        """Removes the traces past their deadline, must be called with the
+        condition held."""
+        now = time_ns()
+        expired = []
+        for trace_id, trace in self._traces.items():
+            if trace.deadline > now:
+                # traces are ordered by deadline
+                break
+            expired.append(trace_id)
+        return [
+            (trace_id, self._pop_undecided_trace(trace_id))
+            for trace_id in expired
+        ]
+
+    def _should_keep(self, spans: typing.Sequence[Span]) -> bool:
+        try:
+            return self.decision(spans)
+        # pylint: disable=broad-except
+        except Exception:
+            logger.exception("Exception while deciding on trace, keeping it.")
+            return True
+
+    def _release(
+        self,
+        traces: typing.List[typing.Tuple[int, typing.List[Span]]],
+        incomplete: bool,
+    ) -> None:
+        """Passes the spans of the kept traces to the next processor.
+
+        The decisions on incomplete traces are remembered so that their spans
+        ending later are handled the same way.
+        """
+        for trace_id, spans in traces:
+            if not spans:
+                if incomplete:
+                    # no span ended yet, there is nothing to decide on
+                    with self.condition:
+                        self._decisions.pop(trace_id, None)
+                continue
+            keep = self._should_keep(spans)
+            if incomplete:
+                with self.condition:
+                    self._decisions[trace_id] = keep
+                    while len(self._decisions) > self.max_traces:
+                        self._decisions.popitem(last=False)
+            if keep:
+                for span in spans:
+                    self.span_processor.on_end(span)
+
+    def worker(self):
+        while not self.done:
+            with self.condition:
+                if self._traces:
+                    timeout = max(
+                        next(iter(self._traces.values())).deadline - time_ns(),
+                        0,
+                    )
+                    self.condition.wait(timeout / 1e9)
+                else:
+                    self.condition.wait(self.trace_timeout_millis / 1e3)
+                if self.done:
+                    break
+                expired = self._pop_expired()
+            self._release(expired, True)
+
+    def _release_all(self) -> None:
+        with self.condition:
+            traces = [
+                (trace_id, self._pop_trace(trace_id))
+                for trace_id in list(self._traces)
+            ]
+        self._release(traces, True)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Decides on all the buffered traces, even if some of their spans have
+        not ended yet, and flushes the next processor."""
+        if self.done:
+            logger.warning("Already shutdown, ignoring call to force_flush().")
+            return True
+        self._release_all()
+        return self.span_processor.force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        # signal the worker thread to finish and then wait for it
+        self.done = True
+        with self.condition:
+            self.condition.notify_all()
+        self.worker_thread.join()
+        self._release_all()
+        self.span_processor.shutdown()
+
+
 class ConsoleSpanExporter(SpanExporter):
     """Implementation of :class:`SpanExporter` that prints spans to the
     console.
 
     This class can be used for diagnostic purposes. It prints the exported
     spans to the console STDOUT.
+
+    Args:
+        out: The stream spans are written to.
+        formatter: Converts each span to the string written to ``out``.
+        json_lines: If `True`, ``formatter`` is not used and spans are written
+            as JSON lines (see `opentelemetry.sdk.trace.Span.to_json_line`),
+            each batch with a single write.
     """
 
     def __init__(
@@ -373,12 +1270,19 @@ class ConsoleSpanExporter(SpanExporter):
         out: typing.IO = sys.stdout,
         formatter: typing.Callable[[Span], str] = lambda span: span.to_json()
         + os.linesep,
+        json_lines: bool = False,
     ):
         self.out = out
         self.formatter = formatter
+        self.json_lines = json_lines
 
     def export(self, spans: typing.Sequence[Span]) -> SpanExportResult:
-        for span in spans:
-            self.out.write(self.formatter(span))
+        if self.json_lines:
+            self.out.write(
+                "".join([span.to_json_line() + os.linesep for span in spans])
+            )
+        else:
+            for span in spans:
+                self.out.write(self.formatter(span))
         self.out.flush()
         return SpanExportResult.SUCCESS
@@ -0,0 +1,305 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The `JaegerRemoteSampler` fetches its sampling strategies from a Jaeger agent
+or from a file, so that the sampling rates of the operations of a service can
+be changed without redeploying it:
+
+.. code:: python
+
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.remote_sampling import JaegerRemoteSampler
+    from opentelemetry.sdk.trace.sampling import ParentBased
+
+    trace.set_tracer_provider(
+        TracerProvider(
+            sampler=ParentBased(
+                JaegerRemoteSampler(
+                    "http://localhost:5778/sampling?service=my-service"
+                )
+            )
+        )
+    )
+
+The strategies use the JSON format of the sampling endpoint of the Jaeger
+agent:
+
+.. code:: json
+
+    {
+        "strategyType": "PROBABILISTIC",
+        "probabilisticSampling": {"samplingRate": 0.001},
+        "operationSampling": {
+            "defaultSamplingProbability": 0.001,
+            "defaultLowerBoundTracesPerSecond": 0.0167,
+            "perOperationStrategies": [
+                {
+                    "operation": "/checkout",
+                    "probabilisticSampling": {"samplingRate": 0.5}
+                }
+            ]
+        }
+    }
+
+They are fetched by a background thread, and each fetch replaces the whole
+table of samplers at once, so that sampling a span never waits for a fetch.
+"""
+
+import json
+import logging
+import threading
+import urllib.parse
+import urllib.request
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+# pylint: disable=unused-import
+from opentelemetry.context import Context, attach, detach, set_value
+from opentelemetry.sdk.trace.sampling import (
+    RateLimitingSampler,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.sdk.util import _register_at_fork_reinit
+from opentelemetry.trace import Link
+from opentelemetry.util.types import Attributes
+
+logger = logging.getLogger(__name__)
+
+_PROBABILISTIC = ("PROBABILISTIC", 0)
+_RATE_LIMITING = ("RATE_LIMITING", 1)
+
+
+class _GuaranteedThroughputSampler(Sampler):
+    """Samples with a probability, and with a lower bound on the number of
+    traces sampled per second enforced by a rate limiting sampler.
+    """
+
+    def __init__(self, probabilistic: Sampler, lower_bound: Sampler):
+        self._probabilistic = probabilistic
+        self._lower_bound = lower_bound
+
+    def should_sample(
+        self,
+        parent_context: Optional["Context"],
+        trace_id: int,
+        name: str,
+        attributes: Attributes = None,
+        links: Sequence["Link"] = None,
+    ) -> "SamplingResult":
+        result = self._probabilistic.should_sample(
+            parent_context, trace_id, name, attributes, links
+        )
+        # traces sampled by probability count towards the lower bound
+        lower_bound_result = self._lower_bound.should_sample(
+            parent_context, trace_id, name, attributes, links
+        )
+        if result.decision.is_sampled():
+            return result
+        return lower_bound_result
+
+    def get_description(self) -> str:
+        return "GuaranteedThroughputSampler{{{}, {}}}".format(
+            self._probabilistic.get_description(),
+            self._lower_bound.get_description(),
+        )
+
+
+# The compiled strategies: the sampler of each operation, the default sampler
+# and the rate limiters by operation and limit, so that they can be kept by the
+# next update. They are never modified once compiled.
+_Strategies = Tuple[Dict[str, Sampler], Sampler, Dict[Hashable, Sampler]]
+
+
+class JaegerRemoteSampler(Sampler):
+    """Sampler using the sampling strategies fetched periodically from
+    ``source``. It is meant to be the delegate of a `ParentBased` sampler, so
+    that it only decides for root spans.
+
+    Operations are matched by span name. Samplers whose parameters did not
+    change are kept across updates, so that rate limits are not reset. If
+    fetching or parsing the strategies fails, the previous ones are kept.
+
+    Args:
+        source: The URL of the strategies, an HTTP URL of a Jaeger agent
+            or a ``file://`` URL. Strings without a scheme are file paths.
+        polling_interval_millis: The time between two fetches.
+        initial_sampler: The sampler used until the strategies are
+            fetched, `TraceIdRatioBased` with a probability of 0.001 by
+            default.
+        timeout_millis: The maximum duration of a fetch.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        polling_interval_millis: float = 60000,
+        initial_sampler: Optional[Sampler] = None,
+        timeout_millis: float = 10000,
+    ):
+        if polling_interval_millis <= 0:
+            raise ValueError("polling_interval_millis must be positive.")
+        if not urllib.parse.urlparse(source).scheme:
+            source = urllib.parse.urljoin(
+                "file:", urllib.request.pathname2url(source)
+            )
+        if initial_sampler is None:
+            initial_sampler = TraceIdRatioBased(0.001)
+        self.source = source
+        self.polling_interval_millis = polling_interval_millis
+        self.timeout_millis = timeout_millis
+        self._strategies = ({}, initial_sampler, {})  # type: _Strategies
+        self._update_lock = threading.Lock()
+        self._done = threading.Event()
+        self._worker_thread = threading.Thread(
+            target=self._worker, daemon=True
+        )
+        self._worker_thread.start()
+        _register_at_fork_reinit(self)
+
+    def _at_fork_reinit(self):
+        """Restarts the worker thread in a child process after a fork."""
+        if self._done.is_set():
+            return
+        # the worker of the parent may have been updating while forking
+        self._update_lock = threading.Lock()
+        self._done = threading.Event()
+        self._worker_thread = threading.Thread(
+            target=self._worker, daemon=True
+        )
+        self._worker_thread.start()
+
+    def _worker(self):
+        interval = self.polling_interval_millis / 1e3
+        while not self._done.is_set():
+            self.update()
+            self._done.wait(interval)
+
+    def should_sample(
+        self,
+        parent_context: Optional["Context"],
+        trace_id: int,
+        name: str,
+        attributes: Attributes = None,
+        links: Sequence["Link"] = None,
+    ) -> "SamplingResult":
+        operations, default, _ = self._strategies
+        return operations.get(name, default).should_sample(
+            parent_context, trace_id, name, attributes, links
+        )
+
+    def update(self) -> bool:
+        """Fetches the strategies from ``source`` and uses them for the next
+        sampling decisions.
+
+        Returns whether the strategies were updated.
+        """
+        # serializes the updates so that an older fetch does not win
+        with self._update_lock:
+            strategies = self._fetch()
+            if strategies is None:
+                return False
+            try:
+                self._strategies = self._compile(strategies)
+            except (AttributeError, KeyError, TypeError, ValueError):
+                logger.warning(
+                    "Invalid sampling strategies from %s.",
+                    self.source,
+                    exc_info=True,
+                )
+                return False
+        return True
+
+    def _fetch(self) -> Optional[dict]:
+        token = attach(set_value("suppress_instrumentation", True))
+        try:
+            with urllib.request.urlopen(
+                self.source, timeout=self.timeout_millis / 1e3
+            ) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except (OSError, ValueError):
+            logger.warning(
+                "Failed to fetch sampling strategies from %s.",
+                self.source,
+                exc_info=True,
+            )
+            return None
+        finally:
+            detach(token)
+
+    def _compile(self, strategies: dict) -> _Strategies:
+        previous_rate_limiters = self._strategies[2]
+        rate_limiters = {}  # type: Dict[Hashable, Sampler]
+
+        def get_rate_limiter(
+            operation: Optional[str], traces_per_second
+        ) -> Sampler:
+            # rate limiters keep their state while their limit is unchanged
+            key = (operation, float(traces_per_second))
+            rate_limiter = previous_rate_limiters.get(key)
+            if rate_limiter is None:
+                rate_limiter = RateLimitingSampler(key[1])
+            rate_limiters[key] = rate_limiter
+            return rate_limiter
+
+        operation_sampling = strategies.get("operationSampling")
+        if operation_sampling:
+            lower_bound = operation_sampling.get(
+                "defaultLowerBoundTracesPerSecond", 0
+            )
+
+            def get_operation_sampler(operation: Optional[str], rate):
+                sampler = TraceIdRatioBased(float(rate))
+                if lower_bound > 0:
+                    return _GuaranteedThroughputSampler(
+                        sampler, get_rate_limiter(operation, lower_bound)
+                    )
+                return sampler
+
+            operations = {
+                strategy["operation"]: get_operation_sampler(
+                    strategy["operation"],
+                    strategy["probabilisticSampling"]["samplingRate"],
+                )
+                for strategy in operation_sampling.get(
+                    "perOperationStrategies", ()
+                )
+            }
+            default = get_operation_sampler(
+                None, operation_sampling["defaultSamplingProbability"]
+            )
+            return operations, default, rate_limiters
+
+        strategy_type = strategies.get("strategyType", _PROBABILISTIC[0])
+        if strategy_type in _PROBABILISTIC:
+            rate = strategies["probabilisticSampling"]["samplingRate"]
+            default = TraceIdRatioBased(float(rate))
+        elif strategy_type in _RATE_LIMITING:
+            default = get_rate_limiter(
+                None, strategies["rateLimitingSampling"]["maxTracesPerSecond"],
+            )
+        else:
+            raise ValueError(
+                "Unknown strategy type {!r}.".format(strategy_type)
+            )
+        return {}, default, rate_limiters
+
+    def shutdown(self) -> None:
+        """Stops fetching the strategies, the current ones are kept."""
+        self._done.set()
+
+    def get_description(self) -> str:
+        return "JaegerRemoteSampler{{{}}}".format(self.source)
@@ -15,10 +15,13 @@
 """
 For general information about sampling, see `the specification <https://github.com/open-telemetry/opentelemetry-specification/blob/master/specification/trace/sdk.md#sampling>`_.
 
-OpenTelemetry provides two types of samplers:
+OpenTelemetry provides five types of samplers:
 
 - `StaticSampler`
 - `TraceIdRatioBased`
+- `RateLimitingSampler`
+- `AdaptiveSampler`
+- `RuleBasedSampler`
 
 A `StaticSampler` always returns the same sampling result regardless of the conditions. Both possible StaticSamplers are already created:
 
@@ -27,6 +30,12 @@ A `StaticSampler` always returns the same sampling result regardless of the cond
 
 A `TraceIdRatioBased` sampler makes a random sampling result based on the sampling probability given.
 
+A `RateLimitingSampler` samples up to a number of traces per second, which keeps the number of sampled spans stable during traffic spikes.
+
+An `AdaptiveSampler` adjusts the probability of a `TraceIdRatioBased` sampler to the traffic, so that a target number of traces are sampled per second on average.
+
+A `RuleBasedSampler` delegates to the sampler of the first `SamplingRule` matching the name and attributes of the span, for instance to never sample health checks.
+
 If the span being sampled has a parent, `ParentBased` will respect the parent span's sampling result. Otherwise, it returns the sampling result from the given delegate sampler.
 
 Currently, sampling results are always made during the creation of the span. However, this might not always be the case in the future (see `OTEP #115 <https://github.com/open-telemetry/oteps/pull/115>`_).
@@ -61,14 +70,20 @@ To use a sampler, pass it into the tracer provider constructor. For example:
         ...
 """
 import abc
+import collections
 import enum
+import fnmatch
+import itertools
+import re
+import threading
 from types import MappingProxyType
-from typing import Optional, Sequence
+from typing import Dict, List, Mapping, Optional, Pattern, Sequence, Tuple
 
 # pylint: disable=unused-import
 from opentelemetry.context import Context
 from opentelemetry.trace import Link, get_current_span
-from opentelemetry.util.types import Attributes
+from opentelemetry.util import time_ns
+from opentelemetry.util.types import Attributes, AttributeValue
 
 
 class Decision(enum.Enum):
@@ -105,11 +120,18 @@ class SamplingResult:
     ) -> None:
         self.decision = decision
         if attributes is None:
-            self.attributes = MappingProxyType({})
+            self.attributes = _EMPTY_ATTRIBUTES
         else:
             self.attributes = MappingProxyType(attributes)
 
 
+_EMPTY_ATTRIBUTES = MappingProxyType({})  # type: Attributes
+
+# Shared by the built-in samplers, dropping is by far the most common result
+# with low sampling rates.
+_DROP_RESULT = SamplingResult(Decision.DROP)
+
+
 class Sampler(abc.ABC):
     @abc.abstractmethod
     def should_sample(
@@ -142,7 +164,7 @@ class StaticSampler(Sampler):
         links: Sequence["Link"] = None,
     ) -> "SamplingResult":
         if self._decision is Decision.DROP:
-            return SamplingResult(self._decision)
+            return _DROP_RESULT
         return SamplingResult(self._decision, attributes)
 
     def get_description(self) -> str:
@@ -195,17 +217,348 @@ class TraceIdRatioBased(Sampler):
         attributes: Attributes = None,
         links: Sequence["Link"] = None,
     ) -> "SamplingResult":
-        decision = Decision.DROP
         if trace_id & self.TRACE_ID_LIMIT < self.bound:
-            decision = Decision.RECORD_AND_SAMPLE
-        if decision is Decision.DROP:
-            return SamplingResult(decision)
-        return SamplingResult(decision, attributes)
+            return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes)
+        return _DROP_RESULT
 
     def get_description(self) -> str:
         return "TraceIdRatioBased{{{}}}".format(self._rate)
 
 
+class RateLimitingSampler(Sampler):
+    """
+    Sampler that samples up to ``traces_per_second`` traces per second in
+    this process, regardless of the number of spans created. It is meant to
+    be the delegate of a `ParentBased` sampler, so that it only decides for
+    root spans.
+
+    Sampling is rate limited with a token bucket holding up to ``max_burst``
+    tokens, tracked as the time at which the bucket will be full again so
+    that each decision only reads the clock and compares two integers.
+
+    Args:
+        traces_per_second: The number of traces sampled per second.
+        max_burst: The number of traces that can be sampled at once after a
+            quiet period, ``traces_per_second`` (and at least one) by default.
+    """
+
+    def __init__(
+        self, traces_per_second: float, max_burst: Optional[float] = None
+    ):
+        if traces_per_second <= 0:
+            raise ValueError("traces_per_second must be positive.")
+        if max_burst is None:
+            max_burst = max(traces_per_second, 1.0)
+        if max_burst < 1:
+            raise ValueError("max_burst must be at least 1.")
+        self._traces_per_second = traces_per_second
+        # time between two sampled traces
+        self._interval = int(1e9 / traces_per_second)
+        # how far ahead of the current time the bucket may be full
+        self._burst_tolerance = int((max_burst - 1) * self._interval)
+        # the time at which the bucket will be full if no trace is sampled
+        self._full_at = 0
+        self._lock = threading.Lock()
+
+    def should_sample(
+        self,
+        parent_context: Optional["Context"],
+        trace_id: int,
+        name: str,
+        attributes: Attributes = None,
+        links: Sequence["Link"] = None,
+    ) -> "SamplingResult":
+        now = time_ns()
+        with self._lock:
+            full_at = max(self._full_at, now)
+            if full_at - now > self._burst_tolerance:
+                return _DROP_RESULT
+            self._full_at = full_at + self._interval
+        return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes)
+
+    def get_description(self) -> str:
+        return "RateLimitingSampler{{{}}}".format(self._traces_per_second)
+
+
+class AdaptiveSampler(Sampler):
+    """
+    Sampler that samples ``traces_per_second`` traces per second on average
+    by adjusting the probability of a `TraceIdRatioBased` sampler to the
+    number of traces started. It is meant to be the delegate of a
+    `ParentBased` sampler, so that it only decides for root spans and
+    measures the rate at which traces start.
+
+    Every ``adjustment_interval_millis``, the rate of sampling decisions over
+    the last ``window_millis`` is measured and the probability is set to
+    ``traces_per_second`` divided by that rate. Changes smaller than the
+    ``hysteresis`` ratio are ignored, so that the probability does not
+    oscillate with the noise in the traffic. Decisions are counted without
+    locking, only one thread adjusts the probability at a time.
+
+    Unlike `RateLimitingSampler`, sampling stays consistent across services
+    using the same probability, but the number of sampled traces may exceed
+    the target until the next adjustment when the traffic rises.
+
+    Args:
+        traces_per_second: The number of traces to sample per second.
+        window_millis: The duration over which the rate of traces is
+            measured.
+        adjustment_interval_millis: The time between two adjustments of the
+            probability.
+        hysteresis: The minimum relative change of the probability.
+        initial_rate: The probability used until the first adjustment.
+    """
+
+    def __init__(
+        self,
+        traces_per_second: float,
+        window_millis: float = 10000,
+        adjustment_interval_millis: float = 1000,
+        hysteresis: float = 0.1,
+        initial_rate: float = 1.0,
+    ):
+        if traces_per_second <= 0:
+            raise ValueError("traces_per_second must be positive.")
+        if adjustment_interval_millis <= 0:
+            raise ValueError("adjustment_interval_millis must be positive.")
+        if window_millis < adjustment_interval_millis:
+            raise ValueError(
+                "window_millis must be greater than or equal to "
+                "adjustment_interval_millis."
+            )
+        if hysteresis < 0:
+            raise ValueError("hysteresis must not be negative.")
+        self._traces_per_second = traces_per_second
+        self._window = int(window_millis * 1e6)
+        self._interval = int(adjustment_interval_millis * 1e6)
+        self._hysteresis = hysteresis
+        self._ratio_sampler = TraceIdRatioBased(initial_rate)
+        # next() on a count is atomic, unlike incrementing an attribute
+        self._decisions = itertools.count()
+        now = time_ns()
+        # times and numbers of decisions at each adjustment, oldest first
+        self._history = collections.deque([(now, 0)])
+        self._next_adjustment = now + self._interval
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """The current sampling probability."""
+        return self._ratio_sampler.rate
+
+    def should_sample(
+        self,
+        parent_context: Optional["Context"],
+        trace_id: int,
+        name: str,
+        attributes: Attributes = None,
+        links: Sequence["Link"] = None,
+    ) -> "SamplingResult":
+        decisions = next(self._decisions)
+        now = time_ns()
+        if now >= self._next_adjustment and self._lock.acquire(False):
+            try:
+                self._adjust(now, decisions)
+            finally:
+                self._lock.release()
+        return self._ratio_sampler.should_sample(
+            parent_context, trace_id, name, attributes, links
+        )
+
+    def _adjust(self, now: int, decisions: int) -> None:
+        if now < self._next_adjustment:
+            # another thread adjusted the probability meanwhile
+            return
+        self._next_adjustment = now + self._interval
+        history = self._history
+        history.append((now, decisions))
+        # keep the most recent entry older than the window as its start
+        while len(history) > 2 and history[1][0] <= now - self._window:
+            history.popleft()
+        start, start_decisions = history[0]
+        traces_per_second = (decisions - start_decisions) / (
+            (now - start) / 1e9
+        )
+
+        if traces_per_second <= self._traces_per_second:
+            rate = 1.0
+        else:
+            rate = self._traces_per_second / traces_per_second
+        current_rate = self._ratio_sampler.rate
+        if (
+            current_rate / (1 + self._hysteresis)
+            < rate
+            < current_rate * (1 + self._hysteresis)
+        ):
+            return
+        self._ratio_sampler.rate = rate
+
+    def get_description(self) -> str:
+        return "AdaptiveSampler{{{}}}".format(self._traces_per_second)
+
+
+class SamplingRule:
+    """A rule of a `RuleBasedSampler`.
+
+    Args:
+        sampler: The sampler deciding for the spans matching the rule.
+        name: The name of the matching spans, which may contain the ``*``,
+            ``?`` and ``[...]`` wildcards of `fnmatch`. Spans match whatever
+            their name if not given.
+        attributes: Attributes the matching spans must have with the given
+            values.
+    """
+
+    def __init__(
+        self,
+        sampler: Sampler,
+        name: Optional[str] = None,
+        attributes: Optional[Mapping[str, AttributeValue]] = None,
+    ):
+        self.sampler = sampler
+        self.name = name
+        self.attributes = tuple(
+            attributes.items() if attributes is not None else ()
+        )  # type: Tuple[Tuple[str, AttributeValue], ...]
+
+    def matches_attributes(self, attributes: Attributes) -> bool:
+        if not self.attributes:
+            return True
+        if not attributes:
+            return False
+        for key, value in self.attributes:
+            if attributes.get(key, _MISSING) != value:
+                return False
+        return True
+
+    def __repr__(self) -> str:
+        return "SamplingRule({}, name={!r}, attributes={})".format(
+            self.sampler.get_description(), self.name, dict(self.attributes)
+        )
+
+
+_MISSING = object()
+
+_GLOB_CHARACTERS = re.compile(r"[*?\[]")
+
+
+class RuleBasedSampler(Sampler):
+    """
+    Sampler that delegates to the sampler of the first rule matching the
+    span, or to ``default`` if none does. It is meant to be the delegate of
+    a `ParentBased` sampler, so that it only decides for root spans:
+
+    .. code:: python
+
+        sampler = ParentBased(
+            RuleBasedSampler(
+                [
+                    SamplingRule(ALWAYS_OFF, name="/healthz"),
+                    SamplingRule(
+                        ALWAYS_ON, attributes={"http.route": "/checkout"}
+                    ),
+                ],
+                default=TraceIdRatioBased(0.05),
+            )
+        )
+
+    The rules whose name matches a span name are computed once per name,
+    looking up the names without wildcards in a dict and matching the
+    others with a single regular expression first, so that a span only
+    costs a dict lookup and the attribute checks of these rules.
+
+    Args:
+        rules: The rules, in order of precedence.
+        default: The sampler used when no rule matches.
+        max_cached_names: The maximum number of span names whose rules are
+            cached.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[SamplingRule],
+        default: Sampler,
+        max_cached_names: int = 1024,
+    ):
+        self._rules = tuple(rules)
+        self._default = default
+        self._max_cached_names = max_cached_names
+        # indices of the rules by name, for names without wildcards
+        self._exact = {}  # type: Dict[str, List[int]]
+        # indices and patterns of the rules with wildcards
+        self._globs = []  # type: List[Tuple[int, Pattern]]
+        for index, rule in enumerate(self._rules):
+            if rule.name is None:
+                continue
+            if _GLOB_CHARACTERS.search(rule.name) is None:
+                self._exact.setdefault(rule.name, []).append(index)
+            else:
+                self._globs.append(
+                    (index, re.compile(fnmatch.translate(rule.name)))
+                )
+        self._any_glob = None
+        if self._globs:
+            self._any_glob = re.compile(
+                "|".join(
+                    "(?:{})".format(pattern.pattern)
+                    for _, pattern in self._globs
+                )
+            )
+        # rules matching each span name, up to the first one that matches
+        # whatever the attributes
+        self._rules_by_name = {}  # type: Dict[str, Tuple[SamplingRule, ...]]
+
+    def _rules_for_name(self, name: str) -> Tuple[SamplingRule, ...]:
+        indices = set(self._exact.get(name, ()))
+        if self._any_glob is not None and self._any_glob.match(name):
+            indices.update(
+                index for index, pattern in self._globs if pattern.match(name)
+            )
+        rules = []
+        for index, rule in enumerate(self._rules):
+            if rule.name is not None and index not in indices:
+                continue
+            rules.append(rule)
+            if not rule.attributes:
+                # the following rules are never reached
+                break
+        return tuple(rules)
+
+    def should_sample(
+        self,
+        parent_context: Optional["Context"],
+        trace_id: int,
+        name: str,
+        attributes: Attributes = None,
+        links: Sequence["Link"] = None,
+    ) -> "SamplingResult":
+        rules = self._rules_by_name.get(name)
+        if rules is None:
+            rules = self._rules_for_name(name)
+            if len(self._rules_by_name) >= self._max_cached_names:
+                self._rules_by_name.clear()
+            self._rules_by_name[name] = rules
+
+        sampler = self._default
+        for rule in rules:
+            if rule.matches_attributes(attributes):
+                sampler = rule.sampler
+                break
+
+        return sampler.should_sample(
+            parent_context=parent_context,
+            trace_id=trace_id,
+            name=name,
+            attributes=attributes,
+            links=links,
+        )
+
+    def get_description(self) -> str:
+        return "RuleBasedSampler{{{}, default={}}}".format(
+            list(self._rules), self._default.get_description()
+        )
+
+
 class ParentBased(Sampler):
     """
     If a parent is set, follows the same sampling decision as the parent.
@@ -237,7 +590,7 @@ class ParentBased(Sampler):
                 and parent_span_context.is_valid
                 and not parent_span_context.trace_flags.sampled
             ):
-                return SamplingResult(Decision.DROP)
+                return _DROP_RESULT
             return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes)
 
         return self._delegate.should_sample(
@@ -0,0 +1,310 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tail sampling policies decide whether to keep a trace once its spans have
+ended, so that they can take the whole trace into account, for instance to
+keep every trace containing an error.
+
+The policies are used as the ``decision`` of a
+`opentelemetry.sdk.trace.export.TraceBufferingSpanProcessor`, which only
+passes the spans of the kept traces to the next span processor:
+
+- `StatusCodePolicy` keeps traces with a span having one of the given status
+  codes.
+- `LatencyPolicy` keeps traces lasting longer than a threshold.
+- `AttributePolicy` keeps traces with a span having one of the given
+  attribute values.
+- `TraceIdRatioPolicy` keeps a ratio of the traces based on their trace id.
+- `RateLimitingPolicy` keeps up to a number of traces per second for each
+  service and route.
+
+Policies are combined with `AnyPolicy` and `AllPolicy`. For example, to keep
+all the traces with errors or lasting more than a second and 1% of the
+others:
+
+.. code:: python
+
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchExportSpanProcessor,
+        ConsoleSpanExporter,
+        TraceBufferingSpanProcessor,
+    )
+    from opentelemetry.sdk.trace.tail_sampling import (
+        AnyPolicy,
+        LatencyPolicy,
+        StatusCodePolicy,
+        TraceIdRatioPolicy,
+    )
+
+    trace.set_tracer_provider(TracerProvider())
+    trace.get_tracer_provider().add_span_processor(
+        TraceBufferingSpanProcessor(
+            BatchExportSpanProcessor(ConsoleSpanExporter()),
+            decision=AnyPolicy(
+                StatusCodePolicy(),
+                LatencyPolicy(1000),
+                TraceIdRatioPolicy(0.01),
+            ),
+        )
+    )
+
+Custom policies can be created by subclassing `TailSamplingPolicy` and
+implementing `TailSamplingPolicy.should_keep`.
+"""
+
+import abc
+import collections
+import threading
+from typing import Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+from opentelemetry.sdk.trace import Span
+from opentelemetry.sdk.trace.sampling import TraceIdRatioBased
+from opentelemetry.trace.status import StatusCode
+from opentelemetry.util import time_ns
+from opentelemetry.util.types import AttributeValue
+
+
+def _is_local_root(span: Span) -> bool:
+    parent = span.parent
+    if parent is None:
+        return True
+    if isinstance(parent, Span):
+        return False
+    return parent.is_remote
+
+
+def _local_root(spans: Sequence[Span]) -> Optional[Span]:
+    for span in spans:
+        if _is_local_root(span):
+            return span
+    return None
+
+
+class TailSamplingPolicy(abc.ABC):
+    """Decides whether to keep a trace given its spans.
+
+    Instances are callable so that they can be used as the ``decision`` of a
+    `opentelemetry.sdk.trace.export.TraceBufferingSpanProcessor`.
+    """
+
+    @abc.abstractmethod
+    def should_keep(self, spans: Sequence[Span]) -> bool:
+        pass
+
+    def __call__(self, spans: Sequence[Span]) -> bool:
+        return self.should_keep(spans)
+
+
+class AnyPolicy(TailSamplingPolicy):
+    """Keeps traces kept by any of the given policies.
+
+    The policies are evaluated in order until one keeps the trace, so cheap
+    policies should come first.
+    """
+
+    def __init__(self, *policies: TailSamplingPolicy):
+        self._policies = policies
+
+    def should_keep(self, spans: Sequence[Span]) -> bool:
+        return any(policy.should_keep(spans) for policy in self._policies)
+
+
+class AllPolicy(TailSamplingPolicy):
+    """Keeps traces kept by all the given policies.
+
+    The policies are evaluated in order until one drops the trace, so cheap
+    policies should come first.
+    """
+
+    def __init__(self, *policies: TailSamplingPolicy):
+        self._policies = policies
+
+    def should_keep(self, spans: Sequence[Span]) -> bool:
+        return all(policy.should_keep(spans) for policy in self._policies)
+
+
+class StatusCodePolicy(TailSamplingPolicy):
+    """Keeps traces with a span having one of the given status codes.
+
+    Args:
+        status_codes: The status codes of the traces to keep, only errors
+            by default.
+    """
+
+    def __init__(
+        self, status_codes: Iterable[StatusCode] = (StatusCode.ERROR,)
+    ):
+        self._status_codes = frozenset(status_codes)
+
+    def should_keep(self, spans: Sequence[Span]) -> bool:
+        return any(
+            span.status.status_code in self._status_codes for span in spans
+        )
+
+
+class LatencyPolicy(TailSamplingPolicy):
+    """Keeps traces lasting at least ``threshold_millis``.
+
+    The duration of a trace is the one of its local root span. If the root
+    span is not among the spans, for instance because it has not ended yet,
+    it is the time elapsed between the start of the first span and the end of
+    the last one.
+
+    Args:
+        threshold_millis: The minimum duration of the traces to keep.
+    """
+
+    def __init__(self, threshold_millis: float):
+        self._threshold = int(threshold_millis * 1e6)
+
+    def should_keep(self, spans: Sequence[Span]) -> bool:
+        if not spans:
+            return False
+        root = _local_root(spans)
+        if root is not None:
+            duration = root.end_time - root.start_time
+        else:
+            duration = max(span.end_time for span in spans) - min(
+                span.start_time for span in spans
+            )
+        return duration >= self._threshold
+
+
+class AttributePolicy(TailSamplingPolicy):
+    """Keeps traces with a span having an attribute with one of the given
+    values.
+
+    Args:
+        key: The attribute to look for.
+        values: The values of the attribute of the traces to keep. Any value
+            matches if not given.
+    """
+
+    def __init__(
+        self, key: str, values: Optional[Iterable[AttributeValue]] = None
+    ):
+        self._key = key
+        self._values = None if values is None else frozenset(values)
+
+    def should_keep(self, spans: Sequence[Span]) -> bool:
+        key = self._key
+        for span in spans:
+            if key not in span.attributes:
+                continue
+            if self._values is None or span.attributes[key] in self._values:
+                return True
+        return False
+
+
+class TraceIdRatioPolicy(TailSamplingPolicy):
+    """Keeps a ratio of the traces.
+
+    The decision is based on the trace id like `TraceIdRatioBased` so that
+    the traces kept by both are consistent.
+
+    Args:
+        rate: Probability (between 0 and 1) that a trace is kept.
+    """
+
+    def __init__(self, rate: float):
+        if rate < 0.0 or rate > 1.0:
+            raise ValueError("Probability must be in range [0.0, 1.0].")
+        self._bound = TraceIdRatioBased.get_bound_for_rate(rate)
+
+    def should_keep(self, spans: Sequence[Span]) -> bool:
+        if not spans:
+            return False
+        trace_id = spans[0].context.trace_id
+        return trace_id & TraceIdRatioBased.TRACE_ID_LIMIT < self._bound
+
+
+class _TokenBucket:
+    __slots__ = ("tokens", "last_refill")
+
+    def __init__(self, tokens: float, last_refill: int):
+        self.tokens = tokens
+        self.last_refill = last_refill
+
+
+class RateLimitingPolicy(TailSamplingPolicy):
+    """Keeps up to ``traces_per_second`` traces per second for each service
+    and route.
+
+    The service is the ``service.name`` resource attribute of the local root
+    span, or of the first span if the root span is not among the spans, and
+    the route is its ``route_attribute`` attribute, falling back to its name.
+
+    Args:
+        traces_per_second: The number of traces kept per second for each
+            service and route, bursts up to this number, or one trace, are
+            allowed.
+        route_attribute: The attribute holding the route.
+        max_routes: The maximum number of services and routes tracked, the
+            least recently seen are forgotten.
+    """
+
+    def __init__(
+        self,
+        traces_per_second: float,
+        route_attribute: str = "http.route",
+        max_routes: int = 1024,
+    ):
+        if traces_per_second <= 0:
+            raise ValueError("traces_per_second must be positive.")
+        if max_routes <= 0:
+            raise ValueError("max_routes must be a positive integer.")
+        self._traces_per_second = traces_per_second
+        # allow keeping a trace even with less than one trace per second
+        self._capacity = max(traces_per_second, 1.0)
+        self._route_attribute = route_attribute
+        self._max_routes = max_routes
+        self._buckets = (
+            collections.OrderedDict()
+        )  # type: Dict[Tuple[Hashable, Hashable], _TokenBucket]
+        self._lock = threading.Lock()
+
+    def _route(self, span: Span) -> Tuple[Hashable, Hashable]:
+        service = span.resource.attributes.get("service.name")
+        return service, span.attributes.get(self._route_attribute, span.name)
+
+    def should_keep(self, spans: Sequence[Span]) -> bool:
+        if not spans:
+            return False
+        root = _local_root(spans)
+        route = self._route(root if root is not None else spans[0])
+        now = time_ns()
+        with self._lock:
+            bucket = self._buckets.pop(route, None)
+            if bucket is None:
+                bucket = _TokenBucket(self._capacity, now)
+            else:
+                bucket.tokens = min(
+                    bucket.tokens
+                    + (now - bucket.last_refill)
+                    / 1e9
+                    * self._traces_per_second,
+                    self._capacity,
+                )
+                bucket.last_refill = now
+            # reinserting keeps the most recently seen routes last
+            self._buckets[route] = bucket
+            if len(self._buckets) > self._max_routes:
+                self._buckets.popitem(last=False)
+            if bucket.tokens < 1:
+                return False
+            bucket.tokens -= 1
+            return True
@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import datetime
+import logging
+import os
 import threading
+import weakref
 from collections import OrderedDict, deque
 
 try:
@@ -45,17 +48,57 @@ def get_dict_as_key(labels):
     )
 
 
+logger = logging.getLogger(__name__)
+
+# instances reinitialized in forked child processes, see
+# _register_at_fork_reinit
+_AT_FORK_REINIT_INSTANCES = weakref.WeakSet()  # type: weakref.WeakSet
+
+
+def _at_fork_reinit_instances() -> None:
+    for instance in list(_AT_FORK_REINIT_INSTANCES):
+        try:
+            instance._at_fork_reinit()  # pylint: disable=protected-access
+        # pylint: disable=broad-except
+        except Exception:
+            logger.exception("Exception while reinitializing after fork.")
+
+
+# os.register_at_fork is only available from Python 3.7 on
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_at_fork_reinit_instances)
+
+
+def _register_at_fork_reinit(instance) -> None:
+    """Calls ``instance._at_fork_reinit()`` in child processes forked while
+    ``instance`` is alive.
+
+    Only a weak reference to ``instance`` is kept. Nothing is called on
+    Python versions without `os.register_at_fork` (before 3.7).
+    """
+    _AT_FORK_REINIT_INSTANCES.add(instance)
+
+
+def _new_lock(thread_safe):
+    return threading.Lock() if thread_safe else None
+
+
 class BoundedList(Sequence):
     """An append only list with a fixed max size.
 
     Calls to `append` and `extend` will drop the oldest elements if there is
     not enough room.
+
+    Pass ``thread_safe=False`` if the caller already serializes access to the
+    list, to skip the internal locking.
     """
 
-    def __init__(self, maxlen):
+    __slots__ = ("dropped", "_dq", "_lock")
+
+    def __init__(self, maxlen, thread_safe=True):
         self.dropped = 0
         self._dq = deque(maxlen=maxlen)  # type: deque
-        self._lock = threading.Lock()
+        self._lock = _new_lock(thread_safe)
 
     def __repr__(self):
         return "{}({}, maxlen={})".format(
@@ -69,28 +112,42 @@ class BoundedList(Sequence):
         return len(self._dq)
 
     def __iter__(self):
+        if self._lock is None:
+            return iter(deque(self._dq))
         with self._lock:
             return iter(deque(self._dq))
 
+    def _append(self, item):
+        if len(self._dq) == self._dq.maxlen:
+            self.dropped += 1
+        self._dq.append(item)
+
     def append(self, item):
+        if self._lock is None:
+            self._append(item)
+            return
         with self._lock:
-            if len(self._dq) == self._dq.maxlen:
-                self.dropped += 1
-            self._dq.append(item)
+            self._append(item)
+
+    def _extend(self, seq):
+        to_drop = len(seq) + len(self._dq) - self._dq.maxlen
+        if to_drop > 0:
+            self.dropped += to_drop
+        self._dq.extend(seq)
 
     def extend(self, seq):
+        if self._lock is None:
+            self._extend(seq)
+            return
         with self._lock:
-            to_drop = len(seq) + len(self._dq) - self._dq.maxlen
-            if to_drop > 0:
-                self.dropped += to_drop
-            self._dq.extend(seq)
+            self._extend(seq)
 
     @classmethod
-    def from_seq(cls, maxlen, seq):
+    def from_seq(cls, maxlen, seq, thread_safe=True):
         seq = tuple(seq)
         if len(seq) > maxlen:
             raise ValueError
-        bounded_list = cls(maxlen)
+        bounded_list = cls(maxlen, thread_safe=thread_safe)
         # pylint: disable=protected-access
         bounded_list._dq = deque(seq, maxlen=maxlen)
         return bounded_list
@@ -101,9 +158,14 @@ class BoundedDict(MutableMapping):
 
     Oldest elements are dropped when the dict is full and a new element is
     added.
+
+    Pass ``thread_safe=False`` if the caller already serializes access to the
+    dict, to skip the internal locking.
     """
 
-    def __init__(self, maxlen):
+    __slots__ = ("maxlen", "dropped", "_dict", "_lock")
+
+    def __init__(self, maxlen, thread_safe=True):
         if not isinstance(maxlen, int):
             raise ValueError
         if maxlen < 0:
@@ -111,7 +173,7 @@ class BoundedDict(MutableMapping):
         self.maxlen = maxlen
         self.dropped = 0
         self._dict = OrderedDict()  # type: OrderedDict
-        self._lock = threading.Lock()  # type: threading.Lock
+        self._lock = _new_lock(thread_safe)
 
     def __repr__(self):
         return "{}({}, maxlen={})".format(
@@ -121,23 +183,43 @@ class BoundedDict(MutableMapping):
     def __getitem__(self, key):
         return self._dict[key]
 
+    def _set(self, key, value):
+        if self.maxlen == 0:
+            self.dropped += 1
+            return
+
+        if key in self._dict:
+            del self._dict[key]
+        elif len(self._dict) == self.maxlen:
+            del self._dict[next(iter(self._dict.keys()))]
+            self.dropped += 1
+        self._dict[key] = value
+
     def __setitem__(self, key, value):
+        if self._lock is None:
+            self._set(key, value)
+            return
         with self._lock:
-            if self.maxlen == 0:
-                self.dropped += 1
-                return
-
-            if key in self._dict:
-                del self._dict[key]
-            elif len(self._dict) == self.maxlen:
-                del self._dict[next(iter(self._dict.keys()))]
-                self.dropped += 1
-            self._dict[key] = value
+            self._set(key, value)
+
+    def update(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Sets all the given items like `dict.update`, taking the lock only
+        once."""
+        items = OrderedDict(*args, **kwargs).items()
+        if self._lock is None:
+            for key, value in items:
+                self._set(key, value)
+            return
+        with self._lock:
+            for key, value in items:
+                self._set(key, value)
 
     def __delitem__(self, key):
         del self._dict[key]
 
     def __iter__(self):
+        if self._lock is None:
+            return iter(self._dict.copy())
         with self._lock:
             return iter(self._dict.copy())
 
@@ -145,11 +227,11 @@ class BoundedDict(MutableMapping):
         return len(self._dict)
 
     @classmethod
-    def from_map(cls, maxlen, mapping):
+    def from_map(cls, maxlen, mapping, thread_safe=True):
         mapping = OrderedDict(mapping)
         if len(mapping) > maxlen:
             raise ValueError
-        bounded_dict = cls(maxlen)
+        bounded_dict = cls(maxlen, thread_safe=thread_safe)
         # pylint: disable=protected-access
         bounded_dict._dict = mapping
         return bounded_dict
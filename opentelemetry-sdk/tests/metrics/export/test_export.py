@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import concurrent.futures
+import multiprocessing
+import os
 import random
 import unittest
 from math import inf
@@ -715,3 +717,27 @@ class TestController(unittest.TestCase):
             self.assertEqual(context_patch.attach.called, True)
             self.assertEqual(context_patch.detach.called, True)
         self.assertEqual(get_value("suppress_instrumentation"), None)
+
+    @unittest.skipUnless(
+        hasattr(os, "register_at_fork"), "requires os.register_at_fork"
+    )
+    def test_push_controller_fork(self):
+        meter = mock.Mock()
+        exporter = mock.Mock()
+        controller = PushController(meter, exporter, 0.01)
+        self.addCleanup(controller.shutdown)
+
+        context = multiprocessing.get_context("fork")
+        parent_conn, child_conn = context.Pipe()
+
+        def child():
+            # the controller keeps collecting in the child
+            meter.collect.reset_mock()
+            alive = controller.is_alive()
+            controller.join(0.1)
+            child_conn.send((alive, meter.collect.called))
+
+        process = context.Process(target=child)
+        process.start()
+        self.assertEqual(parent_conn.recv(), (True, True))
+        process.join()
@@ -0,0 +1,444 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import io
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from opentelemetry import trace as trace_api
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import (
+    SpanPool,
+    SpanProcessor,
+    TracerProvider,
+    sampling,
+    tail_sampling,
+)
+from opentelemetry.sdk.trace.export import (
+    BatchExportSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleExportSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+    TraceBufferingSpanProcessor,
+)
+from opentelemetry.trace.status import Status, StatusCode
+
+tracer = TracerProvider(
+    sampler=sampling.DEFAULT_ON,
+    resource=Resource({"service.name": "A123456789"}),
+    shutdown_on_exit=False,
+).get_tracer("sdk_tracer_provider")
+
+
+def _start_and_end_span():
+    span = tracer.start_span("benchmarkedSpan")
+    span.set_attribute("http.method", "GET")
+    span.set_attribute("http.url", "http://localhost/benchmark")
+    span.set_attribute("http.status_code", 200)
+    span.end()
+    return span
+
+
+def test_simple_start_span(benchmark):
+    def benchmark_start_span():
+        span = tracer.start_span(
+            "benchmarkedSpan",
+            attributes={"long.attribute": -10000000001000000000},
+        )
+        span.add_event("benchmarkEvent")
+        span.end()
+
+    benchmark(benchmark_start_span)
+
+
+def test_simple_start_as_current_span(benchmark):
+    def benchmark_start_as_current_span():
+        with tracer.start_as_current_span(
+            "benchmarkedSpan",
+            attributes={"long.attribute": -10000000001000000000},
+        ) as span:
+            span.add_event("benchmarkEvent")
+
+    benchmark(benchmark_start_as_current_span)
+
+
+def test_span_with_attributes(benchmark):
+    benchmark(_start_and_end_span)
+
+    # record the memory retained by a finished span next to its timing
+    num_spans = 10000
+    gc.collect()
+    tracemalloc.start()
+    spans = [_start_and_end_span() for _ in range(num_spans)]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del spans
+    benchmark.extra_info["bytes_per_span"] = retained / num_spans
+
+
+single_writer_tracer = TracerProvider(
+    sampler=sampling.DEFAULT_ON,
+    resource=Resource({"service.name": "A123456789"}),
+    shutdown_on_exit=False,
+    single_writer_spans=True,
+).get_tracer("sdk_tracer_provider")
+
+
+def _set_twenty_attributes(span):
+    for idx in range(20):
+        span.set_attribute("attribute.{}".format(idx), idx)
+    span.end()
+
+
+def test_set_attribute_locked(benchmark):
+    benchmark(lambda: _set_twenty_attributes(tracer.start_span("span")))
+
+
+def test_set_attribute_single_writer(benchmark):
+    benchmark(
+        lambda: _set_twenty_attributes(single_writer_tracer.start_span("span"))
+    )
+
+
+request_attributes = {
+    "component": "http",
+    "http.method": "GET",
+    "http.server_name": "localhost",
+    "http.scheme": "http",
+    "host.port": 8080,
+    "http.host": "localhost:8080",
+    "http.target": "/benchmark?query=1",
+    "http.url": "http://localhost:8080/benchmark?query=1",
+    "http.flavor": "1.1",
+    "http.user_agent": "benchmark",
+    "net.peer.ip": "127.0.0.1",
+    "net.peer.port": 54321,
+}
+
+
+def test_set_attribute_per_key(benchmark):
+    def benchmark_set_attribute_per_key():
+        span = tracer.start_span("span")
+        for key, value in request_attributes.items():
+            span.set_attribute(key, value)
+        span.end()
+
+    benchmark(benchmark_set_attribute_per_key)
+
+
+def test_set_attributes(benchmark):
+    def benchmark_set_attributes():
+        span = tracer.start_span("span")
+        span.set_attributes(request_attributes)
+        span.end()
+
+    benchmark(benchmark_set_attributes)
+
+
+def test_start_span_with_attributes(benchmark):
+    def benchmark_start_span_with_attributes():
+        tracer.start_span("span", attributes=request_attributes).end()
+
+    benchmark(benchmark_start_span_with_attributes)
+
+
+pooled_tracer_provider = TracerProvider(
+    sampler=sampling.DEFAULT_ON,
+    resource=Resource({"service.name": "A123456789"}),
+    shutdown_on_exit=False,
+    span_pool=SpanPool(),
+)
+# stands for the span processor releasing the spans in batches below
+pooled_tracer_provider.add_span_processor(SpanProcessor())
+pooled_tracer = pooled_tracer_provider.get_tracer("sdk_tracer_provider")
+
+
+def _export_spans_in_batches(span_tracer):
+    # mimics BatchExportSpanProcessor handing batches back to the pool
+    batch = []
+
+    def start_and_end_span():
+        batch.append(span_tracer.start_span("span"))
+        batch[-1].end()
+        if len(batch) == 512:
+            SpanPool.release(batch)
+            batch.clear()
+
+    return start_and_end_span
+
+
+def test_start_span_unpooled(benchmark):
+    benchmark(_export_spans_in_batches(tracer))
+
+
+def test_start_span_pooled(benchmark):
+    benchmark(_export_spans_in_batches(pooled_tracer))
+
+
+unsampled_tracer = TracerProvider(
+    sampler=sampling.DEFAULT_OFF,
+    resource=Resource({"service.name": "A123456789"}),
+    shutdown_on_exit=False,
+).get_tracer("sdk_tracer_provider")
+
+
+def _start_as_current_span(span_tracer):
+    def start_as_current_span():
+        with span_tracer.start_as_current_span(
+            "benchmarkedSpan", attributes={"http.method": "GET"}
+        ) as span:
+            span.set_attribute("http.status_code", 200)
+
+    return start_as_current_span
+
+
+def test_start_as_current_span_sampled(benchmark):
+    benchmark(_start_as_current_span(tracer))
+
+
+def test_start_as_current_span_unsampled(benchmark):
+    benchmark(_start_as_current_span(unsampled_tracer))
+
+
+def test_start_span_unsampled(benchmark):
+    benchmark(lambda: unsampled_tracer.start_span("span").end())
+
+
+def test_start_span_random_ids(benchmark):
+    ids_tracer = TracerProvider(
+        ids_generator=trace_api.RandomIdsGenerator(), shutdown_on_exit=False
+    ).get_tracer("sdk_tracer_provider")
+    benchmark(lambda: ids_tracer.start_span("span").end())
+
+
+def test_start_span_buffered_random_ids(benchmark):
+    ids_tracer = TracerProvider(
+        ids_generator=trace_api.BufferedRandomIdsGenerator(),
+        shutdown_on_exit=False,
+    ).get_tracer("sdk_tracer_provider")
+    benchmark(lambda: ids_tracer.start_span("span").end())
+
+
+def _finished_spans(num_spans):
+    spans = []
+    for _ in range(num_spans):
+        span = tracer.start_span("span", attributes=request_attributes)
+        span.add_event("benchmarkEvent", {"event.attribute": 1})
+        span.end()
+        spans.append(span)
+    return spans
+
+
+def _export_to_console(exporter):
+    spans = _finished_spans(512)
+
+    def export():
+        exporter.out = io.StringIO()
+        exporter.export(spans)
+
+    return export
+
+
+def test_console_export(benchmark):
+    benchmark(_export_to_console(ConsoleSpanExporter()))
+
+
+def test_console_export_json_lines(benchmark):
+    benchmark(_export_to_console(ConsoleSpanExporter(json_lines=True)))
+
+
+def test_get_tracer(benchmark):
+    tracer_provider = TracerProvider(shutdown_on_exit=False)
+    benchmark(lambda: tracer_provider.get_tracer("module", "1.0"))
+
+
+def _record_exception(span_tracer):
+    def raise_error(depth):
+        if depth:
+            raise_error(depth - 1)
+        raise ValueError("invalid")
+
+    def record_exception():
+        span = span_tracer.start_span("span")
+        try:
+            raise_error(10)
+        except ValueError as error:
+            span.record_exception(error)
+        span.end()
+
+    return record_exception
+
+
+def test_record_exception(benchmark):
+    benchmark(_record_exception(tracer))
+
+
+def test_record_exception_lazy(benchmark):
+    lazy_tracer = TracerProvider(
+        lazy_exception_stacktraces=True, shutdown_on_exit=False
+    ).get_tracer("sdk_tracer_provider")
+    benchmark(_record_exception(lazy_tracer))
+
+
+class _NoOpSpanExporter(SpanExporter):
+    def export(self, spans):
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+class _SlowSpanExporter(SpanExporter):
+    """Simulates an exporter with a 10ms round trip per export call."""
+
+    def export(self, spans):
+        time.sleep(0.01)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+@pytest.mark.parametrize("max_export_workers", [1, 4])
+def test_batch_export_workers(benchmark, max_export_workers):
+    span_processor = BatchExportSpanProcessor(
+        _SlowSpanExporter(),
+        max_export_batch_size=16,
+        max_export_workers=max_export_workers,
+    )
+    spans = _finished_spans(256)
+
+    def export_spans():
+        for span in spans:
+            span_processor.on_end(span)
+        span_processor.force_flush()
+
+    benchmark(export_spans)
+    span_processor.shutdown()
+
+
+def test_batch_span_processor_on_end_contention(benchmark):
+    num_threads = 16
+    num_spans = 2000
+    tracer_provider = TracerProvider(shutdown_on_exit=False)
+    span_processor = BatchExportSpanProcessor(_NoOpSpanExporter())
+    tracer_provider.add_span_processor(span_processor)
+    contention_tracer = tracer_provider.get_tracer("sdk_tracer_provider")
+    latencies = []
+
+    def end_spans():
+        spans = [
+            contention_tracer.start_span("span") for _ in range(num_spans)
+        ]
+        thread_latencies = []
+        for span in spans:
+            start = time.perf_counter()
+            span.end()
+            thread_latencies.append(time.perf_counter() - start)
+        latencies.extend(thread_latencies)
+
+    def run_threads():
+        threads = [
+            threading.Thread(target=end_spans) for _ in range(num_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        span_processor.force_flush()
+
+    benchmark.pedantic(run_threads, rounds=5)
+    span_processor.shutdown()
+
+    latencies.sort()
+    benchmark.extra_info["p50_end_us"] = latencies[len(latencies) // 2] * 1e6
+    benchmark.extra_info["p99_end_us"] = (
+        latencies[len(latencies) * 99 // 100] * 1e6
+    )
+
+
+@pytest.mark.parametrize("tail_sampled", [False, True])
+def test_tail_sampling(benchmark, tail_sampled):
+    out = io.StringIO()
+    decision = None
+    if tail_sampled:
+        decision = tail_sampling.AnyPolicy(
+            tail_sampling.StatusCodePolicy(),
+            tail_sampling.LatencyPolicy(100),
+            tail_sampling.TraceIdRatioPolicy(0.05),
+        )
+    tracer_provider = TracerProvider(shutdown_on_exit=False)
+    tracer_provider.add_span_processor(
+        TraceBufferingSpanProcessor(
+            SimpleExportSpanProcessor(
+                ConsoleSpanExporter(out=out, json_lines=True)
+            ),
+            decision=decision,
+        )
+    )
+    sampled_tracer = tracer_provider.get_tracer("sdk_tracer_provider")
+
+    def create_traces():
+        out.seek(0)
+        out.truncate()
+        for idx in range(100):
+            with sampled_tracer.start_as_current_span("root") as root:
+                for _ in range(4):
+                    with sampled_tracer.start_as_current_span("child"):
+                        pass
+                if idx % 20 == 0:
+                    root.set_status(Status(StatusCode.ERROR))
+
+    benchmark(create_traces)
+    tracer_provider.shutdown()
+    benchmark.extra_info["exported_bytes"] = len(out.getvalue())
+
+
+_RULE_BASED_SAMPLER = sampling.RuleBasedSampler(
+    [
+        sampling.SamplingRule(sampling.ALWAYS_OFF, name="/route{}".format(i))
+        for i in range(10)
+    ]
+    + [
+        sampling.SamplingRule(sampling.ALWAYS_ON, name="/prefix{}/*".format(i))
+        for i in range(10)
+    ],
+    sampling.TraceIdRatioBased(0.01),
+)
+
+
+@pytest.mark.parametrize(
+    "sampler",
+    [
+        sampling.TraceIdRatioBased(0.01),
+        sampling.RateLimitingSampler(100),
+        sampling.ParentBased(sampling.RateLimitingSampler(100)),
+        _RULE_BASED_SAMPLER,
+        sampling.AdaptiveSampler(100),
+    ],
+    ids=[
+        "trace_id_ratio",
+        "rate_limiting",
+        "parent_based_rate_limiting",
+        "rule_based",
+        "adaptive",
+    ],
+)
+def test_sampler_should_sample(benchmark, sampler):
+    benchmark(sampler.should_sample, None, 0xDEADBEEF, "benchmarkedSpan")
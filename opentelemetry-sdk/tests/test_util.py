@@ -13,8 +13,12 @@
 # limitations under the License.
 
 import collections
+import gc
 import unittest
+import weakref
+from unittest import mock
 
+from opentelemetry.sdk import util
 from opentelemetry.sdk.util import BoundedDict, BoundedList
 
 
@@ -211,3 +215,65 @@ class TestBoundedDict(unittest.TestCase):
 
         with self.assertRaises(KeyError):
             _ = bdict["new-name"]
+
+    def test_update(self):
+        dic_len = len(self.base)
+        bdict = BoundedDict(dic_len)
+        bdict["old"] = "value"
+        bdict.update(self.base)
+
+        # "old" was the oldest element so it got dropped
+        self.assertEqual(len(bdict), dic_len)
+        self.assertEqual(bdict.dropped, 1)
+        self.assertNotIn("old", bdict)
+        for key in self.base:
+            self.assertEqual(bdict[key], self.base[key])
+
+        bdict.update([("name", "Bruno")], age=3)
+        self.assertEqual(bdict["name"], "Bruno")
+        self.assertEqual(bdict["age"], 3)
+        self.assertEqual(bdict.dropped, 1)
+
+    def test_not_thread_safe(self):
+        bdict = BoundedDict(2, thread_safe=False)
+        bdict.update({"name": "Firulais", "age": 7})
+        bdict["weight"] = 13
+        self.assertEqual(dict(bdict), {"age": 7, "weight": 13})
+        self.assertEqual(bdict.dropped, 1)
+
+
+class _Reinitialized:
+    def __init__(self):
+        self.reinitialized = 0
+
+    def _at_fork_reinit(self):
+        self.reinitialized += 1
+
+
+class TestRegisterAtForkReinit(unittest.TestCase):
+    def setUp(self):
+        # only reinitialize the instances of the test
+        patcher = mock.patch.object(
+            util, "_AT_FORK_REINIT_INSTANCES", weakref.WeakSet()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reinit_instances(self):
+        # pylint: disable=protected-access
+        instances = [_Reinitialized() for _ in range(3)]
+        for instance in instances:
+            util._register_at_fork_reinit(instance)
+        util._at_fork_reinit_instances()
+        self.assertEqual(
+            [instance.reinitialized for instance in instances], [1, 1, 1]
+        )
+
+    def test_weak_references(self):
+        # pylint: disable=protected-access
+        instance = _Reinitialized()
+        util._register_at_fork_reinit(instance)
+        self.assertEqual(len(util._AT_FORK_REINIT_INSTANCES), 1)
+        del instance
+        gc.collect()
+        self.assertEqual(len(util._AT_FORK_REINIT_INSTANCES), 0)
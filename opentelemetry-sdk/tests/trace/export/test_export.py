@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import multiprocessing
 import os
 import threading
 import time
 import unittest
 from concurrent.futures import ThreadPoolExecutor
-from logging import WARNING
+from logging import ERROR, WARNING
 from unittest import mock
 
 from opentelemetry import trace as trace_api
@@ -59,6 +61,44 @@ class MySpanExporter(export.SpanExporter):
         self.is_shutdown = True
 
 
+class SlowSpanExporter(MySpanExporter):
+    """Span exporter taking a while to export and recording how many exports
+    run at the same time."""
+
+    def __init__(self, destination, delay):
+        super().__init__(destination)
+        self.delay = delay
+        self.concurrent_exports = 0
+        self.max_concurrent_exports = 0
+        self._lock = threading.Lock()
+
+    def export(self, spans: trace.Span) -> export.SpanExportResult:
+        with self._lock:
+            self.concurrent_exports += 1
+            self.max_concurrent_exports = max(
+                self.max_concurrent_exports, self.concurrent_exports
+            )
+        time.sleep(self.delay)
+        with self._lock:
+            self.destination.extend(span.name for span in spans)
+            self.concurrent_exports -= 1
+        return export.SpanExportResult.SUCCESS
+
+
+class BlockingSpanExporter(MySpanExporter):
+    """Span exporter blocking in its first export until released."""
+
+    def __init__(self, destination):
+        super().__init__(destination)
+        self.export_started = threading.Event()
+        self.release = threading.Event()
+
+    def export(self, spans: trace.Span) -> export.SpanExportResult:
+        self.export_started.set()
+        self.release.wait()
+        return super().export(spans)
+
+
 class TestSimpleExportSpanProcessor(unittest.TestCase):
     def test_simple_span_processor(self):
         tracer_provider = trace.TracerProvider()
@@ -139,6 +179,26 @@ class TestSimpleExportSpanProcessor(unittest.TestCase):
         self.assertListEqual([], spans_names_list)
 
 
+def _run_in_forked_child(target):
+    """Runs ``target`` in a forked child process and returns its result."""
+    context = multiprocessing.get_context("fork")
+    parent_conn, child_conn = context.Pipe()
+
+    def run():
+        child_conn.send(target())
+
+    process = context.Process(target=run)
+    process.start()
+    result = parent_conn.recv()
+    process.join()
+    return result
+
+
+_skip_without_register_at_fork = unittest.skipUnless(
+    hasattr(os, "register_at_fork"), "requires os.register_at_fork"
+)
+
+
 def _create_start_and_end_span(name, span_processor):
     span = trace._Span(
         name,
@@ -155,6 +215,11 @@ def _create_start_and_end_span(name, span_processor):
 
 
 class TestBatchExportSpanProcessor(unittest.TestCase):
+    def setUp(self) -> None:
+        # configuration may have been loaded by an earlier test
+        # pylint: disable=protected-access
+        Configuration._reset()
+
     def tearDown(self) -> None:
         # reset global state of configuration object
         # pylint: disable=protected-access
@@ -167,6 +232,7 @@ class TestBatchExportSpanProcessor(unittest.TestCase):
             "OTEL_BSP_SCHEDULE_DELAY_MILLIS": "2",
             "OTEL_BSP_MAX_EXPORT_BATCH_SIZE": "3",
             "OTEL_BSP_EXPORT_TIMEOUT_MILLIS": "4",
+            "OTEL_BSP_MAX_EXPORT_WORKERS": "5",
         },
     )
     def test_batch_span_processor_environment_variables(self):
@@ -179,6 +245,7 @@ class TestBatchExportSpanProcessor(unittest.TestCase):
         self.assertEqual(batch_span_processor.schedule_delay_millis, 2)
         self.assertEqual(batch_span_processor.max_export_batch_size, 3)
         self.assertEqual(batch_span_processor.export_timeout_millis, 4)
+        self.assertEqual(batch_span_processor.max_export_workers, 5)
 
     def test_on_start_accepts_parent_context(self):
         # pylint: disable=no-self-use
@@ -473,6 +540,722 @@ class TestBatchExportSpanProcessor(unittest.TestCase):
             max_export_batch_size=512,
         )
 
+        # zero max_export_workers
+        self.assertRaises(
+            ValueError,
+            export.BatchExportSpanProcessor,
+            None,
+            max_export_workers=0,
+        )
+
+    def test_max_export_workers(self):
+        spans_names_list = []
+        my_exporter = SlowSpanExporter(spans_names_list, delay=0.05)
+        span_processor = export.BatchExportSpanProcessor(
+            my_exporter, max_export_batch_size=2, max_export_workers=3
+        )
+
+        span_names = [str(idx) for idx in range(20)]
+        for name in span_names:
+            _create_start_and_end_span(name, span_processor)
+
+        # all batches are exported once the flush returns
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(sorted(spans_names_list), sorted(span_names))
+        self.assertGreater(my_exporter.max_concurrent_exports, 1)
+        self.assertLessEqual(my_exporter.max_concurrent_exports, 3)
+
+        _create_start_and_end_span("last", span_processor)
+        span_processor.shutdown()
+        self.assertIn("last", spans_names_list)
+        self.assertTrue(my_exporter.is_shutdown)
+        self.assertEqual(my_exporter.concurrent_exports, 0)
+
+    def test_counters(self):
+        spans_names_list = []
+        my_exporter = BlockingSpanExporter(destination=spans_names_list)
+        span_processor = export.BatchExportSpanProcessor(
+            my_exporter, max_queue_size=4, max_export_batch_size=2
+        )
+        # overflow the queue while the first batch is being exported
+        for name in ("0", "1"):
+            _create_start_and_end_span(name, span_processor)
+        self.assertTrue(my_exporter.export_started.wait(5))
+        for idx in range(2, 8):
+            _create_start_and_end_span(str(idx), span_processor)
+        my_exporter.release.set()
+
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(span_processor.spans_enqueued, 8)
+        self.assertEqual(span_processor.spans_dropped, 2)
+        self.assertEqual(span_processor.spans_exported, 6)
+        self.assertEqual(span_processor.spans_failed, 0)
+        # the oldest spans were dropped
+        self.assertEqual(spans_names_list, ["0", "1", "4", "5", "6", "7"])
+
+        my_exporter.export = mock.Mock(
+            return_value=export.SpanExportResult.FAILURE
+        )
+        _create_start_and_end_span("failed", span_processor)
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(span_processor.spans_failed, 1)
+
+        span_processor.shutdown()
+        _create_start_and_end_span("after shutdown", span_processor)
+        self.assertEqual(span_processor.spans_dropped, 3)
+
+    def test_counters_of_exited_threads(self):
+        my_exporter = BlockingSpanExporter(destination=[])
+        span_processor = export.BatchExportSpanProcessor(
+            my_exporter, max_queue_size=4, max_export_batch_size=2
+        )
+        _create_start_and_end_span("0", span_processor)
+        _create_start_and_end_span("1", span_processor)
+        self.assertTrue(my_exporter.export_started.wait(5))
+
+        def end_spans(thread_no):
+            for idx in range(3):
+                _create_start_and_end_span(
+                    "{}-{}".format(thread_no, idx), span_processor
+                )
+
+        # the counts of exited threads are kept when new threads end spans
+        for thread_no in range(3):
+            thread = threading.Thread(target=end_spans, args=(thread_no,))
+            thread.start()
+            thread.join()
+        self.assertEqual(span_processor.spans_enqueued, 11)
+        self.assertEqual(span_processor.spans_dropped, 5)
+
+        my_exporter.release.set()
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(span_processor.spans_exported, 6)
+        span_processor.shutdown()
+
+    def test_overflow_policy_drop_newest(self):
+        spans_names_list = []
+        my_exporter = BlockingSpanExporter(destination=spans_names_list)
+        span_processor = export.BatchExportSpanProcessor(
+            my_exporter,
+            max_queue_size=4,
+            max_export_batch_size=2,
+            overflow_policy=export.QueueOverflowPolicy.DROP_NEWEST,
+        )
+        for name in ("0", "1"):
+            _create_start_and_end_span(name, span_processor)
+        self.assertTrue(my_exporter.export_started.wait(5))
+        for idx in range(2, 8):
+            _create_start_and_end_span(str(idx), span_processor)
+        my_exporter.release.set()
+
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(spans_names_list, ["0", "1", "2", "3", "4", "5"])
+        self.assertEqual(span_processor.spans_enqueued, 6)
+        self.assertEqual(span_processor.spans_dropped, 2)
+        span_processor.shutdown()
+
+    def test_on_end_notifies_once_per_batch(self):
+        my_exporter = BlockingSpanExporter(destination=[])
+        span_processor = export.BatchExportSpanProcessor(
+            my_exporter,
+            schedule_delay_millis=60000,
+            max_queue_size=8,
+            max_export_batch_size=4,
+        )
+        with span_processor.condition:
+            self.assertTrue(
+                span_processor.condition.wait_for(
+                    lambda: span_processor._worker_waiting, 5
+                )
+            )
+        with mock.patch.object(
+            span_processor.condition,
+            "notify",
+            wraps=span_processor.condition.notify,
+        ) as mock_notify:
+            for idx in range(3):
+                _create_start_and_end_span(str(idx), span_processor)
+            mock_notify.assert_not_called()
+
+            _create_start_and_end_span("3", span_processor)
+            self.assertTrue(my_exporter.export_started.wait(5))
+            # the worker is busy exporting, crossing the threshold again
+            # must not notify it
+            for idx in range(4, 12):
+                _create_start_and_end_span(str(idx), span_processor)
+            self.assertEqual(mock_notify.call_count, 1)
+
+        my_exporter.release.set()
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(len(my_exporter.destination), 12)
+        span_processor.shutdown()
+
+    def test_overflow_policy_block(self):
+        spans_names_list = []
+        span_processor = export.BatchExportSpanProcessor(
+            MySpanExporter(destination=spans_names_list),
+            max_queue_size=4,
+            max_export_batch_size=2,
+            overflow_policy=export.QueueOverflowPolicy.BLOCK,
+        )
+        span_names = [str(idx) for idx in range(50)]
+        for name in span_names:
+            _create_start_and_end_span(name, span_processor)
+
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(spans_names_list, span_names)
+        self.assertEqual(span_processor.spans_dropped, 0)
+        self.assertEqual(span_processor.spans_exported, 50)
+        span_processor.shutdown()
+
+    def test_overflow_policy_block_timeout(self):
+        spans_names_list = []
+        my_exporter = BlockingSpanExporter(destination=spans_names_list)
+        span_processor = export.BatchExportSpanProcessor(
+            my_exporter,
+            max_queue_size=2,
+            max_export_batch_size=2,
+            overflow_policy=export.QueueOverflowPolicy.BLOCK,
+            block_timeout_millis=10,
+        )
+        for name in ("0", "1"):
+            _create_start_and_end_span(name, span_processor)
+        self.assertTrue(my_exporter.export_started.wait(5))
+        for idx in range(2, 5):
+            _create_start_and_end_span(str(idx), span_processor)
+        my_exporter.release.set()
+
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(spans_names_list, ["0", "1", "2", "3"])
+        self.assertEqual(span_processor.spans_dropped, 1)
+        span_processor.shutdown()
+
+    def test_batch_kept_by_exporter(self):
+        kept_batches = []
+
+        class KeepingSpanExporter(export.SpanExporter):
+            def export(self, spans):
+                kept_batches.append(spans)
+                return export.SpanExportResult.SUCCESS
+
+        mock_exporter = mock.Mock(spec=export.SpanExporter)
+        mock_exporter.export.return_value = export.SpanExportResult.SUCCESS
+        tracer_provider = trace.TracerProvider(shutdown_on_exit=False)
+        for exporter in (KeepingSpanExporter(), mock_exporter):
+            span_processor = export.BatchExportSpanProcessor(exporter)
+            self.addCleanup(span_processor.shutdown)
+            tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        span = tracer.start_span("kept")
+        span.end()
+        self.assertTrue(tracer_provider.force_flush())
+
+        self.assertEqual(kept_batches, [[span]])
+        mock_exporter.export.assert_called_once_with([span])
+
+    def test_span_pool(self):
+        span_pool = trace.SpanPool()
+        tracer_provider = trace.TracerProvider(
+            span_pool=span_pool, shutdown_on_exit=False
+        )
+        span_processor = export.BatchExportSpanProcessor(
+            MySpanExporter(destination=[])
+        )
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        def create_released_span():
+            with tracer.start_as_current_span("released") as span:
+                span.set_attribute("key", "value")
+            return id(span)
+
+        released_span_id = create_released_span()
+        self.assertTrue(span_processor.force_flush())
+
+        # the span processor released the span once exported
+        self.assertEqual(len(span_pool), 1)
+        recycled = tracer.start_span("recycled")
+        self.assertEqual(len(span_pool), 0)
+        self.assertEqual(id(recycled), released_span_id)
+        self.assertIsNone(recycled.end_time)
+        self.assertEqual(len(recycled.attributes), 0)
+
+        # spans are only released once
+        trace.SpanPool.release([recycled])
+        self.assertEqual(len(span_pool), 0)
+        span_processor.shutdown()
+
+    def test_span_pool_stale_reference(self):
+        span_pool = trace.SpanPool()
+        tracer_provider = trace.TracerProvider(
+            span_pool=span_pool, shutdown_on_exit=False
+        )
+        span_processor = export.BatchExportSpanProcessor(
+            MySpanExporter(destination=[])
+        )
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        with tracer.start_as_current_span("held") as held_span:
+            held_span.set_attribute("key", "value")
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(len(span_pool), 1)
+
+        # the held span is not reused for the new span
+        new_span = tracer.start_span("new")
+        self.assertIsNot(new_span, held_span)
+        self.assertEqual(len(span_pool), 0)
+
+        # so the stale reference neither changes nor reads the new span
+        held_span.set_attribute("leak", "value")
+        self.assertEqual(len(new_span.attributes), 0)
+        self.assertEqual(held_span.name, "held")
+        self.assertEqual(held_span.attributes, {"key": "value"})
+        new_span.end()
+        span_processor.shutdown()
+
+    def test_span_pool_not_released_by_all_processors(self):
+        span_pool = trace.SpanPool()
+        tracer_provider = trace.TracerProvider(
+            span_pool=span_pool, shutdown_on_exit=False
+        )
+        span_processor = export.BatchExportSpanProcessor(
+            MySpanExporter(destination=[])
+        )
+        tracer_provider.add_span_processor(span_processor)
+        spans_names_list = []
+        tracer_provider.add_span_processor(
+            export.SimpleExportSpanProcessor(
+                MySpanExporter(destination=spans_names_list)
+            )
+        )
+        tracer = tracer_provider.get_tracer(__name__)
+
+        with tracer.start_as_current_span("held") as held_span:
+            held_span.set_attribute("key", "value")
+        self.assertTrue(span_processor.force_flush())
+
+        # the simple span processor does not release spans
+        self.assertEqual(len(span_pool), 0)
+        self.assertEqual(spans_names_list, ["held"])
+        self.assertEqual(held_span.attributes, {"key": "value"})
+        span_processor.shutdown()
+
+    def test_span_pool_stress(self):
+        span_pool = trace.SpanPool()
+        tracer_provider = trace.TracerProvider(
+            span_pool=span_pool, shutdown_on_exit=False
+        )
+        mismatches = []
+
+        class CheckingSpanExporter(export.SpanExporter):
+            def export(self, spans):
+                for span in spans:
+                    if span.attributes.get("name") != span.name:
+                        mismatches.append(span.name)
+                return export.SpanExportResult.SUCCESS
+
+        span_processor = export.BatchExportSpanProcessor(
+            CheckingSpanExporter(), schedule_delay_millis=1
+        )
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+        num_threads = 8
+        num_spans = 2000
+
+        def create_spans(thread_index):
+            for index in range(num_spans):
+                name = "{}-{}".format(thread_index, index)
+                tracer.start_span(name, attributes={"name": name}).end()
+
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            list(executor.map(create_spans, range(num_threads)))
+        self.assertTrue(span_processor.force_flush())
+        span_processor.shutdown()
+
+        self.assertEqual(mismatches, [])
+        self.assertGreater(len(span_pool), 0)
+
+    @_skip_without_register_at_fork
+    def test_fork(self):
+        spans_names_list = []
+        my_exporter = MySpanExporter(destination=spans_names_list)
+        span_processor = export.BatchExportSpanProcessor(
+            my_exporter, max_export_workers=2
+        )
+        self.addCleanup(span_processor.shutdown)
+        _create_start_and_end_span("parent", span_processor)
+
+        def child():
+            _create_start_and_end_span("child", span_processor)
+            flushed = span_processor.force_flush()
+            return (
+                flushed,
+                spans_names_list,
+                span_processor.spans_enqueued,
+                span_processor.worker_thread.is_alive(),
+            )
+
+        # the span queued in the parent is only exported by the parent
+        self.assertEqual(
+            _run_in_forked_child(child), (True, ["child"], 1, True)
+        )
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(spans_names_list, ["parent"])
+
+
+class AsyncMySpanExporter(export.AsyncSpanExporter):
+    """Very simple async span exporter used for testing."""
+
+    def __init__(self, destination, delay=0):
+        self.destination = destination
+        self.delay = delay
+        self.exports_in_progress = 0
+        self.max_exports_in_progress = 0
+        self.is_shutdown = False
+
+    async def export(self, spans):
+        self.exports_in_progress += 1
+        self.max_exports_in_progress = max(
+            self.max_exports_in_progress, self.exports_in_progress
+        )
+        await asyncio.sleep(self.delay)
+        self.destination.extend(span.name for span in spans)
+        self.exports_in_progress -= 1
+        return export.SpanExportResult.SUCCESS
+
+    async def shutdown(self):
+        self.is_shutdown = True
+
+
+class TestAsyncBatchExportSpanProcessor(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.spans_names_list = []
+
+    def test_shutdown(self):
+        exporter = AsyncMySpanExporter(destination=self.spans_names_list)
+        span_processor = export.AsyncBatchExportSpanProcessor(
+            exporter, loop=self.loop, max_export_batch_size=2
+        )
+        span_names = ["xxx", "bar", "foo"]
+        for name in span_names:
+            _create_start_and_end_span(name, span_processor)
+
+        # the event loop is not running, shutdown runs it
+        span_processor.shutdown()
+        self.assertListEqual(span_names, self.spans_names_list)
+        self.assertTrue(exporter.is_shutdown)
+
+    def test_async_force_flush(self):
+        exporter = AsyncMySpanExporter(destination=self.spans_names_list)
+
+        async def run():
+            span_processor = export.AsyncBatchExportSpanProcessor(
+                exporter, max_export_batch_size=4
+            )
+            for idx in range(10):
+                _create_start_and_end_span(str(idx), span_processor)
+            self.assertTrue(await span_processor.async_force_flush())
+            self.assertEqual(len(self.spans_names_list), 10)
+
+            with self.assertLogs(level=WARNING):
+                self.assertFalse(span_processor.force_flush())
+
+            await span_processor.async_shutdown()
+            self.assertTrue(exporter.is_shutdown)
+
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+        self.loop.run_until_complete(run())
+
+    def test_max_concurrent_exports(self):
+        exporter = AsyncMySpanExporter(
+            destination=self.spans_names_list, delay=0.01
+        )
+        span_processor = export.AsyncBatchExportSpanProcessor(
+            exporter,
+            loop=self.loop,
+            max_export_batch_size=2,
+            max_concurrent_exports=3,
+        )
+        for idx in range(20):
+            _create_start_and_end_span(str(idx), span_processor)
+
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(len(self.spans_names_list), 20)
+        self.assertEqual(exporter.max_exports_in_progress, 3)
+        span_processor.shutdown()
+
+    def test_spans_ended_in_other_threads(self):
+        loop_thread = threading.Thread(target=self.loop.run_forever)
+        loop_thread.start()
+
+        exporter = AsyncMySpanExporter(destination=self.spans_names_list)
+        span_processor = export.AsyncBatchExportSpanProcessor(
+            exporter,
+            loop=self.loop,
+            max_export_batch_size=64,
+            schedule_delay_millis=60000,
+        )
+
+        def create_spans():
+            for idx in range(64):
+                _create_start_and_end_span(str(idx), span_processor)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for _ in range(4):
+                executor.submit(create_spans)
+
+        # full batches are exported without waiting for the delay
+        for _ in range(50):
+            if len(self.spans_names_list) == 256:
+                break
+            time.sleep(0.1)
+        self.assertEqual(len(self.spans_names_list), 256)
+
+        _create_start_and_end_span("last", span_processor)
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(self.spans_names_list[-1], "last")
+
+        span_processor.shutdown()
+        self.assertTrue(exporter.is_shutdown)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        loop_thread.join()
+
+    def test_export_exception(self):
+        exporter = AsyncMySpanExporter(destination=None)
+        span_processor = export.AsyncBatchExportSpanProcessor(
+            exporter, loop=self.loop
+        )
+        _create_start_and_end_span("foo", span_processor)
+        with self.assertLogs(level=ERROR):
+            self.assertTrue(span_processor.force_flush())
+        span_processor.shutdown()
+
+    def test_closed_loop(self):
+        span_processor = export.AsyncBatchExportSpanProcessor(
+            AsyncMySpanExporter(destination=self.spans_names_list),
+            loop=self.loop,
+        )
+        self.loop.close()
+        _create_start_and_end_span("foo", span_processor)
+        with self.assertLogs(level=WARNING):
+            span_processor.shutdown()
+
+    def test_invalid_arguments(self):
+        exporter = AsyncMySpanExporter(destination=self.spans_names_list)
+        for kwargs in (
+            {"max_queue_size": 0},
+            {"schedule_delay_millis": 0},
+            {"max_export_batch_size": 0},
+            {"max_queue_size": 2, "max_export_batch_size": 4},
+            {"max_concurrent_exports": 0},
+        ):
+            with self.assertRaises(ValueError):
+                export.AsyncBatchExportSpanProcessor(
+                    exporter, loop=self.loop, **kwargs
+                )
+        # the loop is required outside of a coroutine
+        with self.assertRaises(ValueError):
+            export.AsyncBatchExportSpanProcessor(exporter)
+
+
+class TestTraceBufferingSpanProcessor(unittest.TestCase):
+    def setUp(self):
+        self.spans_names_list = []
+        self.exporter = MySpanExporter(destination=self.spans_names_list)
+
+    def _create_tracer(self, **kwargs):
+        span_processor = export.TraceBufferingSpanProcessor(
+            export.SimpleExportSpanProcessor(self.exporter), **kwargs
+        )
+        self.addCleanup(span_processor.shutdown)
+        tracer_provider = trace.TracerProvider()
+        tracer_provider.add_span_processor(span_processor)
+        return tracer_provider.get_tracer(__name__), span_processor
+
+    def test_complete_trace(self):
+        tracer, _ = self._create_tracer()
+        with tracer.start_as_current_span("root"):
+            with tracer.start_as_current_span("child"):
+                pass
+            self.assertEqual(self.spans_names_list, [])
+        self.assertEqual(self.spans_names_list, ["child", "root"])
+
+    def test_decision(self):
+        def has_error(spans):
+            return any(not span.status.is_ok for span in spans)
+
+        tracer, _ = self._create_tracer(decision=has_error)
+        with tracer.start_as_current_span("ok"):
+            with tracer.start_as_current_span("ok_child"):
+                pass
+        with tracer.start_as_current_span("error"):
+            with self.assertRaises(ValueError):
+                with tracer.start_as_current_span("error_child"):
+                    raise ValueError
+        self.assertEqual(self.spans_names_list, ["error_child", "error"])
+
+    def test_decision_exception(self):
+        def decision(spans):
+            raise ValueError
+
+        tracer, _ = self._create_tracer(decision=decision)
+        with self.assertLogs(level=ERROR):
+            with tracer.start_as_current_span("root"):
+                pass
+        self.assertEqual(self.spans_names_list, ["root"])
+
+    def test_trace_timeout(self):
+        decisions = []
+
+        def decision(spans):
+            decisions.append([span.name for span in spans])
+            return False
+
+        tracer, _ = self._create_tracer(
+            decision=decision, trace_timeout_millis=10
+        )
+        root = tracer.start_span("root")
+        with tracer.start_as_current_span(
+            "child", context=trace_api.set_span_in_context(root)
+        ):
+            pass
+        time.sleep(0.1)
+        self.assertEqual(decisions, [["child"]])
+        # spans ending after the timeout follow the decision of their trace
+        root.end()
+        self.assertEqual(decisions, [["child"]])
+        self.assertEqual(self.spans_names_list, [])
+
+    def test_child_after_decision(self):
+        decisions = []
+
+        def decision(spans):
+            decisions.append([span.name for span in spans])
+            return any(span.name == "c1" for span in spans)
+
+        tracer, _ = self._create_tracer(
+            decision=decision, trace_timeout_millis=10
+        )
+        root = tracer.start_span("root")
+        parent_context = trace_api.set_span_in_context(root)
+        tracer.start_span("c1", context=parent_context).end()
+        time.sleep(0.1)
+        self.assertEqual(decisions, [["c1"]])
+
+        # a child starting and ending after the decision follows it instead
+        # of being decided on its own
+        tracer.start_span("late-child", context=parent_context).end()
+        root.end()
+        self.assertEqual(decisions, [["c1"]])
+        self.assertEqual(self.spans_names_list, ["c1", "late-child", "root"])
+
+    def test_max_traces(self):
+        tracer, span_processor = self._create_tracer(max_traces=2)
+        spans = [tracer.start_span(str(idx)) for idx in range(3)]
+        self.assertEqual(len(span_processor._traces), 2)
+        for span in spans:
+            span.end()
+        self.assertEqual(self.spans_names_list, ["0", "1", "2"])
+
+    def test_max_spans(self):
+        tracer, span_processor = self._create_tracer(max_spans=2)
+        with tracer.start_as_current_span("root"):
+            for idx in range(3):
+                with tracer.start_as_current_span(str(idx)):
+                    pass
+            # the trace is passed on early as it has too many spans
+            self.assertEqual(self.spans_names_list, ["0", "1", "2"])
+            self.assertEqual(span_processor._buffered_spans, 0)
+        self.assertEqual(self.spans_names_list, ["0", "1", "2", "root"])
+
+    def test_force_flush(self):
+        tracer, span_processor = self._create_tracer()
+        root = tracer.start_span("root")
+        with tracer.start_as_current_span(
+            "child", context=trace_api.set_span_in_context(root)
+        ):
+            pass
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(self.spans_names_list, ["child"])
+        root.end()
+        self.assertEqual(self.spans_names_list, ["child", "root"])
+
+    def test_shutdown(self):
+        tracer, span_processor = self._create_tracer()
+        tracer.start_span("root")
+        with tracer.start_as_current_span("span"):
+            pass
+        span_processor.shutdown()
+        self.assertEqual(self.spans_names_list, ["span"])
+        self.assertTrue(self.exporter.is_shutdown)
+
+    def test_invalid_arguments(self):
+        processor = export.SimpleExportSpanProcessor(self.exporter)
+        for kwargs in (
+            {"trace_timeout_millis": 0},
+            {"max_traces": 0},
+            {"max_spans": 0},
+        ):
+            with self.assertRaises(ValueError):
+                export.TraceBufferingSpanProcessor(processor, **kwargs)
+
+    @_skip_without_register_at_fork
+    def test_fork(self):
+        tracer, span_processor = self._create_tracer()
+        parent_root = tracer.start_span("parent_root")
+        with tracer.start_as_current_span(
+            "parent_child", context=trace_api.set_span_in_context(parent_root)
+        ):
+            pass
+
+        def child():
+            with tracer.start_as_current_span("child"):
+                pass
+            self.assertTrue(span_processor.force_flush())
+            return self.spans_names_list
+
+        self.assertEqual(_run_in_forked_child(child), ["child"])
+        parent_root.end()
+        self.assertEqual(
+            self.spans_names_list, ["parent_child", "parent_root"]
+        )
+
+
+class TestGroupSpansByResource(unittest.TestCase):
+    def test_group_spans_by_resource(self):
+        first_provider = trace.TracerProvider()
+        second_provider = trace.TracerProvider()
+        first_tracer = first_provider.get_tracer("first")
+        second_tracer = first_provider.get_tracer("second")
+        other_tracer = second_provider.get_tracer("first")
+
+        spans = [
+            tracer.start_span(str(idx))
+            for idx, tracer in enumerate(
+                (first_tracer, second_tracer, first_tracer, other_tracer)
+            )
+        ]
+        groups = export.group_spans_by_resource(spans)
+
+        self.assertEqual(
+            [
+                (resource, instrumentation_info.name, group)
+                for resource, instrumentation_info, group in groups
+            ],
+            [
+                (first_provider.resource, "first", [spans[0], spans[2]]),
+                (first_provider.resource, "second", [spans[1]]),
+                (second_provider.resource, "first", [spans[3]]),
+            ],
+        )
+        self.assertIs(groups[2][0], second_provider.resource)
+        self.assertEqual(export.group_spans_by_resource([]), [])
+
 
 class TestConsoleSpanExporter(unittest.TestCase):
     def test_export(self):  # pylint: disable=no-self-use
@@ -501,3 +1284,19 @@ class TestConsoleSpanExporter(unittest.TestCase):
         )
         exporter.export([trace._Span("span name", mock.Mock())])
         mock_stdout.write.assert_called_once_with(mock_span_str)
+
+    def test_export_json_lines(self):
+        mock_stdout = mock.Mock()
+        exporter = export.ConsoleSpanExporter(out=mock_stdout, json_lines=True)
+        spans = [
+            trace._Span(name, trace_api.INVALID_SPAN_CONTEXT)
+            for name in ("span 1", "span 2")
+        ]
+        exporter.export(spans)
+        mock_stdout.write.assert_called_once_with(
+            spans[0].to_json_line()
+            + os.linesep
+            + spans[1].to_json_line()
+            + os.linesep
+        )
+        self.assertEqual(mock_stdout.flush.call_count, 1)
@@ -0,0 +1,227 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from opentelemetry.sdk.trace import remote_sampling, sampling
+
+_SAMPLED_TRACE_ID = 0x1
+_DROPPED_TRACE_ID = 0xFFFFFFFFFFFFFFFF
+
+
+def _operation_strategies(default, lower_bound=0, **operations):
+    return {
+        "strategyType": "PROBABILISTIC",
+        "probabilisticSampling": {"samplingRate": default},
+        "operationSampling": {
+            "defaultSamplingProbability": default,
+            "defaultLowerBoundTracesPerSecond": lower_bound,
+            "perOperationStrategies": [
+                {
+                    "operation": operation,
+                    "probabilisticSampling": {"samplingRate": rate},
+                }
+                for operation, rate in operations.items()
+            ],
+        },
+    }
+
+
+class _StrategiesHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.server.paths.append(self.path)
+        body = self.server.body
+        if body is None:
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class TestJaegerRemoteSampler(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(("localhost", 0), _StrategiesHandler)
+        self.server.paths = []
+        self.set_strategies(_operation_strategies(0))
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.start()
+        self.url = "http://localhost:{}/sampling?service=test".format(
+            self.server.server_port
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+
+    def set_strategies(self, strategies):
+        self.server.body = (
+            None if strategies is None else json.dumps(strategies).encode()
+        )
+
+    def create_sampler(self, source=None, **kwargs):
+        # the background updates are tested separately
+        kwargs.setdefault("polling_interval_millis", 3600000)
+        sampler = remote_sampling.JaegerRemoteSampler(
+            source or self.url, **kwargs
+        )
+        self.addCleanup(sampler.shutdown)
+        return sampler
+
+    @staticmethod
+    def is_sampled(sampler, name, trace_id=_DROPPED_TRACE_ID):
+        return sampler.should_sample(
+            None, trace_id, name
+        ).decision.is_sampled()
+
+    def test_operation_strategies(self):
+        self.set_strategies(_operation_strategies(0, **{"/checkout": 1}))
+        sampler = self.create_sampler()
+        self.assertTrue(sampler.update())
+
+        self.assertTrue(self.is_sampled(sampler, "/checkout"))
+        self.assertFalse(self.is_sampled(sampler, "/cart"))
+        self.assertIn("/sampling?service=test", self.server.paths)
+
+    def test_update_replaces_strategies(self):
+        self.set_strategies(
+            _operation_strategies(0, **{"/checkout": 1, "/cart": 0.5})
+        )
+        sampler = self.create_sampler()
+        sampler.update()
+
+        self.set_strategies(
+            _operation_strategies(1, **{"/checkout": 0, "/cart": 0.5})
+        )
+        self.assertTrue(sampler.update())
+        self.assertFalse(self.is_sampled(sampler, "/checkout"))
+        self.assertTrue(self.is_sampled(sampler, "/other"))
+
+    def test_lower_bound(self):
+        operations = {"/cart": 0, "/checkout": 0}
+        self.set_strategies(
+            _operation_strategies(0, lower_bound=0.001, **operations)
+        )
+        sampler = self.create_sampler()
+        sampler.update()
+
+        self.assertTrue(self.is_sampled(sampler, "/cart"))
+        self.assertFalse(self.is_sampled(sampler, "/cart"))
+        # operations have their own lower bound
+        self.assertTrue(self.is_sampled(sampler, "/checkout"))
+        # traces sampled by probability count towards the lower bound, which
+        # is kept across updates
+        self.set_strategies(
+            _operation_strategies(0, lower_bound=0.001, **{"/cart": 1})
+        )
+        sampler.update()
+        self.assertTrue(self.is_sampled(sampler, "/cart"))
+        self.set_strategies(
+            _operation_strategies(0, lower_bound=0.001, **operations)
+        )
+        sampler.update()
+        self.assertFalse(self.is_sampled(sampler, "/cart"))
+
+    def test_service_strategies(self):
+        self.set_strategies(
+            {
+                "strategyType": "RATE_LIMITING",
+                "rateLimitingSampling": {"maxTracesPerSecond": 1},
+            }
+        )
+        sampler = self.create_sampler()
+        sampler.update()
+        self.assertTrue(self.is_sampled(sampler, "/cart"))
+        self.assertFalse(self.is_sampled(sampler, "/cart"))
+
+        self.set_strategies(
+            {"strategyType": 0, "probabilisticSampling": {"samplingRate": 1}}
+        )
+        sampler.update()
+        self.assertTrue(self.is_sampled(sampler, "/cart"))
+
+    def test_failures_keep_strategies(self):
+        self.set_strategies(_operation_strategies(1))
+        sampler = self.create_sampler()
+        sampler.update()
+
+        for strategies in (
+            None,
+            {"strategyType": "UNKNOWN"},
+            {"probabilisticSampling": {"samplingRate": 2}},
+            {"operationSampling": {"perOperationStrategies": [{}]}},
+            [],
+        ):
+            with self.subTest(strategies=strategies):
+                self.set_strategies(strategies)
+                with self.assertLogs(level="WARNING"):
+                    self.assertFalse(sampler.update())
+                self.assertTrue(self.is_sampled(sampler, "/cart"))
+
+    def test_initial_sampler(self):
+        self.set_strategies(None)
+        sampler = self.create_sampler(initial_sampler=sampling.ALWAYS_OFF)
+        self.assertFalse(
+            self.is_sampled(sampler, "/cart", trace_id=_SAMPLED_TRACE_ID)
+        )
+
+        sampler = self.create_sampler()
+        self.assertTrue(
+            self.is_sampled(sampler, "/cart", trace_id=_SAMPLED_TRACE_ID)
+        )
+        self.assertFalse(self.is_sampled(sampler, "/cart"))
+
+    def test_file_source(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "strategies.json")
+            with open(path, "w") as strategies_file:
+                json.dump(
+                    _operation_strategies(0, **{"/checkout": 1}),
+                    strategies_file,
+                )
+            sampler = self.create_sampler(path)
+            self.assertTrue(sampler.update())
+        self.assertTrue(self.is_sampled(sampler, "/checkout"))
+        self.assertFalse(self.is_sampled(sampler, "/cart"))
+
+    def test_background_updates(self):
+        sampler = self.create_sampler(polling_interval_millis=10)
+        self.set_strategies(_operation_strategies(1))
+        deadline = time.time() + 5
+        while not self.is_sampled(sampler, "/cart"):
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+
+        sampler.shutdown()
+        sampler._worker_thread.join()
+        requests = len(self.server.paths)
+        time.sleep(0.05)
+        self.assertEqual(len(self.server.paths), requests)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            remote_sampling.JaegerRemoteSampler(
+                self.url, polling_interval_millis=0
+            )
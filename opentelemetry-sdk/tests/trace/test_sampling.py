@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
+import random
 import sys
+import threading
 import unittest
+from unittest import mock
 
 from opentelemetry import trace
 from opentelemetry.sdk.trace import sampling
@@ -107,6 +111,8 @@ class TestSampler(unittest.TestCase):
         )
         self.assertFalse(sampled_always_on.decision.is_sampled())
         self.assertEqual(sampled_always_on.attributes, {})
+        # dropping returns a shared result instead of allocating one
+        self.assertIs(no_record_always_off, sampled_always_on)
 
     def test_default_on(self):
         context = trace.set_span_in_context(
@@ -337,3 +343,326 @@ class TestSampler(unittest.TestCase):
                 context, 0x8000000000000000, 0xDEADBEEF, "span name",
             ).decision.is_sampled()
         )
+
+    @mock.patch("opentelemetry.sdk.trace.sampling.time_ns")
+    def test_rate_limiting_sampler(self, mock_time_ns):
+        mock_time_ns.return_value = int(1e9)
+        sampler = sampling.RateLimitingSampler(2)
+
+        def is_sampled():
+            return sampler.should_sample(
+                None, 0xDEADBEEF, "span name"
+            ).decision.is_sampled()
+
+        # up to traces_per_second traces at once
+        self.assertTrue(is_sampled())
+        self.assertTrue(is_sampled())
+        self.assertFalse(is_sampled())
+
+        mock_time_ns.return_value += int(0.5e9)
+        self.assertTrue(is_sampled())
+        self.assertFalse(is_sampled())
+
+        mock_time_ns.return_value += int(10e9)
+        self.assertTrue(is_sampled())
+        self.assertTrue(is_sampled())
+        self.assertFalse(is_sampled())
+
+        self.assertEqual(sampler.get_description(), "RateLimitingSampler{2}")
+
+    @mock.patch("opentelemetry.sdk.trace.sampling.time_ns")
+    def test_rate_limiting_sampler_bursty_load(self, mock_time_ns):
+        sampler = sampling.RateLimitingSampler(10)
+        # spans per second, with spikes of 100 times the usual traffic
+        load = [5, 5, 500, 500, 500, 5, 5, 500, 5, 5]
+        sampled_per_second = []
+        for second, spans in enumerate(load):
+            sampled = 0
+            for span in range(spans):
+                mock_time_ns.return_value = int((second + span / spans) * 1e9)
+                if sampler.should_sample(
+                    None, span, "span name"
+                ).decision.is_sampled():
+                    sampled += 1
+            sampled_per_second.append(sampled)
+
+        for spans, sampled in zip(load, sampled_per_second):
+            if spans <= 10:
+                self.assertEqual(sampled, spans)
+            else:
+                # a burst of up to 10 traces may be sampled on top of the
+                # rate after a quiet period
+                self.assertGreaterEqual(sampled, 10)
+                self.assertLessEqual(sampled, 20)
+        # during long spikes the rate stays at the limit
+        self.assertEqual(sampled_per_second[3:5], [10, 10])
+
+    @mock.patch("opentelemetry.sdk.trace.sampling.time_ns")
+    def test_rate_limiting_sampler_threads(self, mock_time_ns):
+        mock_time_ns.return_value = int(1e9)
+        sampler = sampling.RateLimitingSampler(100)
+        sampled = []
+
+        def sample():
+            for _ in range(1000):
+                if sampler.should_sample(
+                    None, 0xDEADBEEF, "span name"
+                ).decision.is_sampled():
+                    sampled.append(True)
+
+        threads = [threading.Thread(target=sample) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(sampled), 100)
+
+    @mock.patch("opentelemetry.sdk.trace.sampling.time_ns")
+    def test_rate_limiting_sampler_parent_based(self, mock_time_ns):
+        mock_time_ns.return_value = int(1e9)
+        sampler = sampling.ParentBased(sampling.RateLimitingSampler(1))
+        self.assertTrue(
+            sampler.should_sample(
+                None, 0xDEADBEEF, "span name"
+            ).decision.is_sampled()
+        )
+        self.assertFalse(
+            sampler.should_sample(
+                None, 0xDEADBEEF, "span name"
+            ).decision.is_sampled()
+        )
+
+        # children of sampled spans are sampled even over the rate
+        context = trace.set_span_in_context(
+            trace.DefaultSpan(
+                trace.SpanContext(
+                    0xDEADBEF0,
+                    0xDEADBEF1,
+                    is_remote=False,
+                    trace_flags=TO_SAMPLED,
+                )
+            )
+        )
+        self.assertTrue(
+            sampler.should_sample(
+                context, 0xDEADBEF0, "span name"
+            ).decision.is_sampled()
+        )
+
+    def test_rate_limiting_sampler_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            sampling.RateLimitingSampler(0)
+        with self.assertRaises(ValueError):
+            sampling.RateLimitingSampler(1, max_burst=0.5)
+
+
+class TestRuleBasedSampler(unittest.TestCase):
+    def setUp(self):
+        self.sampler = sampling.RuleBasedSampler(
+            [
+                sampling.SamplingRule(sampling.ALWAYS_OFF, name="/healthz"),
+                sampling.SamplingRule(
+                    sampling.ALWAYS_ON, attributes={"http.route": "/checkout"}
+                ),
+                sampling.SamplingRule(
+                    sampling.ALWAYS_OFF,
+                    name="GET /*",
+                    attributes={"http.method": "GET"},
+                ),
+                sampling.SamplingRule(sampling.ALWAYS_ON, name="GET /[ab]*"),
+            ],
+            default=sampling.TraceIdRatioBased(0.5),
+        )
+
+    def _is_sampled(self, name, trace_id=0x8000000000000000, **attributes):
+        return self.sampler.should_sample(
+            None, trace_id, name, attributes=attributes
+        ).decision.is_sampled()
+
+    def test_exact_name(self):
+        self.assertFalse(
+            self._is_sampled("/healthz", **{"http.route": "/checkout"})
+        )
+
+    def test_attributes(self):
+        self.assertTrue(
+            self._is_sampled("checkout", **{"http.route": "/checkout"})
+        )
+        self.assertTrue(
+            self._is_sampled("GET /a", **{"http.route": "/checkout"})
+        )
+        self.assertFalse(
+            self._is_sampled(
+                "GET /a", **{"http.route": "/", "http.method": "GET"}
+            )
+        )
+
+    def test_glob_name(self):
+        self.assertTrue(self._is_sampled("GET /a"))
+        self.assertTrue(self._is_sampled("GET /bc"))
+        self.assertFalse(self._is_sampled("GET /c"))
+
+    def test_default(self):
+        self.assertFalse(self._is_sampled("other"))
+        self.assertTrue(self._is_sampled("other", 0x7FFFFFFFFFFFFFFF))
+        self.assertFalse(self._is_sampled("/healthz/other"))
+
+    def test_rules_cached_per_name(self):
+        # pylint: disable=protected-access
+        self._is_sampled("GET /a")
+        self._is_sampled("GET /a", **{"http.method": "GET"})
+        self.assertEqual(list(self.sampler._rules_by_name), ["GET /a"])
+        rules = self.sampler._rules_by_name["GET /a"]
+        # the rules after the first one matching any attributes are skipped
+        self.assertEqual(
+            [rule.name for rule in rules], [None, "GET /*", "GET /[ab]*"]
+        )
+        self.assertEqual(
+            [rule.name for rule in self.sampler._rules_for_name("/healthz")],
+            ["/healthz"],
+        )
+
+        sampler = sampling.RuleBasedSampler(
+            [], sampling.ALWAYS_ON, max_cached_names=2
+        )
+        for name in ("a", "b", "c"):
+            sampler.should_sample(None, 0xDEADBEEF, name)
+        self.assertEqual(list(sampler._rules_by_name), ["c"])
+
+    def test_parent_based(self):
+        sampler = sampling.ParentBased(self.sampler)
+        context = trace.set_span_in_context(
+            trace.DefaultSpan(
+                trace.SpanContext(
+                    0xDEADBEF0,
+                    0xDEADBEF1,
+                    is_remote=False,
+                    trace_flags=TO_SAMPLED,
+                )
+            )
+        )
+        self.assertTrue(
+            sampler.should_sample(
+                context, 0xDEADBEF0, "/healthz"
+            ).decision.is_sampled()
+        )
+        self.assertFalse(
+            sampler.should_sample(
+                None, 0xDEADBEF0, "/healthz"
+            ).decision.is_sampled()
+        )
+
+    def test_get_description(self):
+        self.assertEqual(
+            sampling.RuleBasedSampler(
+                [sampling.SamplingRule(sampling.ALWAYS_OFF, name="/healthz")],
+                sampling.ALWAYS_ON,
+            ).get_description(),
+            "RuleBasedSampler{[SamplingRule(AlwaysOffSampler, "
+            "name='/healthz', attributes={})], default=AlwaysOnSampler}",
+        )
+
+
+class TestAdaptiveSampler(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("opentelemetry.sdk.trace.sampling.time_ns")
+        self.mock_time_ns = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_time_ns.return_value = 0
+        self.random = random.Random(0)
+
+    def _simulate(self, sampler, load, start=0):
+        """Starts ``load[i]`` traces during the ith second after ``start`` and
+        returns the number of traces sampled each second.
+        """
+        sampled_per_second = []
+        for second, traces in enumerate(load, start):
+            sampled = 0
+            for trace_index in range(traces):
+                self.mock_time_ns.return_value = int(
+                    (second + trace_index / traces) * 1e9
+                )
+                if sampler.should_sample(
+                    None, self.random.getrandbits(128), "span name"
+                ).decision.is_sampled():
+                    sampled += 1
+            sampled_per_second.append(sampled)
+        return sampled_per_second
+
+    def test_diurnal_load(self):
+        sampler = sampling.AdaptiveSampler(10)
+        # a day of 20 minutes, between 5 and 200 traces per second
+        load = [
+            round(102.5 - 97.5 * math.cos(2 * math.pi * second / 1200))
+            for second in range(1200)
+        ]
+        sampled = self._simulate(sampler, load)
+
+        for minute in range(1, 20):
+            seconds = slice(minute * 60, (minute + 1) * 60)
+            if max(load[seconds]) <= 10:
+                # nearly everything is sampled when the traffic is low
+                self.assertGreaterEqual(
+                    sum(sampled[seconds]), 0.9 * sum(load[seconds])
+                )
+            elif min(load[seconds]) >= 20:
+                self.assertAlmostEqual(sum(sampled[seconds]) / 60, 10, delta=2)
+
+    def test_hysteresis(self):
+        # noisy traffic around 100 traces per second
+        load = [self.random.randint(90, 110) for _ in range(300)]
+
+        def count_rate_changes(sampler):
+            rates = []
+            for second, traces in enumerate(load):
+                self._simulate(sampler, [traces], second)
+                rates.append(sampler.rate)
+            return sum(
+                1
+                for previous, rate in zip(rates, rates[1:])
+                if previous != rate
+            )
+
+        without_hysteresis = count_rate_changes(
+            sampling.AdaptiveSampler(10, hysteresis=0)
+        )
+        with_hysteresis = count_rate_changes(sampling.AdaptiveSampler(10))
+        self.assertGreater(without_hysteresis, 50)
+        self.assertLess(with_hysteresis, 5)
+
+    def test_parent_based(self):
+        sampler = sampling.ParentBased(
+            sampling.AdaptiveSampler(10, initial_rate=0)
+        )
+        context = trace.set_span_in_context(
+            trace.DefaultSpan(
+                trace.SpanContext(
+                    0xDEADBEF0,
+                    0xDEADBEF1,
+                    is_remote=False,
+                    trace_flags=TO_SAMPLED,
+                )
+            )
+        )
+        self.assertTrue(
+            sampler.should_sample(
+                context, 0xDEADBEF0, "span name"
+            ).decision.is_sampled()
+        )
+        self.assertFalse(
+            sampler.should_sample(
+                None, 0xDEADBEF0, "span name"
+            ).decision.is_sampled()
+        )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            sampling.AdaptiveSampler(0)
+        with self.assertRaises(ValueError):
+            sampling.AdaptiveSampler(1, adjustment_interval_millis=0)
+        with self.assertRaises(ValueError):
+            sampling.AdaptiveSampler(
+                1, window_millis=1000, adjustment_interval_millis=2000
+            )
+        with self.assertRaises(ValueError):
+            sampling.AdaptiveSampler(1, hysteresis=-1)
@@ -0,0 +1,162 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from opentelemetry import trace as trace_api
+from opentelemetry.sdk import resources, trace
+from opentelemetry.sdk.trace import tail_sampling
+from opentelemetry.trace.status import Status, StatusCode
+
+
+class _Policy(tail_sampling.TailSamplingPolicy):
+    def __init__(self, keep):
+        self.keep = keep
+        self.calls = 0
+
+    def should_keep(self, spans):
+        self.calls += 1
+        return self.keep
+
+
+class TestTailSampling(unittest.TestCase):
+    def setUp(self):
+        self.tracer = trace.TracerProvider(
+            resource=resources.Resource({"service.name": "service"})
+        ).get_tracer(__name__)
+
+    def _create_trace(self, duration_millis=10, status=None, **attributes):
+        root = self.tracer.start_span(
+            "root", attributes=attributes, start_time=0
+        )
+        child = self.tracer.start_span(
+            "child", context=trace_api.set_span_in_context(root), start_time=1
+        )
+        if status is not None:
+            child.set_status(Status(status))
+        end_time = int(duration_millis * 1e6)
+        child.end(end_time=end_time - 1)
+        root.end(end_time=end_time)
+        return [child, root]
+
+    def test_any_policy(self):
+        spans = self._create_trace()
+        first, second = _Policy(False), _Policy(True)
+        self.assertTrue(tail_sampling.AnyPolicy(first, second)(spans))
+        self.assertEqual((first.calls, second.calls), (1, 1))
+
+        first, second = _Policy(True), _Policy(True)
+        self.assertTrue(tail_sampling.AnyPolicy(first, second)(spans))
+        self.assertEqual((first.calls, second.calls), (1, 0))
+
+        self.assertFalse(tail_sampling.AnyPolicy(_Policy(False))(spans))
+
+    def test_all_policy(self):
+        spans = self._create_trace()
+        first, second = _Policy(False), _Policy(True)
+        self.assertFalse(tail_sampling.AllPolicy(first, second)(spans))
+        self.assertEqual((first.calls, second.calls), (1, 0))
+
+        self.assertTrue(
+            tail_sampling.AllPolicy(_Policy(True), _Policy(True))(spans)
+        )
+
+    def test_status_code_policy(self):
+        policy = tail_sampling.StatusCodePolicy()
+        self.assertTrue(policy(self._create_trace(status=StatusCode.ERROR)))
+        self.assertFalse(policy(self._create_trace(status=StatusCode.OK)))
+        self.assertFalse(policy(self._create_trace()))
+
+        policy = tail_sampling.StatusCodePolicy(
+            (StatusCode.OK, StatusCode.ERROR)
+        )
+        self.assertTrue(policy(self._create_trace(status=StatusCode.OK)))
+
+    def test_latency_policy(self):
+        policy = tail_sampling.LatencyPolicy(100)
+        self.assertTrue(policy(self._create_trace(duration_millis=100)))
+        self.assertFalse(policy(self._create_trace(duration_millis=99)))
+
+        # the root span has not ended
+        child, _ = self._create_trace(duration_millis=200)
+        self.assertTrue(policy([child]))
+        self.assertFalse(policy([]))
+
+    def test_attribute_policy(self):
+        policy = tail_sampling.AttributePolicy("http.route", ["/checkout"])
+        self.assertTrue(
+            policy(self._create_trace(**{"http.route": "/checkout"}))
+        )
+        self.assertFalse(policy(self._create_trace(**{"http.route": "/"})))
+        self.assertFalse(policy(self._create_trace()))
+
+        policy = tail_sampling.AttributePolicy("http.route")
+        self.assertTrue(policy(self._create_trace(**{"http.route": "/"})))
+        self.assertFalse(policy(self._create_trace()))
+
+    def test_trace_id_ratio_policy(self):
+        def create_span(trace_id):
+            return trace._Span(
+                "span", trace_api.SpanContext(trace_id, 1, is_remote=False)
+            )
+
+        policy = tail_sampling.TraceIdRatioPolicy(0.5)
+        self.assertTrue(
+            policy([create_span(0xDEADBEF0 << 64 | 0x7FFFFFFFFFFFFFFF)])
+        )
+        self.assertFalse(policy([create_span(0x8000000000000000)]))
+        self.assertFalse(policy([]))
+
+        spans = self._create_trace()
+        self.assertTrue(tail_sampling.TraceIdRatioPolicy(1)(spans))
+        self.assertFalse(tail_sampling.TraceIdRatioPolicy(0)(spans))
+        with self.assertRaises(ValueError):
+            tail_sampling.TraceIdRatioPolicy(1.5)
+
+    @mock.patch("opentelemetry.sdk.trace.tail_sampling.time_ns")
+    def test_rate_limiting_policy(self, mock_time_ns):
+        mock_time_ns.return_value = 0
+        policy = tail_sampling.RateLimitingPolicy(2)
+        checkout = self._create_trace(**{"http.route": "/checkout"})
+        other = self._create_trace()
+
+        self.assertTrue(policy(checkout))
+        self.assertTrue(policy(checkout))
+        self.assertFalse(policy(checkout))
+        # routes are limited independently, falling back to the span name
+        self.assertTrue(policy(other))
+
+        mock_time_ns.return_value = int(0.5e9)
+        self.assertTrue(policy(checkout))
+        self.assertFalse(policy(checkout))
+
+    @mock.patch("opentelemetry.sdk.trace.tail_sampling.time_ns")
+    def test_rate_limiting_policy_max_routes(self, mock_time_ns):
+        mock_time_ns.return_value = 0
+        policy = tail_sampling.RateLimitingPolicy(0.1, max_routes=1)
+        first = self._create_trace(**{"http.route": "/first"})
+        second = self._create_trace(**{"http.route": "/second"})
+
+        self.assertTrue(policy(first))
+        self.assertFalse(policy(first))
+        self.assertTrue(policy(second))
+        # the first route was forgotten
+        self.assertTrue(policy(first))
+
+    def test_rate_limiting_policy_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            tail_sampling.RateLimitingPolicy(0)
+        with self.assertRaises(ValueError):
+            tail_sampling.RateLimitingPolicy(1, max_routes=0)
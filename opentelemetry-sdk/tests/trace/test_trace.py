@@ -13,14 +13,17 @@
 # limitations under the License.
 
 # pylint: disable=too-many-lines
+import json
 import shutil
 import subprocess
+import threading
 import unittest
 from logging import ERROR, WARNING
 from typing import Optional
 from unittest import mock
 
 from opentelemetry import trace as trace_api
+from opentelemetry.configuration import Configuration
 from opentelemetry.context import Context
 from opentelemetry.sdk import resources, trace
 from opentelemetry.sdk.trace import Resource, sampling
@@ -132,6 +135,53 @@ tracer_provider.add_span_processor(mock_processor)
             span_processor, tracer_provider._active_span_processor
         )
 
+    def test_get_tracer_cached(self):
+        tracer_provider = trace.TracerProvider()
+        tracer = tracer_provider.get_tracer("module", "1.0")
+
+        self.assertIs(tracer_provider.get_tracer("module", "1.0"), tracer)
+        self.assertIsNot(tracer_provider.get_tracer("module", "2.0"), tracer)
+        self.assertIsNot(tracer_provider.get_tracer("other", "1.0"), tracer)
+        self.assertIsNot(
+            trace.TracerProvider().get_tracer("module", "1.0"), tracer
+        )
+
+    @mock.patch.object(trace, "MAX_NUM_TRACERS", 2)
+    def test_get_tracer_cache_bounded(self):
+        tracer_provider = trace.TracerProvider()
+        tracers = [tracer_provider.get_tracer(str(idx)) for idx in range(3)]
+
+        # pylint: disable=protected-access
+        self.assertEqual(len(tracer_provider._tracers), 2)
+        self.assertIs(tracer_provider.get_tracer("2"), tracers[2])
+        self.assertEqual(
+            tracer_provider.get_tracer("0").instrumentation_info,
+            tracers[0].instrumentation_info,
+        )
+
+    def test_ids_generator_default(self):
+        tracer_provider = trace.TracerProvider()
+        self.assertIsInstance(
+            tracer_provider.ids_generator, trace_api.RandomIdsGenerator
+        )
+
+    @mock.patch.dict(
+        "os.environ", {"OTEL_PYTHON_IDS_GENERATOR": "buffered_random"}
+    )
+    def test_ids_generator_from_configuration(self):
+        Configuration._reset()  # pylint: disable=protected-access
+        self.addCleanup(
+            Configuration._reset
+        )  # pylint: disable=protected-access
+
+        tracer_provider = trace.TracerProvider()
+        self.assertIsInstance(
+            tracer_provider.ids_generator, trace_api.BufferedRandomIdsGenerator
+        )
+        ids_generator = trace_api.RandomIdsGenerator()
+        tracer_provider = trace.TracerProvider(ids_generator=ids_generator)
+        self.assertIs(tracer_provider.ids_generator, ids_generator)
+
 
 class TestTracerSampling(unittest.TestCase):
     def test_default_sampler(self):
@@ -173,6 +223,20 @@ class TestTracerSampling(unittest.TestCase):
             child_span.get_span_context().trace_flags,
             trace_api.TraceFlags.DEFAULT,
         )
+        # non-recording spans still propagate their own span id
+        self.assertEqual(
+            child_span.get_span_context().trace_id,
+            root_span.get_span_context().trace_id,
+        )
+        self.assertNotEqual(
+            child_span.get_span_context().span_id,
+            root_span.get_span_context().span_id,
+        )
+        self.assertIs(
+            child_span.get_span_context().trace_flags,
+            root_span.get_span_context().trace_flags,
+        )
+        self.assertFalse(hasattr(child_span, "__dict__"))
 
 
 class TestSpanCreation(unittest.TestCase):
@@ -544,6 +608,37 @@ class TestSpan(unittest.TestCase):
                 isinstance(root.attributes["valid-byte-type-attribute"], str)
             )
 
+    def test_set_attributes(self):
+        with self.tracer.start_as_current_span("root") as root:
+            root.set_attribute("attr-key", "attr-value1")
+            root.set_attributes(
+                {
+                    "component": "http",
+                    "http.status_code": 200,
+                    "list-of-numerics": [123, 314, 0],
+                    "valid-byte-type-attribute": b"valid byte",
+                    "attr-key": "attr-value2",
+                    "invalid-attribute": dict(),
+                    "": "empty-key",
+                }
+            )
+            root.set_attributes({})
+
+        self.assertEqual(
+            dict(root.attributes),
+            {
+                "attr-key": "attr-value2",
+                "component": "http",
+                "http.status_code": 200,
+                "list-of-numerics": (123, 314, 0),
+                "valid-byte-type-attribute": "valid byte",
+            },
+        )
+
+        with self.assertLogs(level=WARNING):
+            root.set_attributes({"after-end": "value"})
+        self.assertNotIn("after-end", root.attributes)
+
     def test_check_attribute_helper(self):
         # pylint: disable=protected-access
         self.assertFalse(trace._is_valid_attribute_value([1, 2, 3.4, "ss", 4]))
@@ -564,6 +659,13 @@ class TestSpan(unittest.TestCase):
         self.assertTrue(trace._is_valid_attribute_value("hi"))
         self.assertTrue(trace._is_valid_attribute_value(3.4))
         self.assertTrue(trace._is_valid_attribute_value(15))
+        # subclasses of the valid types are valid too
+        self.assertTrue(
+            trace._is_valid_attribute_value(type("Str", (str,), {})("hi"))
+        )
+        self.assertTrue(
+            trace._is_valid_attribute_value(type("Int", (int,), {})(15))
+        )
         # None in sequences are valid
         self.assertTrue(trace._is_valid_attribute_value(["A", None, None]))
         self.assertTrue(
@@ -772,6 +874,89 @@ class TestSpan(unittest.TestCase):
         span.end(end_time)
         self.assertEqual(end_time, span.end_time)
 
+    def test_span_containers_created_lazily(self):
+        root = self.tracer.start_span("root")
+
+        self.assertFalse(hasattr(root, "__dict__"))
+        self.assertIs(root.attributes, trace._EMPTY_ATTRIBUTES)
+        self.assertIs(root.events, trace._EMPTY_SEQUENCE)
+        self.assertIs(root.links, trace._EMPTY_SEQUENCE)
+
+        root.set_attribute("component", "http")
+        root.add_event("event0")
+        self.assertIsNot(root.attributes, trace._EMPTY_ATTRIBUTES)
+        self.assertIsNot(root.events, trace._EMPTY_SEQUENCE)
+        self.assertEqual(root.attributes, {"component": "http"})
+        self.assertEqual(root.events[0].name, "event0")
+
+        other = self.tracer.start_span("other")
+        other.set_attribute("component", "db")
+        self.assertEqual(len(other.attributes), 1)
+        self.assertEqual(root.attributes, {"component": "http"})
+        root.end()
+        other.end()
+
+    def test_single_writer_span(self):
+        tracer = trace.TracerProvider(single_writer_spans=True).get_tracer(
+            __name__
+        )
+        span = tracer.start_span("root", attributes={"initial": 1})
+
+        # pylint: disable=protected-access
+        self.assertTrue(span._owned_by_current_thread())
+        span.set_attribute("component", "http")
+        span.add_event("event0")
+        self.assertIsNone(span.attributes._lock)
+        self.assertIsNone(span.events._lock)
+
+        def set_from_other_thread():
+            span.set_attribute("other", "thread")
+
+        thread = threading.Thread(target=set_from_other_thread)
+        thread.start()
+        thread.join()
+
+        # the span falls back to locking once touched by another thread
+        self.assertFalse(span._owned_by_current_thread())
+        span.add_event("event1")
+        span.end()
+
+        self.assertEqual(
+            span.attributes,
+            {"initial": 1, "component": "http", "other": "thread"},
+        )
+        self.assertEqual(len(span.events), 2)
+        self.assertIsNotNone(span.end_time)
+
+    def test_single_writer_span_waits_for_owner(self):
+        tracer = trace.TracerProvider(single_writer_spans=True).get_tracer(
+            __name__
+        )
+        span = tracer.start_span("root")
+        # pylint: disable=protected-access
+        span._writing = True
+
+        thread = threading.Thread(target=span.end)
+        thread.start()
+        # the other thread waits for the write of the owner to complete
+        thread.join(0.05)
+        self.assertTrue(thread.is_alive())
+        self.assertIsNone(span.end_time)
+
+        span._writing = False
+        thread.join()
+        self.assertIsNotNone(span.end_time)
+        span.set_attribute("component", "http")
+        self.assertNotIn("component", span.attributes)
+
+    def test_span_locks_by_default(self):
+        span = self.tracer.start_span("root")
+        # pylint: disable=protected-access
+        self.assertFalse(span._owned_by_current_thread())
+        span.set_attribute("component", "http")
+        self.assertIsNotNone(span.attributes._lock)
+        span.end()
+
     def test_ended_span(self):
         """"Events, attributes are not allowed after span is ended"""
 
@@ -874,6 +1059,61 @@ class TestSpan(unittest.TestCase):
             exception_event.attributes["exception.stacktrace"],
         )
 
+    def test_record_exception_lazy(self):
+        def raise_error(depth):
+            if depth:
+                raise_error(depth - 1)
+            raise ValueError("invalid")
+
+        span = trace._Span(
+            "name",
+            mock.Mock(spec=trace_api.SpanContext),
+            lazy_exception_stacktraces=True,
+        )
+        try:
+            raise_error(3)
+        except ValueError as err:
+            with mock.patch("traceback.format_exc") as format_exc:
+                span.record_exception(err)
+                exception_event = span.events[0]
+                format_exc.assert_not_called()
+        self.assertEqual("exception", exception_event.name)
+        self.assertEqual(
+            "invalid", exception_event.attributes["exception.message"]
+        )
+        self.assertEqual(
+            "ValueError", exception_event.attributes["exception.type"]
+        )
+        stacktrace = exception_event.attributes["exception.stacktrace"]
+        self.assertTrue(stacktrace.startswith("Traceback"))
+        self.assertIn('raise ValueError("invalid")', stacktrace)
+        self.assertTrue(stacktrace.endswith("ValueError: invalid\n"))
+        self.assertEqual(stacktrace.count("in raise_error"), 4)
+        self.assertIs(exception_event.attributes, exception_event.attributes)
+
+    def test_record_exception_stacktrace_limit(self):
+        def raise_error(depth):
+            if depth:
+                raise_error(depth - 1)
+            raise ValueError("invalid")
+
+        for lazy in (False, True):
+            span = trace._Span(
+                "name",
+                mock.Mock(spec=trace_api.SpanContext),
+                lazy_exception_stacktraces=lazy,
+                exception_stacktrace_limit=2,
+            )
+            try:
+                raise_error(3)
+            except ValueError as err:
+                span.record_exception(err)
+            stacktrace = span.events[0].attributes["exception.stacktrace"]
+            self.assertIn(
+                "in test_record_exception_stacktrace_limit", stacktrace
+            )
+            self.assertEqual(stacktrace.count("in raise_error"), 1)
+
     def test_record_exception_context_manager(self):
         try:
             with self.tracer.start_as_current_span("span") as span:
@@ -1078,3 +1318,45 @@ class TestSpanProcessor(unittest.TestCase):
             + date_str
             + '", "attributes": {"key2": "value2"}}], "links": [], "resource": {}}',
         )
+
+    def test_to_json_line(self):
+        context = trace_api.SpanContext(
+            trace_id=0x000000000000000000000000DEADBEEF,
+            span_id=0x00000000DEADBEF0,
+            is_remote=False,
+            trace_flags=trace_api.TraceFlags(trace_api.TraceFlags.SAMPLED),
+        )
+        span = trace._Span("span-name", context)
+        span.resource = Resource({})
+        span.start(start_time=100)
+        span.set_attribute("key", "value")
+        span.add_event("event", {"key2": "value2"}, 123)
+        span.end(end_time=200)
+        self.assertEqual(
+            json.loads(span.to_json_line()),
+            {
+                "name": "span-name",
+                "context": {
+                    "trace_id": "0x000000000000000000000000deadbeef",
+                    "span_id": "0x00000000deadbef0",
+                    "trace_state": "{}",
+                },
+                "kind": "SpanKind.INTERNAL",
+                "parent_id": None,
+                "start_time": 100,
+                "end_time": 200,
+                "status": {"status_code": "UNSET"},
+                "attributes": {"key": "value"},
+                "events": [
+                    {
+                        "name": "event",
+                        "timestamp": 123,
+                        "attributes": {"key2": "value2"},
+                    }
+                ],
+                "links": [],
+                "resource": {},
+            },
+        )
+        self.assertNotIn("\n", span.to_json_line())
+        self.assertNotIn(" ", span.to_json_line().replace("span-name", ""))